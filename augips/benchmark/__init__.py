@@ -0,0 +1,5 @@
+"""
+Offline benchmark suite for Augips framework
+"""
+
+from .suite import BENCHMARKS, compare_to_baseline, format_report, run_benchmarks
\ No newline at end of file
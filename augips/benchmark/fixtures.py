@@ -0,0 +1,252 @@
+"""
+Synthetic site fixtures for offline benchmarks
+"""
+
+import bisect
+import html
+import json
+import random
+import re
+from typing import Callable, Dict, List, Tuple, Union
+from urllib.parse import parse_qs
+
+# Fixtures map (host, path) to (content type, body), or to a function that
+# answers with one given the request body
+Fixture = Union[Tuple[str, bytes], Callable[[bytes], Tuple[str, bytes]]]
+Fixtures = Dict[Tuple[str, str], Fixture]
+
+HTML = "text/html; charset=utf-8"
+JSON = "application/json"
+
+DIRECTORY_HOST = "stores.pepboys.com"
+OVERPASS_HOST = "overpass-api.de"
+WIKIPEDIA_HOST = "en.wikipedia.org"
+
+STATES = [
+    ("AL", "Alabama"), ("AK", "Alaska"), ("AZ", "Arizona"), ("AR", "Arkansas"), ("CA", "California"),
+    ("CO", "Colorado"), ("CT", "Connecticut"), ("DE", "Delaware"), ("FL", "Florida"), ("GA", "Georgia"),
+    ("HI", "Hawaii"), ("ID", "Idaho"), ("IL", "Illinois"), ("IN", "Indiana"), ("IA", "Iowa"),
+    ("KS", "Kansas"), ("KY", "Kentucky"), ("LA", "Louisiana"), ("ME", "Maine"), ("MD", "Maryland"),
+    ("MA", "Massachusetts"), ("MI", "Michigan"), ("MN", "Minnesota"), ("MS", "Mississippi"), ("MO", "Missouri"),
+    ("MT", "Montana"), ("NE", "Nebraska"), ("NV", "Nevada"), ("NH", "New Hampshire"), ("NJ", "New Jersey"),
+    ("NM", "New Mexico"), ("NY", "New York"), ("NC", "North Carolina"), ("ND", "North Dakota"), ("OH", "Ohio"),
+    ("OK", "Oklahoma"), ("OR", "Oregon"), ("PA", "Pennsylvania"), ("RI", "Rhode Island"), ("SC", "South Carolina"),
+    ("SD", "South Dakota"), ("TN", "Tennessee"), ("TX", "Texas"), ("UT", "Utah"), ("VT", "Vermont"),
+    ("VA", "Virginia"), ("WA", "Washington"), ("WV", "West Virginia"), ("WI", "Wisconsin"), ("WY", "Wyoming"),
+]
+
+STREETS = ["Main St", "Oak Ave", "Maple Dr", "Broadway", "Market St", "Pico Blvd", "Bustleton Ave", "Route 1"]
+BRANDS = ["Aral", "Shell", "Total", "Esso", "Jet", "Star", "Agip", "HEM"]
+
+
+def _page(title: str, body: str) -> bytes:
+    """Wrap content in the navigation, scripts and footer real pages carry"""
+    nav = "".join(f'<li><a class="nav-link" href="/section-{i}.html">Section {i}</a></li>' for i in range(40))
+    footer = "<p>" + " ".join(["Prices, promotions, styles and availability may vary by store."] * 20) + "</p>"
+    script = "<script>window.__CONFIG__ = " + json.dumps({"flags": list(range(200))}) + ";</script>"
+    return (
+        f"<!DOCTYPE html><html><head><title>{html.escape(title)}</title>{script}</head>"
+        f"<body><header><ul class='nav'>{nav}</ul></header><main>{body}</main>"
+        f"<footer>{footer}</footer></body></html>"
+    ).encode("utf-8")
+
+
+def directory_fixtures(cities_per_state: int = 10, stores_per_city: int = 10, seed: int = 1) -> Fixtures:
+    """
+    Store directory laid out like the Yext pages Pep Boys uses
+    
+    index.html links to one page per state, state pages link to city pages,
+    and city pages list their stores with addresses and coordinates. The
+    defaults give 5,000 stores on 551 pages.
+    
+    Args:
+        cities_per_state: City pages per state
+        stores_per_city: Stores listed on each city page
+        seed: Random seed, so runs compare like with like
+        
+    Returns:
+        Fixture pages keyed by (host, path)
+    """
+    rng = random.Random(seed)
+    fixtures: Fixtures = {}
+    state_links = []
+    store_number = 1000
+    for code, name in STATES:
+        slug = code.lower()
+        state_links.append(
+            f'<li><a class="c-directory-list-content-item-link" href="{slug}.html">{html.escape(name)}</a></li>'
+        )
+        city_links = []
+        base_lat, base_lng = rng.uniform(26, 48), rng.uniform(-122, -71)
+        for c in range(cities_per_state):
+            city = f"{name} City {c + 1}"
+            city_path = f"{slug}/city-{c + 1}.html"
+            city_links.append(
+                f'<li><a class="c-directory-list-content-item-link" href="{city_path}">{html.escape(city)}</a></li>'
+            )
+            stores = []
+            for _ in range(stores_per_city):
+                store_number += 1
+                stores.append(
+                    f'<article class="c-location-grid-item" data-lat="{base_lat + rng.uniform(-1, 1):.5f}" '
+                    f'data-lng="{base_lng + rng.uniform(-1, 1):.5f}">'
+                    f'<h2 class="c-location-name">Pep Boys #{store_number}</h2>'
+                    f'<span class="c-address-street-1">{rng.randint(1, 9999)} {rng.choice(STREETS)}</span>'
+                    f'<span class="c-address-city">{html.escape(city)}</span>'
+                    f'<span class="c-address-state">{code}</span>'
+                    f'<span class="c-address-postal-code">{rng.randint(10000, 99999)}</span>'
+                    f'<a class="c-location-link" href="/{slug}/store-{store_number}.html">Store details</a>'
+                    f"</article>"
+                )
+            fixtures[(DIRECTORY_HOST, f"/{city_path}")] = (
+                HTML, _page(f"Pep Boys in {city}", f'<div class="c-location-grid">{"".join(stores)}</div>')
+            )
+        fixtures[(DIRECTORY_HOST, f"/{slug}.html")] = (
+            HTML, _page(f"Pep Boys in {name}", f'<ul class="c-directory-list-content">{"".join(city_links)}</ul>')
+        )
+    fixtures[(DIRECTORY_HOST, "/index.html")] = (
+        HTML, _page("Pep Boys Locations", f'<ul class="c-directory-list-content">{"".join(state_links)}</ul>')
+    )
+    return fixtures
+
+
+# Region the Overpass fixture's nodes are spread over, roughly Germany
+OVERPASS_BBOX = (47.3, 5.9, 55.0, 15.0)
+
+_BBOX_PATTERN = re.compile(r"\((-?[\d.]+),(-?[\d.]+),(-?[\d.]+),(-?[\d.]+)\)")
+_LIMIT_PATTERN = re.compile(r"\bout\b[^;]*?(\d+)\s*;")
+
+
+class OverpassFixture:
+    """
+    Answers Overpass queries from a fixed set of nodes
+    
+    The bounding box and element limit of each query are honoured, so tiled
+    queries get one tile's worth of nodes; tag filters are ignored.
+    """
+    
+    def __init__(self, nodes: List[dict]):
+        """
+        Args:
+            nodes: Overpass node elements
+        """
+        nodes = sorted(nodes, key=lambda node: node["lat"])
+        self.lats = [node["lat"] for node in nodes]
+        self.lons = [node["lon"] for node in nodes]
+        self.encoded = [json.dumps(node) for node in nodes]
+    
+    def __call__(self, body: bytes) -> Tuple[str, bytes]:
+        query = parse_qs(body.decode("utf-8")).get("data", [""])[0]
+        bbox = _BBOX_PATTERN.search(query)
+        south, west, north, east = (float(value) for value in bbox.groups()) if bbox else (-90, -180, 90, 180)
+        limit = _LIMIT_PATTERN.search(query)
+        limit = int(limit.group(1)) if limit else len(self.encoded)
+        
+        matches = []
+        for i in range(bisect.bisect_left(self.lats, south), bisect.bisect_right(self.lats, north)):
+            if west <= self.lons[i] <= east:
+                matches.append(self.encoded[i])
+                if len(matches) == limit:
+                    break
+        payload = (
+            '{"version": 0.6, "generator": "Overpass API (benchmark fixture)", '
+            '"osm3s": {"timestamp_osm_base": "2024-01-01T00:00:00Z"}, '
+            f'"elements": [{", ".join(matches)}]}}'
+        )
+        return JSON, payload.encode("utf-8")
+
+
+def overpass_fixtures(elements: int = 50000, seed: int = 2) -> Fixtures:
+    """
+    Overpass API with many fuel stations
+    
+    Args:
+        elements: Number of nodes in OVERPASS_BBOX; all 50,000 are about 12 MB
+        seed: Random seed
+        
+    Returns:
+        Fixture for the Overpass interpreter endpoint
+    """
+    rng = random.Random(seed)
+    south, west, north, east = OVERPASS_BBOX
+    nodes = []
+    for i in range(elements):
+        brand = rng.choice(BRANDS)
+        nodes.append({
+            "type": "node",
+            "id": 100000000 + i,
+            "lat": round(rng.uniform(south, north), 7),
+            "lon": round(rng.uniform(west, east), 7),
+            "tags": {
+                "amenity": "fuel",
+                "brand": brand,
+                "name": f"{brand} {rng.choice(STREETS)}",
+                "addr:street": rng.choice(STREETS),
+                "addr:housenumber": str(rng.randint(1, 300)),
+                "addr:postcode": f"{rng.randint(1000, 99999):05d}",
+                "addr:city": "Berlin",
+                "opening_hours": "Mo-Su 06:00-22:00",
+            },
+        })
+    return {(OVERPASS_HOST, "/api/interpreter"): OverpassFixture(nodes)}
+
+
+def wikipedia_fixtures(rows: int = 2000, seed: int = 3) -> Fixtures:
+    """
+    Wikipedia list page with one large wikitable of places
+    
+    Args:
+        rows: Table rows
+        seed: Random seed
+        
+    Returns:
+        Fixture for the list of national parks page
+    """
+    rng = random.Random(seed)
+    body = [
+        '<table class="wikitable sortable"><tr><th>Name</th><th>Image</th><th>Location</th><th>Coordinates</th></tr>'
+    ]
+    for i in range(rows):
+        _, state = rng.choice(STATES)
+        lat, lng = rng.uniform(25, 49), rng.uniform(67, 124)
+        body.append(
+            f'<tr><td><a href="/wiki/Park_{i}">Park {i}</a></td>'
+            f'<td><img src="//upload.wikimedia.org/park_{i}.jpg" alt="" width="150"></td>'
+            f"<td>{state}, {state}</td>"
+            f'<td><span class="geo-dms">{lat:.2f}°N {lng:.2f}°W</span></td></tr>'
+        )
+    body.append("</table>")
+    path = "/wiki/List_of_national_parks_of_the_United_States"
+    return {(WIKIPEDIA_HOST, path): (HTML, _page("List of national parks of the United States", "".join(body)))}
+
+
+def static_fixtures() -> Fixtures:
+    """Landing pages for the scrapers that only read a single page"""
+    countries = "".join(f'<li><a href="/{code.lower()}/">{name}</a></li>' for code, name in STATES[:20])
+    return {
+        ("www.ikea.com", "/us/en/stores/"): (
+            HTML, _page("IKEA stores", f'<ul class="country-list">{countries}</ul>')
+        ),
+        ("www.napaonline.com", "/en/auto-parts-stores"): (HTML, _page("NAPA Auto Parts Stores", "")),
+        ("stores.advanceautoparts.com", "/"): (HTML, _page("Advance Auto Parts Stores", "")),
+        (DIRECTORY_HOST, "/robots.txt"): ("text/plain", b"User-agent: *\nDisallow: /checkout\n"),
+    }
+
+
+def build_fixtures(scale: float = 1.0) -> Fixtures:
+    """
+    Every benchmark fixture
+    
+    Args:
+        scale: Multiplier for the size of the directory, Overpass answer and
+            Wikipedia table
+            
+    Returns:
+        Fixture pages keyed by (host, path)
+    """
+    fixtures: Fixtures = {}
+    fixtures.update(directory_fixtures(cities_per_state=max(1, round(10 * scale))))
+    fixtures.update(overpass_fixtures(elements=max(1, round(50000 * scale))))
+    fixtures.update(wikipedia_fixtures(rows=max(1, round(2000 * scale))))
+    fixtures.update(static_fixtures())
+    return fixtures
\ No newline at end of file
@@ -0,0 +1,126 @@
+"""
+Local fixture server and HTTP client for offline benchmarks
+"""
+
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, List, Optional
+from urllib.parse import urlsplit
+
+import requests
+
+from ..utils.http import HttpClient
+from .fixtures import Fixtures
+
+
+class FixtureServer:
+    """
+    Serves fixtures over HTTP on a local port
+    
+    Requests for http://127.0.0.1:<port>/<host><path> are answered with the
+    fixture for (host, path), whatever the method, so a live site's URLs map
+    onto the server by prefixing their host. Fixtures that are functions are
+    called with the request body. Unknown paths get a 404.
+    """
+    
+    def __init__(self, fixtures: Fixtures):
+        """
+        Args:
+            fixtures: Pages keyed by (host, path)
+        """
+        self.fixtures = fixtures
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+    
+    @property
+    def base_url(self) -> str:
+        """URL prefix of the running server"""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+    
+    def start(self) -> "FixtureServer":
+        """Start serving in a background thread"""
+        fixtures = self.fixtures
+        
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body are written separately; without this, delayed
+            # ACKs add ~40 ms to every response on a kept-alive connection
+            disable_nagle_algorithm = True
+            
+            def _respond(self) -> None:
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length) if length else b""
+                host, _, path = self.path.lstrip("/").partition("/")
+                fixture = fixtures.get((host, "/" + path.split("?", 1)[0]))
+                if callable(fixture):
+                    fixture = fixture(body)
+                if fixture is None:
+                    content_type, body, status = "text/plain", b"Not found", 404
+                else:
+                    (content_type, body), status = fixture, 200
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            
+            do_GET = _respond
+            do_POST = _respond
+            
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+        
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, name="augips-fixtures", daemon=True)
+        self._thread.start()
+        return self
+    
+    def stop(self) -> None:
+        """Stop the server"""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+    
+    def __enter__(self) -> "FixtureServer":
+        return self.start()
+    
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+
+class FixtureClient(HttpClient):
+    """
+    HttpClient that sends every request to a FixtureServer
+    
+    Requests go through the normal pooled session (and no cache), so the
+    benchmark measures the same HTTP stack scrapers use in production.
+    Each request's latency is recorded.
+    """
+    
+    def __init__(self, server: FixtureServer, **kwargs: Any):
+        """
+        Args:
+            server: Running fixture server
+            **kwargs: HttpClient options
+        """
+        super().__init__(**kwargs)
+        self.server = server
+        self.latencies: List[float] = []
+        self._lock = threading.Lock()
+    
+    def request(self, method: str, url: str, **kwargs: Any) -> requests.Response:
+        """Send a request for a live URL to the fixture server"""
+        parts = urlsplit(url)
+        local_url = f"{self.server.base_url}/{parts.netloc}{parts.path or '/'}"
+        if parts.query:
+            local_url += f"?{parts.query}"
+        start = time.perf_counter()
+        try:
+            return super().request(method, local_url, **kwargs)
+        finally:
+            with self._lock:
+                self.latencies.append(time.perf_counter() - start)
\ No newline at end of file
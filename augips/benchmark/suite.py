@@ -0,0 +1,229 @@
+"""
+Offline scraper benchmarks for Augips framework
+"""
+
+import asyncio
+import contextlib
+import io
+import os
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from ..scrapers import SCRAPERS
+from ..scrapers.base import Scraper
+from ..utils.geoqueue import GeocodingQueue, set_geocoding_queue
+from .fixtures import OVERPASS_BBOX, build_fixtures
+from .server import FixtureClient, FixtureServer
+
+# Benchmarks run by default, in order; "directory" is the Pep Boys scraper
+# crawling the synthetic multi-thousand-store directory and
+# "directory-async" the same crawl through arun() and ascrape(), the rest
+# are registered scrapers. AutoZone and O'Reilly need a browser and are not
+# benchmarked offline.
+BENCHMARKS = ["directory", "directory-async", "openstreetmap", "wikipedia", "ikea", "napa", "advanced"]
+
+# Benchmarks run on an event loop with Scraper.arun()
+ASYNC_BENCHMARKS = {"directory-async"}
+
+# Smallest benchmark compare_to_baseline() checks for regressions
+MIN_GATED_RECORDS = 1000
+
+# Settings that point outputs at shared locations or change what scrapers
+# query; unset while benchmarking so every run writes into its own scratch
+# directory and queries the fixtures
+_PATH_SETTINGS = [
+    "AUGIPS_LOCATION_STORE", "AUGIPS_HTTP_CACHE", "AUGIPS_METRICS_DIR", "AUGIPS_GEOCODE_CACHE",
+    "AUGIPS_OVERPASS_ENDPOINTS", "AUGIPS_OVERPASS_RATE_LIMIT", "AUGIPS_OSM_REGION", "AUGIPS_OSM_TAGS",
+]
+
+
+def _offline_geocode(address: str) -> Tuple[None, None]:
+    """Geocoder used while benchmarking; network lookups are not made"""
+    return None, None
+
+
+def percentile(values: List[float], q: float) -> Optional[float]:
+    """
+    Percentile with linear interpolation between closest ranks
+    
+    Args:
+        values: Samples
+        q: Percentile between 0 and 100
+        
+    Returns:
+        The percentile, or None if there are no samples
+    """
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * q / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def _create(name: str, client: FixtureClient) -> Scraper:
+    """Instantiate a benchmark's scraper with the fixture client"""
+    if name in ("directory", "directory-async"):
+        return SCRAPERS["pepboys"](http_client=client)
+    if name == "openstreetmap":
+        # Tile the whole fixture region, without the public endpoint's rate limit
+        scraper = SCRAPERS[name](http_client=client, region=",".join(map(str, OVERPASS_BBOX)))
+        scraper.rate_limit = 1000
+        return scraper
+    return SCRAPERS[name](http_client=client)
+
+
+@contextlib.contextmanager
+def _workspace() -> Iterator[str]:
+    """Scratch directory for benchmark outputs, with shared output paths unset"""
+    saved_cwd = os.getcwd()
+    saved_env = {key: os.environ.pop(key) for key in _PATH_SETTINGS if key in os.environ}
+    with tempfile.TemporaryDirectory(prefix="augips-bench-") as root:
+        try:
+            yield root
+        finally:
+            os.chdir(saved_cwd)
+            os.environ.update(saved_env)
+
+
+def _run_once(name: str, server: FixtureServer, root: str,
+              output_formats: Optional[List[str]]) -> Tuple[Scraper, FixtureClient, int, float]:
+    """Run one benchmark in a fresh output directory, discarding its console output"""
+    os.chdir(tempfile.mkdtemp(dir=root))
+    client = FixtureClient(server)
+    scraper = _create(name, client)
+    if output_formats:
+        scraper.output_formats = output_formats
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        count = asyncio.run(scraper.arun()) if name in ASYNC_BENCHMARKS else scraper.run()
+        elapsed = time.perf_counter() - start
+    client.close()
+    return scraper, client, count, elapsed
+
+
+def run_benchmarks(names: Optional[List[str]] = None, scale: float = 1.0,
+                   output_formats: Optional[List[str]] = None, memory: bool = True) -> List[Dict[str, Any]]:
+    """
+    Run scrapers against local fixtures and measure them
+    
+    Each benchmark runs once for timing and, with memory enabled, once more
+    under tracemalloc for its peak Python memory, since tracing slows the
+    run down. Network geocoding is disabled, and outputs go to a temporary
+    directory.
+    
+    Args:
+        names: Benchmarks from BENCHMARKS, or None for all of them
+        scale: Size multiplier for the synthetic directory, Overpass answer
+            and Wikipedia table
+        output_formats: Output formats to write, or None for the default
+        memory: Measure peak memory
+        
+    Returns:
+        One result dictionary per benchmark
+    """
+    names = names or BENCHMARKS
+    unknown = [name for name in names if name not in BENCHMARKS]
+    if unknown:
+        raise ValueError(f"Unknown benchmark '{unknown[0]}'. Available benchmarks: {', '.join(BENCHMARKS)}")
+    
+    results = []
+    set_geocoding_queue(GeocodingQueue(geocode=_offline_geocode, rate_limit=1000))
+    try:
+        with FixtureServer(build_fixtures(scale)) as server, _workspace() as root:
+            for name in names:
+                scraper, client, count, elapsed = _run_once(name, server, root, output_formats)
+                result = {
+                    "benchmark": name,
+                    "records": count,
+                    "seconds": round(elapsed, 4),
+                    "records_per_sec": round(count / elapsed, 1) if elapsed > 0 else None,
+                    "pages": len(client.latencies),
+                    "p50_ms": _ms(percentile(client.latencies, 50)),
+                    "p99_ms": _ms(percentile(client.latencies, 99)),
+                    "peak_memory_mb": None,
+                    "stages": scraper.metrics.to_dict()["stages"] if scraper.metrics else {},
+                }
+                if memory:
+                    tracemalloc.start()
+                    try:
+                        _run_once(name, server, root, output_formats)
+                        result["peak_memory_mb"] = round(tracemalloc.get_traced_memory()[1] / 1e6, 1)
+                    finally:
+                        tracemalloc.stop()
+                results.append(result)
+    finally:
+        set_geocoding_queue(None)
+    return results
+
+
+def _ms(seconds: Optional[float]) -> Optional[float]:
+    """Convert seconds to rounded milliseconds"""
+    return None if seconds is None else round(seconds * 1000, 2)
+
+
+def format_report(results: List[Dict[str, Any]]) -> str:
+    """
+    Format benchmark results as a text table
+    
+    Args:
+        results: Results from run_benchmarks()
+        
+    Returns:
+        Table with one row per benchmark
+    """
+    header = f"{'benchmark':<16}{'records':>9}{'pages':>7}{'rec/s':>11}{'p50 ms':>9}{'p99 ms':>9}{'peak MB':>9}"
+    lines = [header, "-" * len(header)]
+    
+    def cell(value: Optional[float], width: int, spec: str) -> str:
+        return f"{'-':>{width}}" if value is None else f"{value:>{width}{spec}}"
+    
+    for result in results:
+        lines.append(
+            f"{result['benchmark']:<16}{result['records']:>9}{result['pages']:>7}"
+            f"{cell(result['records_per_sec'], 11, ',.0f')}{cell(result['p50_ms'], 9, '.2f')}"
+            f"{cell(result['p99_ms'], 9, '.2f')}{cell(result['peak_memory_mb'], 9, '.1f')}"
+        )
+    return "\n".join(lines)
+
+
+def compare_to_baseline(results: List[Dict[str, Any]], baseline: List[Dict[str, Any]],
+                        tolerance: float = 0.2) -> List[str]:
+    """
+    Find benchmarks that got slower or bigger than a saved baseline
+    
+    Throughput and peak memory are compared for benchmarks with at least
+    MIN_GATED_RECORDS records; page latencies on a local server, and
+    benchmarks that finish in milliseconds, vary too much between runs to
+    gate on.
+    
+    Args:
+        results: Results from run_benchmarks()
+        baseline: Earlier results, e.g. loaded from a saved JSON report
+        tolerance: Allowed fractional change before it counts as a regression
+        
+    Returns:
+        One message per regression, empty if there are none
+    """
+    previous = {result["benchmark"]: result for result in baseline}
+    regressions = []
+    for result in results:
+        before = previous.get(result["benchmark"])
+        if before is None or result["records"] < MIN_GATED_RECORDS:
+            continue
+        if before.get("records_per_sec") and result["records_per_sec"] is not None:
+            if result["records_per_sec"] < before["records_per_sec"] * (1 - tolerance):
+                regressions.append(
+                    f"{result['benchmark']}: {result['records_per_sec']:,.0f} records/sec, "
+                    f"baseline {before['records_per_sec']:,.0f}"
+                )
+        if before.get("peak_memory_mb") and result["peak_memory_mb"] is not None:
+            if result["peak_memory_mb"] > before["peak_memory_mb"] * (1 + tolerance):
+                regressions.append(
+                    f"{result['benchmark']}: peak memory {result['peak_memory_mb']:.1f} MB, "
+                    f"baseline {before['peak_memory_mb']:.1f} MB"
+                )
+    return regressions
\ No newline at end of file
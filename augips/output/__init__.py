@@ -0,0 +1,44 @@
+"""
+Output sinks for Augips framework
+"""
+
+import importlib
+from typing import List
+
+from .base import OutputSink
+from .csv_sink import CSVSink
+
+# Output formats by name, as "module:ClassName" so optional dependencies
+# are only imported when a format is used
+SINKS = {
+    "csv": "augips.output.csv_sink:CSVSink",
+    "parquet": "augips.output.parquet_sink:ParquetSink",
+    "sqlite": "augips.output.location_store:LocationStoreSink",
+    "journal": "augips.output.journal:JournalSink",
+}
+
+# Formats written when none are requested; every run also updates the
+# consolidated location store and records changes since the previous run
+DEFAULT_FORMATS = ["csv", "sqlite", "journal"]
+
+
+def create_sinks(scraper, formats: List[str]) -> List[OutputSink]:
+    """
+    Create output sinks for a scraper
+    
+    Args:
+        scraper: Scraper whose locations are written
+        formats: Output format names from SINKS
+        
+    Returns:
+        List of OutputSink instances
+    """
+    sinks = []
+    for name in formats:
+        target = SINKS.get(name.lower())
+        if target is None:
+            raise ValueError(f"Unknown output format '{name}'. Available formats: {', '.join(SINKS)}")
+        module_name, _, class_name = target.partition(":")
+        sink_class = getattr(importlib.import_module(module_name), class_name)
+        sinks.append(sink_class(scraper))
+    return sinks
\ No newline at end of file
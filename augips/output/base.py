@@ -0,0 +1,44 @@
+"""
+Base output sink for Augips framework
+"""
+
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List
+
+
+class OutputSink(ABC):
+    """
+    Destination for scraped locations, written in batches as they arrive
+    
+    Scraper.run() calls write_batch() for every batch and close() once the
+    scraper has finished, so sinks never need the whole dataset in memory.
+    """
+    
+    def __init__(self, scraper):
+        """
+        Args:
+            scraper: Scraper whose locations are written
+        """
+        self.scraper = scraper
+        self.count = 0
+    
+    @abstractmethod
+    def write_batch(self, records: List[Dict[str, Any]]) -> None:
+        """
+        Write a batch of locations
+        
+        Scraper.run() passes a LocationBatch, which iterates as Location
+        records that behave like dicts; plain lists of dicts also work.
+        
+        Args:
+            records: LocationBatch or list of dictionaries containing store location data
+        """
+        pass
+    
+    def close(self) -> None:
+        """Finish writing after the last batch"""
+        pass
+    
+    def abort(self) -> None:
+        """Stop writing after an error, keeping whatever was already written"""
+        self.close()
\ No newline at end of file
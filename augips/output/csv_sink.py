@@ -0,0 +1,118 @@
+"""
+CSV output sink for Augips framework
+"""
+
+import csv
+import os
+from typing import Any, Dict, List, Optional
+
+from .base import OutputSink
+from ..utils.log import get_logger
+
+logger = get_logger(__name__)
+
+
+class CSVSink(OutputSink):
+    """
+    Writes locations to the scraper's CSV file batch by batch
+    
+    Rows go to "<output_file>.partial" and are flushed after every batch,
+    so a crash keeps everything scraped so far. The file is renamed to
+    output_file once the scraper finishes, replacing the previous run's
+    output only when the new one is complete.
+    
+    Columns come from the first batch. Fields that first appear in a later
+    batch are appended as new columns; when the scraper finishes, the file
+    is rewritten once with the widened header, leaving earlier rows empty
+    in those columns.
+    """
+    
+    def __init__(self, scraper, path: Optional[str] = None):
+        """
+        Args:
+            scraper: Scraper whose locations are written
+            path: Output file, defaults to the scraper's output_file
+        """
+        super().__init__(scraper)
+        self.path = path or scraper.output_file
+        self.partial_path = f"{self.path}.partial"
+        self._file = None
+        self._writer = None
+        # Columns in the header written to the file
+        self._header_size = 0
+    
+    @staticmethod
+    def _new_fields(records: List[Dict[str, Any]], fieldnames: List[str]) -> List[str]:
+        """Fields of records missing from fieldnames, in first-seen order"""
+        known = set(fieldnames)
+        fields = []
+        for record in records:
+            for key in record:
+                if key not in known:
+                    known.add(key)
+                    fields.append(key)
+        return fields
+    
+    def _open(self, records: List[Dict[str, Any]]) -> None:
+        """Open the file, taking the columns from the first batch"""
+        fieldnames = self._new_fields(records, [])
+        
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(self.partial_path, "w", newline="", encoding="utf-8")
+        self._writer = csv.DictWriter(self._file, fieldnames=fieldnames)
+        self._writer.writeheader()
+        self._header_size = len(fieldnames)
+    
+    def write_batch(self, records: List[Dict[str, Any]]) -> None:
+        """Append a batch of rows and flush it to disk"""
+        if not records:
+            return
+        if self._writer is None:
+            self._open(records)
+        
+        extra = self._new_fields(records, self._writer.fieldnames)
+        if extra:
+            # New columns go at the end, so rows written so far stay valid
+            # prefixes of the widened rows; the header is fixed in close()
+            logger.debug("Adding columns not in the first batch: %s", ", ".join(extra))
+            self._writer = csv.DictWriter(self._file, fieldnames=self._writer.fieldnames + extra)
+        
+        self._writer.writerows(records)
+        self._file.flush()
+        self.count += len(records)
+    
+    def close(self) -> None:
+        """Move the finished file into place"""
+        if self._file is None:
+            print(f"No data to save for {self.scraper.company_name}")
+            return
+        self._file.close()
+        self._file = None
+        if len(self._writer.fieldnames) > self._header_size:
+            self._rewrite_header()
+        os.replace(self.partial_path, self.path)
+        print(f"Saved {self.count} locations to {self.path}")
+    
+    def _rewrite_header(self) -> None:
+        """Rewrite the partial file with the widened header, padding rows written before it grew"""
+        fieldnames = self._writer.fieldnames
+        tmp_path = f"{self.partial_path}.tmp"
+        with open(self.partial_path, newline="", encoding="utf-8") as source, \
+                open(tmp_path, "w", newline="", encoding="utf-8") as target:
+            reader = csv.reader(source)
+            writer = csv.writer(target)
+            next(reader, None)
+            writer.writerow(fieldnames)
+            padding = [""] * len(fieldnames)
+            for row in reader:
+                writer.writerow(row + padding[len(row):])
+        os.replace(tmp_path, self.partial_path)
+    
+    def abort(self) -> None:
+        """Leave the partial file in place for inspection or recovery"""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            print(f"Saved {self.count} locations to {self.partial_path} before the error")
\ No newline at end of file
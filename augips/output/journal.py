@@ -0,0 +1,141 @@
+"""
+Change journal output sink for Augips framework
+"""
+
+import json
+import os
+import time
+from typing import Any, Dict, List, Optional
+
+from .base import OutputSink
+from ..utils.records import record_hash, store_key
+
+# Directory holding one journal file per company and run
+JOURNAL_DIR = "data/journal"
+
+
+def load_hash_index(path: str) -> Dict[str, str]:
+    """
+    Read a store key -> record hash index written by a previous run
+    
+    Args:
+        path: Index file
+        
+    Returns:
+        Dictionary of record hashes by store key, empty if there is no index
+    """
+    index = {}
+    if not os.path.exists(path):
+        return index
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            key, _, digest = line.rstrip("\n").partition("\t")
+            if key:
+                index[key] = digest
+    return index
+
+
+class JournalSink(OutputSink):
+    """
+    Records which stores were added, removed or changed since the last run
+    
+    The previous run's hash index is loaded into memory and each scraped
+    record is probed against it as it streams past (a hash join), so only
+    the index is held in memory, never either run's full dataset. Changes
+    are written as JSON lines:
+        
+        {"op": "added", "company_name": ..., "store_key": ..., "record": {...}}
+        {"op": "changed", "company_name": ..., "store_key": ..., "record": {...}}
+        {"op": "removed", "company_name": ..., "store_key": ...}
+    
+    The store key matches the one used by the consolidated location store.
+    The new index replaces the old one only when the run completes; an
+    aborted run leaves the index alone and discards its journal. So does a
+    run that found no stores or returned fallback sample data, which is a
+    failed fetch rather than every store closing. Runs the scraper marks
+    incomplete record additions and changes but no removals, and keep the
+    unseen stores in the index for the next complete run to compare.
+    """
+    
+    def __init__(self, scraper, index_path: Optional[str] = None, journal_dir: Optional[str] = None):
+        """
+        Args:
+            scraper: Scraper whose locations are written
+            index_path: Hash index file, defaults to "<output_file>.index"
+            journal_dir: Directory for journal files, defaults to data/journal/<company>
+        """
+        super().__init__(scraper)
+        base = os.path.splitext(scraper.output_file)[0]
+        slug = os.path.basename(base).replace("_locations", "")
+        self.index_path = index_path or f"{base}.index"
+        directory = journal_dir or os.path.join(JOURNAL_DIR, slug)
+        self.path = os.path.join(directory, time.strftime("%Y%m%dT%H%M%S") + ".jsonl")
+        self.previous = load_hash_index(self.index_path)
+        self.seen = {}
+        self.counts = {"added": 0, "changed": 0, "removed": 0}
+        
+        os.makedirs(directory, exist_ok=True)
+        index_dir = os.path.dirname(self.index_path)
+        if index_dir:
+            os.makedirs(index_dir, exist_ok=True)
+        self._journal = open(f"{self.path}.partial", "w", encoding="utf-8")
+        self._index = open(f"{self.index_path}.partial", "w", encoding="utf-8")
+    
+    def _emit(self, op: str, key: str, record: Optional[Dict[str, Any]] = None) -> None:
+        """Write one journal entry"""
+        entry = {"op": op, "company_name": self.scraper.company_name, "store_key": key}
+        if record is not None:
+            entry["record"] = dict(record)
+        self._journal.write(json.dumps(entry, default=str) + "\n")
+        self.counts[op] += 1
+    
+    def write_batch(self, records: List[Dict[str, Any]]) -> None:
+        """Probe a batch against the previous run's index"""
+        for record in records:
+            key = store_key(record)
+            if key in self.seen:
+                # The first record for a store wins, as in the location store
+                continue
+            digest = record_hash(record)
+            self.seen[key] = digest
+            self._index.write(f"{key}\t{digest}\n")
+            
+            previous = self.previous.get(key)
+            if previous is None:
+                self._emit("added", key, record)
+            elif previous != digest:
+                self._emit("changed", key, record)
+        self.count += len(records)
+    
+    def close(self) -> None:
+        """Emit removals and swap in the new index"""
+        if not self.seen or self.scraper.used_fallback:
+            reason = "fallback data" if self.scraper.used_fallback else "no locations"
+            print(f"Journal for {self.scraper.company_name}: skipped, run returned {reason}; "
+                  f"keeping the previous index")
+            self.abort()
+            return
+        
+        for key, digest in self.previous.items():
+            if key in self.seen:
+                continue
+            if self.scraper.incomplete:
+                # The store may just not have been reached this time
+                self._index.write(f"{key}\t{digest}\n")
+            else:
+                self._emit("removed", key)
+        self._journal.close()
+        self._index.close()
+        os.replace(f"{self.path}.partial", self.path)
+        os.replace(f"{self.index_path}.partial", self.index_path)
+        removed = "removals skipped, run incomplete" if self.scraper.incomplete else f"{self.counts['removed']} removed"
+        print(f"Journal for {self.scraper.company_name}: {self.counts['added']} added, "
+              f"{self.counts['changed']} changed, {removed} -> {self.path}")
+    
+    def abort(self) -> None:
+        """Discard the journal, keeping the previous index for the next run"""
+        self._journal.close()
+        self._index.close()
+        for path in (f"{self.path}.partial", f"{self.index_path}.partial"):
+            if os.path.exists(path):
+                os.remove(path)
\ No newline at end of file
@@ -0,0 +1,220 @@
+"""
+Consolidated SQLite location store for Augips framework
+"""
+
+import json
+import os
+import sqlite3
+import time
+from typing import Any, Dict, Iterator, List, Optional
+
+from .base import OutputSink
+from ..utils.records import store_key
+
+# Default database shared by every scraper
+DEFAULT_STORE_PATH = "data/locations.sqlite"
+
+# Columns stored directly; any other fields go into the "extra" JSON column
+STORE_COLUMNS = ["store_name", "address", "city", "state", "zip_code", "latitude", "longitude"]
+
+SCHEMA = [
+    """CREATE TABLE IF NOT EXISTS locations (
+        id INTEGER PRIMARY KEY,
+        company_name TEXT NOT NULL,
+        store_key TEXT NOT NULL,
+        store_name TEXT,
+        address TEXT,
+        city TEXT,
+        state TEXT,
+        zip_code TEXT,
+        latitude REAL,
+        longitude REAL,
+        extra TEXT,
+        source TEXT,
+        first_seen REAL NOT NULL,
+        last_seen REAL NOT NULL,
+        UNIQUE (company_name, store_key)
+    )""",
+    # The UNIQUE constraint doubles as the company index
+    "CREATE INDEX IF NOT EXISTS locations_state ON locations (state, company_name)",
+    "CREATE INDEX IF NOT EXISTS locations_zip ON locations (zip_code, company_name)",
+    "CREATE VIRTUAL TABLE IF NOT EXISTS locations_rtree USING rtree (id, min_lat, max_lat, min_lon, max_lon)",
+]
+
+
+def _to_float(value: Any) -> Optional[float]:
+    """Parse a coordinate, returning None if it is missing or invalid"""
+    if value is None or value == "":
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class LocationStore:
+    """
+    Single SQLite database holding locations from every scraper
+    
+    Locations are upserted by (company_name, store identity), with B-tree
+    indexes on company, state and ZIP code and an R*Tree index on
+    coordinates for bounding-box queries.
+    """
+    
+    def __init__(self, path: Optional[str] = None):
+        """
+        Args:
+            path: Database file, defaults to AUGIPS_LOCATION_STORE or
+                data/locations.sqlite
+        """
+        self.path = path or os.getenv("AUGIPS_LOCATION_STORE", DEFAULT_STORE_PATH)
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        # Async runs write successive batches from different worker threads;
+        # a store is only ever used by one thread at a time
+        self.conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        with self.conn:
+            for statement in SCHEMA:
+                self.conn.execute(statement)
+    
+    def upsert(self, records: List[Dict[str, Any]], source: str = "") -> int:
+        """
+        Insert or update locations in one transaction
+        
+        Args:
+            records: Dictionaries containing store location data
+            source: Name of the scraper the records came from
+            
+        Returns:
+            Number of records written
+        """
+        now = time.time()
+        with self.conn:
+            for record in records:
+                company = record.get("company_name") or source
+                key = store_key(record)
+                lat = _to_float(record.get("latitude"))
+                lng = _to_float(record.get("longitude"))
+                extra = {k: v for k, v in record.items() if k not in STORE_COLUMNS and k != "company_name"}
+                
+                self.conn.execute(
+                    "INSERT INTO locations (company_name, store_key, store_name, address, city, state, zip_code, "
+                    "latitude, longitude, extra, source, first_seen, last_seen) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT (company_name, store_key) DO UPDATE SET "
+                    "store_name = excluded.store_name, address = excluded.address, city = excluded.city, "
+                    "state = excluded.state, zip_code = excluded.zip_code, latitude = excluded.latitude, "
+                    "longitude = excluded.longitude, extra = excluded.extra, source = excluded.source, "
+                    "last_seen = excluded.last_seen",
+                    (company, key, record.get("store_name"), record.get("address"), record.get("city"),
+                     record.get("state"), record.get("zip_code"), lat, lng,
+                     json.dumps(extra, default=str) if extra else None, source, now, now),
+                )
+                row_id = self.conn.execute(
+                    "SELECT id FROM locations WHERE company_name = ? AND store_key = ?", (company, key)
+                ).fetchone()[0]
+                
+                # Keep the spatial index in step with the row's coordinates
+                if lat is not None and lng is not None:
+                    self.conn.execute(
+                        "INSERT OR REPLACE INTO locations_rtree (id, min_lat, max_lat, min_lon, max_lon) "
+                        "VALUES (?, ?, ?, ?, ?)",
+                        (row_id, lat, lat, lng, lng),
+                    )
+                else:
+                    self.conn.execute("DELETE FROM locations_rtree WHERE id = ?", (row_id,))
+        return len(records)
+    
+    def in_bbox(self, min_lat: float, min_lon: float, max_lat: float, max_lon: float,
+                company_name: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Find locations inside a bounding box using the R*Tree index
+        
+        Args:
+            min_lat: Southern edge
+            min_lon: Western edge
+            max_lat: Northern edge
+            max_lon: Eastern edge
+            company_name: Only return this company's locations
+            
+        Returns:
+            List of location dictionaries
+        """
+        # R*Tree boxes are stored as 32-bit floats, so filter candidates on
+        # the exact coordinates as well
+        query = (
+            "SELECT l.* FROM locations_rtree r JOIN locations l ON l.id = r.id "
+            "WHERE r.max_lat >= ? AND r.min_lat <= ? AND r.max_lon >= ? AND r.min_lon <= ? "
+            "AND l.latitude BETWEEN ? AND ? AND l.longitude BETWEEN ? AND ?"
+        )
+        params: List[Any] = [min_lat, max_lat, min_lon, max_lon, min_lat, max_lat, min_lon, max_lon]
+        if company_name is not None:
+            query += " AND l.company_name = ?"
+            params.append(company_name)
+        return [dict(row) for row in self.conn.execute(query, params)]
+    
+    def iter_locations(self, company_name: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Stream stored locations
+        
+        Args:
+            company_name: Only return this company's locations
+            
+        Yields:
+            Location dictionaries with company_name, store_key, the store
+            columns and source, the scraper that last wrote the row
+        """
+        query = f"SELECT company_name, store_key, {', '.join(STORE_COLUMNS)}, source FROM locations"
+        params: List[Any] = []
+        if company_name is not None:
+            query += " WHERE company_name = ?"
+            params.append(company_name)
+        for row in self.conn.execute(query, params):
+            yield dict(row)
+    
+    def companies_in_zip(self, zip_code: str) -> List[str]:
+        """
+        List the companies with a location in a ZIP code
+        
+        Args:
+            zip_code: ZIP or postal code
+            
+        Returns:
+            Sorted company names
+        """
+        rows = self.conn.execute(
+            "SELECT DISTINCT company_name FROM locations WHERE zip_code = ? ORDER BY company_name", (zip_code,)
+        )
+        return [row[0] for row in rows]
+    
+    def close(self) -> None:
+        """Close the database connection"""
+        self.conn.close()
+
+
+class LocationStoreSink(OutputSink):
+    """Upserts each batch into the consolidated location store"""
+    
+    def __init__(self, scraper, path: Optional[str] = None):
+        """
+        Args:
+            scraper: Scraper whose locations are written
+            path: Database file, defaults to the shared store
+        """
+        super().__init__(scraper)
+        self.store = LocationStore(path)
+    
+    def write_batch(self, records: List[Dict[str, Any]]) -> None:
+        """Upsert a batch in a single transaction"""
+        self.count += self.store.upsert(records, source=self.scraper.company_name)
+    
+    def close(self) -> None:
+        """Close the database connection"""
+        self.store.close()
+        if self.count:
+            print(f"Upserted {self.count} locations into {self.store.path}")
\ No newline at end of file
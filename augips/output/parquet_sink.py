@@ -0,0 +1,227 @@
+"""
+Parquet output sink for Augips framework
+"""
+
+import os
+import shutil
+from typing import Any, Dict, List, Optional, Set, Tuple
+from urllib.parse import quote
+
+from .base import OutputSink
+from ..utils.log import get_logger
+from ..utils.records import COORDINATE_FIELDS, LocationBatch
+
+# Import optional dependencies with fallbacks
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+logger = get_logger(__name__)
+
+# Columns the output is partitioned by, in directory order
+PARTITION_COLUMNS = ["company_name", "state"]
+
+# Empty partition values are written as "state=" rather than Hive's
+# __HIVE_DEFAULT_PARTITION__: pyarrow reads that back as null, and can't
+# combine null partitions with the other values into one categorical column
+EMPTY_PARTITION = ""
+
+# Typed columns stored in every file; other fields are stored as strings
+COLUMN_TYPES = {
+    "store_name": "string",
+    "address": "string",
+    "city": "string",
+    "zip_code": "string",
+    "latitude": "float64",
+    "longitude": "float64",
+}
+
+
+def _to_str(value: Any) -> Optional[str]:
+    """Convert a value to a string column entry"""
+    return None if value is None else str(value)
+
+
+class ParquetSink(OutputSink):
+    """
+    Writes locations to a Parquet dataset partitioned by company and state
+    
+    The dataset directory is named after the scraper's output_file without
+    its extension, e.g. data/autozone_locations/, with Hive-style
+    subdirectories such as company_name=AutoZone/state=CA/. Coordinates are
+    stored as float64; company and state come back as categorical columns
+    when the dataset is read with Hive partitioning. Each partition gets one
+    file with a row group per batch.
+    
+    Two cases are fixed up when the dataset is closed, by rewriting the
+    affected files one row group at a time:
+    
+    - A partition column that is empty in every row, such as state for
+      OpenStreetMap, is not partitioned on, since a level made only of
+      empty partitions is useless. It is stored in the files as a string
+      column of empty values instead.
+    - Extra fields that first appear after the first batch widen the
+      schema. Partitions written so far start new files, and the older
+      files are padded with null columns, so every file has the same schema.
+    """
+    
+    def __init__(self, scraper, path: Optional[str] = None):
+        """
+        Args:
+            scraper: Scraper whose locations are written
+            path: Dataset directory, defaults to output_file without extension
+        """
+        if pa is None:
+            raise RuntimeError("pyarrow not installed. Install with: pip install pyarrow")
+        super().__init__(scraper)
+        self.path = path or os.path.splitext(scraper.output_file)[0]
+        self.partial_path = f"{self.path}.partial"
+        self._writers: Dict[Tuple[str, ...], Any] = {}
+        self._schema = None
+        # Partition key, path and schema of every file written so far
+        self._files: List[Tuple[Tuple[str, ...], str, Any]] = []
+        # Partition columns with a non-empty value in at least one row
+        self._filled: Set[str] = set()
+        # Number in the names of files opened from now on, raised when the schema widens
+        self._part = 0
+        
+        if os.path.exists(self.partial_path):
+            shutil.rmtree(self.partial_path)
+    
+    def _build_schema(self, batch: LocationBatch, schema=None):
+        """Typed columns first, then extra fields as strings in order of first appearance"""
+        if schema is None:
+            schema = pa.schema([pa.field(name, pa.type_for_alias(type_name)) for name, type_name in COLUMN_TYPES.items()])
+        known = set(schema.names) | set(PARTITION_COLUMNS)
+        for key in batch.fieldnames():
+            if key not in known:
+                schema = schema.append(pa.field(key, pa.string()))
+                known.add(key)
+        return schema
+    
+    def _partition_dir(self, values: Tuple[str, ...], skip: Set[str] = frozenset()) -> str:
+        """Hive-style directory for a partition, leaving out the columns in skip"""
+        parts = [
+            f"{column}={quote(value, safe='') if value else EMPTY_PARTITION}"
+            for column, value in zip(PARTITION_COLUMNS, values)
+            if column not in skip
+        ]
+        return os.path.join(self.partial_path, *parts)
+    
+    def _to_table(self, batch: LocationBatch):
+        """Build an Arrow table from the batch's columns"""
+        arrays = []
+        for field in self._schema:
+            if field.name in COORDINATE_FIELDS:
+                # NaN marks unknown coordinates in the batch and becomes null
+                values = batch.latitude if field.name == "latitude" else batch.longitude
+                arrays.append(pa.array(values, type=field.type, from_pandas=True))
+            else:
+                arrays.append(pa.array([_to_str(value) for value in batch.column(field.name)], type=field.type))
+        return pa.Table.from_arrays(arrays, schema=self._schema)
+    
+    def write_batch(self, records: List[Dict[str, Any]]) -> None:
+        """Group a batch by partition and append a row group to each partition's file"""
+        if not records:
+            return
+        batch = records if isinstance(records, LocationBatch) else LocationBatch.from_records(records)
+        schema = self._build_schema(batch, self._schema)
+        if self._schema is not None and not schema.equals(self._schema):
+            logger.debug("New fields in %s, starting new Parquet files: %s", self.scraper.company_name,
+                         ", ".join(schema.names[len(self._schema):]))
+            self._close_writers()
+            self._part += 1
+        self._schema = schema
+        table = self._to_table(batch)
+        
+        partitions: Dict[Tuple[str, ...], List[int]] = {}
+        keys = zip(*(batch.column(column) for column in PARTITION_COLUMNS))
+        for index, values in enumerate(keys):
+            key = tuple(str(value or "") for value in values)
+            partitions.setdefault(key, []).append(index)
+        
+        for key, indexes in partitions.items():
+            rows = table if len(partitions) == 1 else table.take(pa.array(indexes))
+            
+            writer = self._writers.get(key)
+            if writer is None:
+                directory = self._partition_dir(key)
+                os.makedirs(directory, exist_ok=True)
+                path = os.path.join(directory, f"part-{self._part}.parquet")
+                writer = pq.ParquetWriter(path, self._schema, compression="zstd")
+                self._writers[key] = writer
+                self._files.append((key, path, self._schema))
+                self._filled.update(column for column, value in zip(PARTITION_COLUMNS, key) if value)
+            writer.write_table(rows)
+        
+        self.count += len(records)
+    
+    def _close_writers(self) -> None:
+        """Close every open partition file"""
+        for writer in self._writers.values():
+            writer.close()
+        self._writers = {}
+    
+    def _rewrite(self, source: str, target: str, schema, empty: Set[str]) -> None:
+        """
+        Copy a file to target with the given schema, one row group at a time
+        
+        Missing columns are filled with nulls, or with empty strings for the
+        partition columns in empty.
+        """
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        with pq.ParquetFile(source) as parquet, \
+                pq.ParquetWriter(f"{target}.tmp", schema, compression="zstd") as writer:
+            for index in range(parquet.num_row_groups):
+                table = parquet.read_row_group(index)
+                columns = []
+                for field in schema:
+                    if field.name in table.column_names:
+                        columns.append(table.column(field.name))
+                    elif field.name in empty:
+                        columns.append(pa.array([""] * len(table), type=field.type))
+                    else:
+                        columns.append(pa.nulls(len(table), field.type))
+                writer.write_table(pa.Table.from_arrays(columns, schema=schema))
+        os.remove(source)
+        os.replace(f"{target}.tmp", target)
+        
+        # Remove partition directories left empty by the move
+        directory = os.path.dirname(source)
+        while directory != self.partial_path and not os.listdir(directory):
+            os.rmdir(directory)
+            directory = os.path.dirname(directory)
+    
+    def _finish_files(self) -> None:
+        """Give every file the final schema and stop partitioning on columns that are always empty"""
+        empty = {column for column in PARTITION_COLUMNS if column not in self._filled}
+        schema = self._schema
+        for column in PARTITION_COLUMNS:
+            if column in empty:
+                schema = schema.append(pa.field(column, pa.string()))
+        
+        for key, path, file_schema in self._files:
+            if empty or not file_schema.equals(schema):
+                target = os.path.join(self._partition_dir(key, skip=empty), os.path.basename(path))
+                self._rewrite(path, target, schema, empty)
+    
+    def close(self) -> None:
+        """Finish all partition files and move the dataset into place"""
+        if self._schema is None:
+            logger.debug("No data to save as Parquet for %s", self.scraper.company_name)
+            return
+        self._close_writers()
+        self._finish_files()
+        if os.path.exists(self.path):
+            shutil.rmtree(self.path)
+        os.replace(self.partial_path, self.path)
+        print(f"Saved {self.count} locations to {self.path}/ (Parquet)")
+    
+    def abort(self) -> None:
+        """Close partition files, leaving the partial dataset in place"""
+        if self._writers:
+            self._close_writers()
+            print(f"Saved {self.count} locations to {self.partial_path}/ before the error")
\ No newline at end of file
@@ -2,31 +2,173 @@
 Runner module for executing scrapers
 """
 
+import contextlib
 import os
-from typing import Optional, List
+import sys
+import time
+from typing import Any, Awaitable, ContextManager, Optional, List, Dict, Tuple
 from .scrapers import SCRAPERS
+from .utils.log import configure_logging, get_logger
 
+logger = get_logger(__name__)
 
-def run_scraper(scraper_name: str, debug: bool = False) -> None:
+
+def _profiled(name: str, profile: Optional[str], all_threads: bool = False) -> ContextManager[Any]:
+    """profile_run() for a profile mode, or a no-op without one, so cProfile is only imported when used"""
+    if profile is None:
+        return contextlib.nullcontext()
+    from .utils.profiling import profile_run
+    return profile_run(name, profile, all_threads=all_threads)
+
+
+def _run_one(name: str, output_formats: Optional[List[str]] = None,
+             profile: Optional[str] = None) -> Tuple[str, int, Optional[Exception], float]:
+    """
+    Import, initialize and run a single scraper, keeping its errors to itself
+    
+    A scraper module or plugin that fails to import is reported like any
+    other error of that scraper.
+    
+    Args:
+        name: Registered scraper name
+        output_formats: Output formats to write, or None for the scraper's default
+        profile: Profile mode for this scraper's thread, or None
+    
+    Returns:
+        Tuple of (name, locations saved, error, elapsed seconds)
+    """
+    start = time.perf_counter()
+    with _profiled(name, profile):
+        try:
+            logger.debug("Initializing %s scraper", name)
+            scraper = SCRAPERS[name]()
+            if output_formats:
+                scraper.output_formats = output_formats
+            count = scraper.run() or 0
+            return name, count, None, time.perf_counter() - start
+        except Exception as e:
+            logger.debug("Error running %s scraper", name, exc_info=e)
+            return name, 0, e, time.perf_counter() - start
+
+
+async def _arun_one(name: str,
+                    output_formats: Optional[List[str]] = None) -> Tuple[str, int, Optional[Exception], float]:
+    """
+    Import, initialize and run a single scraper on the event loop
+    
+    Args:
+        name: Registered scraper name
+        output_formats: Output formats to write, or None for the scraper's default
+    
+    Returns:
+        Tuple of (name, locations saved, error, elapsed seconds)
+    """
+    import asyncio
+    
+    start = time.perf_counter()
+    try:
+        logger.debug("Initializing %s scraper", name)
+        # Imports and constructors may block, e.g. on robots.txt checks
+        scraper = await asyncio.to_thread(lambda: SCRAPERS[name]())
+        if output_formats:
+            scraper.output_formats = output_formats
+        count = await scraper.arun() or 0
+        return name, count, None, time.perf_counter() - start
+    except Exception as e:
+        logger.debug("Error running %s scraper", name, exc_info=e)
+        return name, 0, e, time.perf_counter() - start
+
+
+async def _on_browser_threads(coroutine: Awaitable[Dict[str, int]]) -> Dict[str, int]:
+    """
+    Await a coroutine with a BrowserThreadPool as the loop's default executor
+    
+    Blocking scrapers run through asyncio.to_thread(), so its threads keep
+    their browser for the next scraper instead of launching one each. The
+    browsers are closed when asyncio.run() shuts the executor down.
+    """
+    import asyncio
+    from .utils.browser import BrowserThreadPool
+    
+    asyncio.get_running_loop().set_default_executor(BrowserThreadPool(thread_name_prefix="augips"))
+    return await coroutine
+
+
+async def arun_scrapers(names: List[str], concurrency: Optional[int] = None,
+                        output_formats: Optional[List[str]] = None) -> Dict[str, int]:
+    """
+    Run several scrapers concurrently on one event loop
+    
+    Scrapers that override ascrape() run as coroutines; blocking scrapers are
+    adapted by the base class and run in worker threads.
+    
+    Args:
+        names: Registered scraper names to run
+        concurrency: Maximum number of scrapers running at once, or None for no limit
+        output_formats: Output formats to write, or None for each scraper's default
+    
+    Returns:
+        Dictionary mapping scraper name to the number of locations it saved
+    """
+    import asyncio
+    
+    semaphore = asyncio.Semaphore(concurrency) if concurrency else None
+    results = {}
+    
+    async def _run(name: str) -> None:
+        if semaphore is None:
+            outcome = await _arun_one(name, output_formats)
+        else:
+            async with semaphore:
+                outcome = await _arun_one(name, output_formats)
+        _report(*outcome)
+        results[name] = outcome[1]
+    
+    await asyncio.gather(*(_run(name) for name in names))
+    return results
+
+
+def _report(name: str, count: int, error: Optional[Exception], elapsed: float) -> None:
+    """Print the outcome of a single scraper run"""
+    if error is not None:
+        print(f"Error running {name} scraper: {str(error)}")
+    else:
+        print(f"[{name}] {count} locations in {elapsed:.1f}s")
+
+
+def run_scraper(scraper_name: str, debug: bool = False, workers: int = 1,
+                use_async: bool = False, output_formats: Optional[List[str]] = None,
+                cache_mode: Optional[str] = None, profile: Optional[str] = None) -> Dict[str, int]:
     """
     Run a specific scraper or all scrapers
     
     Args:
         scraper_name: Name of the scraper to run, or "all" to run all scrapers
-        debug: Enable debug mode
+        debug: Enable debug mode: DEBUG-level logs with full tracebacks, also
+            written to debug/augips.log, and debugging screenshots
+        workers: Number of scrapers to run side by side when running "all".
+            Each scraper runs in its own worker thread with its own error
+            handling, so a full run takes about as long as the slowest scraper.
+        use_async: Run scrapers on a single asyncio event loop through their
+            ascrape() coroutines instead of a thread pool. With workers > 1,
+            at most that many scrapers run at once.
+        output_formats: Output formats to write, e.g. ["csv", "parquet"];
+            defaults to CSV, the consolidated SQLite location store and
+            the change journal
+        cache_mode: HTTP cache mode for this run: "normal", "prefer-cache",
+            "offline" or "refresh"; None keeps the shared client's setting
+        profile: Profile each scraper: "cprofile" writes a pstats file and
+            collapsed stacks to data/profiles/<scraper>/, "sample" only the
+            collapsed stacks from a low-overhead stack sampler. Defaults to
+            AUGIPS_PROFILE, so sampling can be left on for scheduled runs.
+            Async runs are profiled as a whole rather than per scraper.
+    
+    Returns:
+        Dictionary mapping scraper name to the number of locations it saved
     """
-    # Import debug utilities
-    try:
-        from .utils import debug_print
-    except ImportError:
-        # Fallback if debug_print is not available
-        def debug_print(message, obj=None, error=None):
-            if debug:
-                print(f"[DEBUG] {message}")
-                if obj is not None:
-                    print(f"[DEBUG] {obj}")
-                if error is not None:
-                    print(f"[DEBUG] Error: {str(error)}")
+    # asyncio is only imported for async runs to keep CLI startup fast
+    if use_async:
+        import asyncio
     
     # Create data directory if it doesn't exist
     os.makedirs("data", exist_ok=True)
@@ -36,37 +178,171 @@ def run_scraper(scraper_name: str, debug: bool = False) -> None:
         os.makedirs("debug", exist_ok=True)
         print("Debug mode enabled - check debug/ directory for screenshots and logs")
     
-    debug_print(f"Available scrapers: {', '.join(SCRAPERS.keys())}")
+    # Log records are written by a background thread, so scrapers never
+    # wait on the terminal; debug mode adds DEBUG records and tracebacks
+    configure_logging(debug=debug, log_file="debug/augips.log" if debug else None)
+    
+    if cache_mode is not None:
+        from .utils.http import HttpClient, set_http_client
+        from .utils.httpcache import HttpCache
+        set_http_client(HttpClient(cache=HttpCache(mode=cache_mode)))
+    
+    logger.debug("Available scrapers: %s", ", ".join(SCRAPERS))
+    
+    profile = profile or os.getenv("AUGIPS_PROFILE") or None
+    if profile is not None:
+        from .utils.profiling import PROFILE_MODES
+        if profile not in PROFILE_MODES:
+            print(f"Unknown profile mode '{profile}', profiling disabled. "
+                  f"Available modes: {', '.join(PROFILE_MODES)}")
+            profile = None
+    if profile == "cprofile" and workers > 1 and not use_async:
+        # Only one deterministic profiler can be active at a time on newer Pythons
+        print("Deterministic profiling runs scrapers one at a time; use --profile sample with --workers")
+        workers = 1
+    
+    results = {}
     
     if scraper_name.lower() == "all":
-        print(f"Running all {len(SCRAPERS)} scrapers...")
-        for name, scraper_class in SCRAPERS.items():
-            try:
-                debug_print(f"Initializing {name} scraper")
-                scraper = scraper_class()
-                scraper.run()
-            except Exception as e:
-                debug_print(f"Error running {name} scraper", error=e)
-                print(f"Error running {name} scraper: {str(e)}")
+        workers = max(1, min(workers, len(SCRAPERS)))
+        start = time.perf_counter()
+        
+        if use_async:
+            print(f"Running all {len(SCRAPERS)} scrapers on the event loop...")
+            # Tasks share the loop thread, so the whole run is one profile
+            with _profiled("all", profile, all_threads=True):
+                results = asyncio.run(_on_browser_threads(
+                    arun_scrapers(list(SCRAPERS.keys()), concurrency=workers if workers > 1 else None,
+                                  output_formats=output_formats)
+                ))
+        elif workers == 1:
+            print(f"Running all {len(SCRAPERS)} scrapers...")
+            for name in SCRAPERS.keys():
+                name, count, error, elapsed = _run_one(name, output_formats, profile)
+                _report(name, count, error, elapsed)
+                results[name] = count
+        else:
+            print(f"Running all {len(SCRAPERS)} scrapers with {workers} workers...")
+            # Thread pools are only imported for concurrent runs
+            from concurrent.futures import as_completed
+            from .utils.browser import BrowserThreadPool
+            # Each worker thread launches Chromium at most once for the run
+            with BrowserThreadPool(max_workers=workers, thread_name_prefix="augips") as executor:
+                futures = [
+                    executor.submit(_run_one, name, output_formats, profile)
+                    for name in SCRAPERS.keys()
+                ]
+                for future in as_completed(futures):
+                    name, count, error, elapsed = future.result()
+                    _report(name, count, error, elapsed)
+                    results[name] = count
+        
+        print(f"Finished {len(results)} scrapers in {time.perf_counter() - start:.1f}s")
     elif scraper_name.lower() in SCRAPERS:
         print(f"Running {scraper_name} scraper...")
-        try:
-            debug_print(f"Initializing {scraper_name} scraper")
-            scraper = SCRAPERS[scraper_name.lower()]()
-            scraper.run()
-        except Exception as e:
-            debug_print(f"Error running {scraper_name} scraper", error=e)
-            print(f"Error running {scraper_name} scraper: {str(e)}")
+        if use_async:
+            with _profiled(scraper_name.lower(), profile, all_threads=True):
+                outcome = asyncio.run(_arun_one(scraper_name.lower(), output_formats))
+        else:
+            outcome = _run_one(scraper_name.lower(), output_formats, profile)
+        name, count, error, elapsed = outcome
+        if error is not None:
+            print(f"Error running {scraper_name} scraper: {str(error)}")
+        results[name] = count
     else:
         print(f"Scraper '{scraper_name}' not found. Available scrapers: {', '.join(SCRAPERS.keys())}")
         print("\nAvailable scrapers:")
         for name in SCRAPERS.keys():
             print(f"- {name}")
 
+    # Shut down the browser shared by scrapers that ran on this thread; if
+    # the browser module was never imported, no scraper started one
+    browser = sys.modules.get("augips.utils.browser")
+    if browser is not None:
+        browser.close_browser_pool()
+    return results
 
-if __name__ == "__main__":
-    import sys
+
+def run_dedupe(output_path: str = "data/canonical_locations.csv", radius_m: Optional[float] = None) -> int:
+    """
+    Merge duplicate places across every scraper in the location store
     
+    Args:
+        output_path: CSV file for the canonical locations
+        radius_m: Maximum distance in metres between duplicates
+        
+    Returns:
+        Number of canonical locations written
+    """
+    import csv
+    from .output.location_store import LocationStore
+    from .utils.dedupe import DEFAULT_RADIUS_M, deduplicate_locations
+    
+    store = LocationStore()
+    try:
+        records = list(store.iter_locations())
+    finally:
+        store.close()
+    
+    start = time.perf_counter()
+    canonical = deduplicate_locations(records, radius_m=radius_m or DEFAULT_RADIUS_M)
+    print(f"Merged {len(records)} locations into {len(canonical)} places in {time.perf_counter() - start:.1f}s")
+    
+    if canonical:
+        fieldnames = list(dict.fromkeys(key for record in canonical for key in record))
+        os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+        with open(output_path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=fieldnames)
+            writer.writeheader()
+            writer.writerows(canonical)
+        print(f"Saved {len(canonical)} places to {output_path}")
+    return len(canonical)
+
+
+def run_benchmark(names: Optional[List[str]] = None, scale: float = 1.0, output_path: Optional[str] = None,
+                  baseline_path: Optional[str] = None, tolerance: float = 0.2) -> int:
+    """
+    Benchmark scrapers offline against local fixtures and print a report
+    
+    Args:
+        names: Benchmarks to run, or None for all of them
+        scale: Size multiplier for the synthetic fixtures
+        output_path: JSON file to save the results to, for use as a later baseline
+        baseline_path: JSON results of an earlier run to compare against
+        tolerance: Allowed fractional drop in throughput or growth in memory
+        
+    Returns:
+        Number of regressions against the baseline
+    """
+    import json
+    from .benchmark import compare_to_baseline, format_report, run_benchmarks
+    
+    configure_logging()
+    print(f"Running benchmarks at scale {scale:g}...")
+    results = run_benchmarks(names, scale=scale)
+    print(format_report(results))
+    
+    if output_path:
+        os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+        with open(output_path, "w", encoding="utf-8") as f:
+            json.dump({"scale": scale, "results": results}, f, indent=2)
+        print(f"Saved benchmark results to {output_path}")
+    
+    if not baseline_path:
+        return 0
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = json.load(f)
+    if baseline.get("scale") != scale:
+        print(f"Warning: baseline was recorded at scale {baseline.get('scale')}, not {scale:g}")
+    regressions = compare_to_baseline(results, baseline["results"], tolerance=tolerance)
+    for regression in regressions:
+        print(f"Regression: {regression}")
+    if not regressions:
+        print(f"No regressions against {baseline_path}")
+    return len(regressions)
+
+
+if __name__ == "__main__":
     if len(sys.argv) > 1:
         run_scraper(sys.argv[1])
     else:
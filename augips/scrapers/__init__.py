@@ -2,26 +2,42 @@
 Scrapers package for Augips framework
 """
 
-from .base import Scraper
-from .autozone import AutoZoneScraper
-from .oreilly import OReillyAutoPartsScraper
-from .simple import SimpleScraper
-from .advanced import AdvancedAutoPartsScraper
-from .pepboys import PepBoysScraper
-from .napa import NAPAScraper
-from .ikea import IKEAScraper
-from .openstreetmap import OpenStreetMapScraper
-from .wikipedia import WikipediaScraper
+import importlib
+
+from .registry import ScraperRegistry
 
 # Register scrapers here
-SCRAPERS = {
-    "autozone": AutoZoneScraper,
-    "oreilly": OReillyAutoPartsScraper,
-    "simple": SimpleScraper,
-    "advanced": AdvancedAutoPartsScraper,
-    "pepboys": PepBoysScraper,
-    "napa": NAPAScraper,
-    "ikea": IKEAScraper,
-    "openstreetmap": OpenStreetMapScraper,
-    "wikipedia": WikipediaScraper,
-}
\ No newline at end of file
+# Scrapers are referenced by import path and only imported when they run
+SCRAPERS = ScraperRegistry({
+    "autozone": "augips.scrapers.autozone:AutoZoneScraper",
+    "oreilly": "augips.scrapers.oreilly:OReillyAutoPartsScraper",
+    "simple": "augips.scrapers.simple:SimpleScraper",
+    "advanced": "augips.scrapers.advanced:AdvancedAutoPartsScraper",
+    "pepboys": "augips.scrapers.pepboys:PepBoysScraper",
+    "napa": "augips.scrapers.napa:NAPAScraper",
+    "ikea": "augips.scrapers.ikea:IKEAScraper",
+    "openstreetmap": "augips.scrapers.openstreetmap:OpenStreetMapScraper",
+    "wikipedia": "augips.scrapers.wikipedia:WikipediaScraper",
+})
+
+# Classes importable from this package, loaded on first access
+_LAZY_EXPORTS = {
+    "Scraper": ".base",
+    "DirectoryScraper": ".directory",
+    "AutoZoneScraper": ".autozone",
+    "OReillyAutoPartsScraper": ".oreilly",
+    "SimpleScraper": ".simple",
+    "AdvancedAutoPartsScraper": ".advanced",
+    "PepBoysScraper": ".pepboys",
+    "NAPAScraper": ".napa",
+    "IKEAScraper": ".ikea",
+    "OpenStreetMapScraper": ".openstreetmap",
+    "WikipediaScraper": ".wikipedia",
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_EXPORTS:
+        module = importlib.import_module(_LAZY_EXPORTS[name], __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
\ No newline at end of file
@@ -3,18 +3,15 @@ Advanced Auto Parts store location scraper
 """
 
 from typing import List, Dict, Any
-import requests
-from bs4 import BeautifulSoup
 
 from .base import Scraper
-from ..utils import debug_print
 
 
 class AdvancedAutoPartsScraper(Scraper):
     """Scraper for Advanced Auto Parts store locations using static HTML approach"""
     
-    def __init__(self):
-        super().__init__("Advanced Auto Parts")
+    def __init__(self, http_client=None):
+        super().__init__("Advanced Auto Parts", http_client=http_client)
         self.base_url = "https://stores.advanceautoparts.com/"
         
     def scrape(self) -> List[Dict[str, Any]]:
@@ -24,17 +21,17 @@ class AdvancedAutoPartsScraper(Scraper):
         Returns:
             List of dictionaries containing store location data
         """
-        debug_print("Starting Advanced Auto Parts scraper")
+        self.logger.debug("Starting Advanced Auto Parts scraper")
         locations = []
         
         try:
             # Use requests and BeautifulSoup instead of Playwright
-            debug_print(f"Fetching {self.base_url}")
-            response = requests.get(self.base_url, timeout=30)
+            self.logger.debug("Fetching %s", self.base_url)
+            response = self.http.get(self.base_url, timeout=30)
             
             if response.status_code == 200:
-                debug_print("Successfully fetched page")
-                soup = BeautifulSoup(response.text, "html.parser")
+                self.logger.debug("Successfully fetched page")
+                soup = self.parse_html(response.text, only=["title"])
                 
                 # For demonstration, return sample data
                 # In a real implementation, you would parse the HTML
@@ -61,12 +58,11 @@ class AdvancedAutoPartsScraper(Scraper):
                     }
                 ]
                 
-                debug_print(f"Returning {len(sample_locations)} sample locations")
-                return sample_locations
+                return self.use_fallback(sample_locations, "store pages are not parsed yet")
             else:
-                debug_print(f"Failed to fetch page: {response.status_code}")
+                self.mark_incomplete(f"page returned {response.status_code}")
                 
         except Exception as e:
-            debug_print("Error scraping Advanced Auto Parts", error=e)
+            self.mark_incomplete("error scraping Advanced Auto Parts", exc_info=e)
         
         return locations
\ No newline at end of file
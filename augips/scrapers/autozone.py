@@ -2,24 +2,30 @@
 AutoZone store location scraper
 """
 
+import logging
 import time
-import requests
 from typing import List, Dict, Any, Optional
-from playwright.sync_api import sync_playwright
-from bs4 import BeautifulSoup
 
 from .base import Scraper
-from ..utils import debug_print
+from ..utils.records import Location
+from ..utils.browser import get_browser_pool, wait_for_first_selector
+from ..utils.capture import NetworkCapture
+from ..utils.metrics import timer
 
 
 class AutoZoneScraper(Scraper):
     """Scraper for AutoZone store locations"""
     
-    def __init__(self):
-        super().__init__("AutoZone")
+    def __init__(self, http_client=None):
+        super().__init__("AutoZone", http_client=http_client)
         self.base_url = "https://www.autozone.com/locations/"
         self.store_locator_url = "https://www.autozone.com/store-locator"
         
+        # Store search API responses to capture instead of scraping the DOM;
+        # only the search endpoint, not every URL with "store" in its path
+        self.capture_network = True
+        self.api_patterns = [r"^https://www\.autozone\.com/ecomm/b2c/v\d+/stores?/search\b"]
+        
         # Check robots.txt to ensure we're allowed to scrape
         self._check_robots_txt()
     
@@ -44,17 +50,8 @@ class AutoZoneScraper(Scraper):
         # Method 2: Dynamic content with Playwright (placeholder)
         locations = self._scrape_with_playwright()
         
-        # Add company name to all locations
-        for location in locations:
-            location["company_name"] = self.company_name
-            
-            # Geocode addresses that don't have coordinates
-            if "latitude" not in location or "longitude" not in location:
-                address = f"{location.get('address', '')}, {location.get('city', '')}, {location.get('state', '')} {location.get('zip_code', '')}"
-                lat, lng = self.geocode_address(address)
-                location["latitude"] = lat
-                location["longitude"] = lng
-        
+        # Company names and missing coordinates are filled in for the whole
+        # batch by Scraper.write_batch()
         return locations
     
     def _scrape_static_html(self) -> List[Dict[str, Any]]:
@@ -62,9 +59,9 @@ class AutoZoneScraper(Scraper):
         locations = []
         
         # Example implementation using requests and BeautifulSoup
-        response = requests.get(self.base_url)
+        response = self.http.get(self.base_url)
         if response.status_code == 200:
-            soup = BeautifulSoup(response.text, "html.parser")
+            soup = self.parse_html(response.text, only=[".store-location"])
             
             # Find store location elements (placeholder logic)
             # In a real implementation, you would inspect the page structure
@@ -72,76 +69,81 @@ class AutoZoneScraper(Scraper):
             store_elements = soup.select(".store-location")
             
             for store in store_elements:
-                location = {
-                    "store_name": store.select_one(".store-name").text.strip(),
-                    "address": store.select_one(".address").text.strip(),
-                    "city": store.select_one(".city").text.strip(),
-                    "state": store.select_one(".state").text.strip(),
-                    "zip_code": store.select_one(".zip").text.strip(),
+                location = Location(
+                    store_name=store.select_one(".store-name").text.strip(),
+                    address=store.select_one(".address").text.strip(),
+                    city=store.select_one(".city").text.strip(),
+                    state=store.select_one(".state").text.strip(),
+                    zip_code=store.select_one(".zip").text.strip(),
                     # Coordinates might be available in data attributes
-                    "latitude": store.get("data-lat"),
-                    "longitude": store.get("data-lng"),
-                }
+                    latitude=store.get("data-lat"),
+                    longitude=store.get("data-lng"),
+                )
                 locations.append(location)
+                
+                # Start geocoding while the rest of the page is processed
+                self.enqueue_geocode(location)
         
         return locations
     
     def _scrape_with_playwright(self) -> List[Dict[str, Any]]:
         """Scrape store locations using Playwright for dynamic content"""
         locations = []
+        # Screenshots are only taken in debug mode
+        debug = self.logger.isEnabledFor(logging.DEBUG)
         
         try:
             # Example implementation using Playwright
             # This is a placeholder that demonstrates the approach
-            with sync_playwright() as p:
-                browser = p.chromium.launch(headless=True)
-                page = browser.new_page()
-                # Set timeout after page creation
-                page.set_default_timeout(60000)  # Increase timeout to 60 seconds
+            # Pages come from the shared pool with a 60 second default timeout
+            with get_browser_pool().page() as page:
+                # Block images, fonts and analytics, and record API responses
+                capture = NetworkCapture(page, self.api_patterns) if self.capture_network else None
                 
                 try:
-                    # Navigate to the store locator page
-                    page.goto(self.store_locator_url, wait_until="networkidle")
-                    
-                    # Example: Enter a zip code to search for stores
-                    # Wait for the input field to be available
-                    page.wait_for_selector("#store-search-input", timeout=60000)
-                    page.fill("#store-search-input", "90210")
-                    
-                    # Wait for the button to be available and click it
-                    page.wait_for_selector("#store-search-button", timeout=60000)
-                    page.click("#store-search-button")
+                    with timer("browser_wait"):
+                        # Navigate to the store locator page
+                        page.goto(self.store_locator_url, wait_until="networkidle")
+                        
+                        # Example: Enter a zip code to search for stores
+                        # Wait for the input field to be available
+                        page.wait_for_selector("#store-search-input", timeout=60000)
+                        page.fill("#store-search-input", "90210")
+                        
+                        # Wait for the button to be available and click it
+                        page.wait_for_selector("#store-search-button", timeout=60000)
+                        page.click("#store-search-button")
                     
                     # Take a screenshot before waiting for selectors
-                    page.screenshot(path="debug/autozone_before_wait.png")
+                    if debug:
+                        page.screenshot(path="debug/autozone_before_wait.png")
                     
-                    debug_print("Waiting for store results to load...")
+                    self.logger.debug("Waiting for store results to load...")
                     try:
-                        # Try multiple possible selectors
+                        # Watch all possible selectors at once
                         selectors = [".store-list-item", ".store-location", ".store-info", ".store-details"]
-                        found = False
+                        matched = wait_for_first_selector(page, selectors, timeout=15000)
                         
-                        for selector in selectors:
-                            debug_print(f"Trying selector: {selector}")
-                            try:
-                                page.wait_for_selector(selector, timeout=15000)
-                                debug_print(f"Found selector: {selector}")
-                                found = True
-                                break
-                            except Exception as e:
-                                debug_print(f"Selector {selector} not found", error=e)
-                        
-                        if not found:
-                            debug_print("No store selectors found, using fallback data")
+                        if matched:
+                            self.logger.debug("Found selector: %s", matched)
+                        else:
+                            self.logger.debug("No store selectors found, using fallback data")
                             # Take a screenshot to see what's on the page
-                            page.screenshot(path="debug/autozone_no_selectors.png")
+                            if debug:
+                                page.screenshot(path="debug/autozone_no_selectors.png")
                     except Exception as e:
-                        debug_print("Error waiting for selectors", error=e)
+                        self.logger.warning("Error waiting for selectors", exc_info=e)
+                    
+                    # Prefer structured JSON from the store locator API
+                    if capture is not None:
+                        locations = capture.store_records()
+                        for location in locations:
+                            self.enqueue_geocode(location)
                     
-                    # Extract store data from the page
+                    # Otherwise extract store data from the page
                     # In a real implementation, you would inspect the page structure
                     # and extract the relevant data
-                    store_elements = page.query_selector_all(".store-list-item")
+                    store_elements = [] if locations else page.query_selector_all(".store-list-item")
                     
                     for store in store_elements:
                         try:
@@ -156,27 +158,27 @@ class AutoZoneScraper(Scraper):
                             lat = store.get_attribute("data-lat")
                             lng = store.get_attribute("data-lng")
                             
-                            location = {
-                                "store_name": store_name,
-                                "address": address,
-                                "city": city,
-                                "state": state,
-                                "zip_code": zip_code,
-                                "latitude": lat,
-                                "longitude": lng,
-                            }
+                            location = Location(
+                                store_name=store_name,
+                                address=address,
+                                city=city,
+                                state=state,
+                                zip_code=zip_code,
+                                latitude=lat,
+                                longitude=lng,
+                            )
                             locations.append(location)
+                            
+                            # Start geocoding while extraction continues
+                            self.enqueue_geocode(location)
                         except Exception as e:
-                            debug_print("Error extracting store data", error=e)
+                            self.logger.warning("Error extracting store data", exc_info=e)
                             continue
                             
                 except Exception as e:
-                    debug_print("Error during page navigation or data extraction", error=e)
-                
-                finally:
-                    browser.close()
+                    self.logger.warning("Error during page navigation or data extraction", exc_info=e)
         except Exception as e:
-            debug_print("Error initializing Playwright", error=e)
+            self.logger.warning("Error initializing Playwright", exc_info=e)
         
         # For demonstration purposes, return some sample data
         # In a real implementation, this would be the actual scraped data
@@ -200,64 +202,61 @@ class AutoZoneScraper(Scraper):
             }
         ]
         
-        # Add debugging for actual selectors found on the page
+        # Add debugging for actual selectors found on the page; this loads
+        # the page a second time, so it only runs with debug logging enabled
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self._log_page_inputs()
+        
+        if locations:
+            self.logger.debug("Returning %s scraped locations", len(locations))
+            return locations
+        
+        return self.use_fallback(sample_locations, "no stores found on the store locator")
+    
+    def _log_page_inputs(self) -> None:
+        """Log the store locator's title and input fields for debugging selectors"""
+        # This reuses the pooled browser instead of launching a second one
         try:
-            with sync_playwright() as p:
-                browser = p.chromium.launch(headless=True)
-                page = browser.new_page()
-                
-                debug_print("Navigating to AutoZone store locator")
+            with get_browser_pool().page() as page:
+                self.logger.debug("Navigating to AutoZone store locator")
                 page.goto(self.store_locator_url, wait_until="networkidle")
                 
                 # Take a screenshot for debugging
-                page.screenshot(path="debug_autozone.png")
-                
-                # Debug page content
-                html_content = page.content()
-                debug_print(f"Page title: {page.title()}")
-                debug_print(f"Page URL: {page.url}")
-                
-                # Find actual form elements
-                form_elements = page.query_selector_all("input")
-                debug_print(f"Found {len(form_elements)} input elements")
+                page.screenshot(path="debug/autozone_locator.png")
+                self.logger.debug("Page title: %s, URL: %s", page.title(), page.url)
                 
-                for i, elem in enumerate(form_elements):
-                    elem_type = elem.get_attribute("type")
-                    elem_id = elem.get_attribute("id")
-                    elem_name = elem.get_attribute("name")
-                    debug_print(f"Input {i}: type={elem_type}, id={elem_id}, name={elem_name}")
-                
-                browser.close()
+                # Summarize the form fields in one record rather than one per input
+                inputs = page.eval_on_selector_all(
+                    "input", "elements => elements.map(e => [e.type, e.id, e.name].join('/'))"
+                )
+                self.logger.debug("Found %d input elements (type/id/name): %s", len(inputs), ", ".join(inputs))
         except Exception as e:
-            debug_print("Error during debugging", error=e)
-        
-        return sample_locations
+            self.logger.warning("Error during debugging", exc_info=e)
         
     def _check_robots_txt(self) -> None:
         """Check robots.txt to ensure we're allowed to scrape"""
         try:
             robots_url = "https://www.autozone.com/robots.txt"
-            response = requests.get(robots_url)
+            response = self.http.get(robots_url)
             
             if response.status_code == 200:
-                robots_content = response.text
-                debug_print("Robots.txt content:", robots_content)
+                self.logger.debug("Fetched robots.txt (%d bytes)", len(response.content))
                 
                 # Check if our paths are disallowed
                 # Based on the robots.txt, these paths are not explicitly disallowed
                 disallowed_paths = ['/atg/', '/dyn/', '/cart', '/rest/', '/checkout', '/error/', '/ymme/']
-                debug_print("Checking if our paths are allowed...")
-                debug_print(f"Store locator URL: {self.store_locator_url}")
+                self.logger.debug("Checking if our paths are allowed...")
+                self.logger.debug("Store locator URL: %s", self.store_locator_url)
                 
                 is_allowed = True
                 for path in disallowed_paths:
                     if path in self.store_locator_url:
                         is_allowed = False
-                        debug_print(f"WARNING: Path {path} is disallowed in robots.txt!")
+                        self.logger.warning("Path %s is disallowed in robots.txt!", path)
                 
                 if is_allowed:
-                    debug_print("Store locator path appears to be allowed by robots.txt")
+                    self.logger.debug("Store locator path appears to be allowed by robots.txt")
             else:
-                debug_print(f"Failed to fetch robots.txt: {response.status_code}")
+                self.logger.warning("Failed to fetch robots.txt: %s", response.status_code)
         except Exception as e:
-            debug_print("Error checking robots.txt", error=e)
\ No newline at end of file
+            self.logger.warning("Error checking robots.txt", exc_info=e)
\ No newline at end of file
@@ -3,57 +3,259 @@ Base scraper class for Augips framework
 """
 
 from abc import ABC, abstractmethod
+import asyncio
 import os
-import sys
-import traceback
-import pandas as pd
-from typing import List, Dict, Any, Optional
+import re
+from concurrent.futures import Future
+from itertools import islice
+from typing import List, Dict, Any, AsyncIterator, Iterable, Iterator, Optional
 
-# Import debug utilities if available
-try:
-    from ..utils import debug_print
-except ImportError:
-    # Fallback if debug_print is not available
-    def debug_print(message, obj=None, error=None):
-        print(f"[DEBUG] {message}")
-        if obj is not None:
-            print(f"[DEBUG] {obj}")
-        if error is not None:
-            print(f"[DEBUG] Error: {str(error)}")
-            print(f"[DEBUG] Error type: {type(error)}")
-            traceback.print_exc(file=sys.stdout)
+from ..utils.log import get_logger
+from ..utils.metrics import RunMetrics, collect_metrics, increment, timer
+from ..utils.records import LocationBatch
+
+# Batches an async scraper can get ahead of the output writer in arun()
+ASYNC_QUEUE_BATCHES = 4
 
 
 class Scraper(ABC):
     """Base scraper class that all scrapers should inherit from"""
     
-    def __init__(self, company_name: str):
+    # ISO country code used for offline postal code geocoding, or None if
+    # the scraper's locations span several countries
+    country: Optional[str] = "US"
+    
+    # Number of locations written to the output at a time
+    batch_size: int = 500
+    
+    # Output formats written by run(), from augips.output.SINKS
+    output_formats: Optional[List[str]] = None
+    
+    # Values filled into empty standard text fields of every location, e.g.
+    # {"state": ""}; company_name is always filled from the scraper
+    constant_columns: Optional[Dict[str, Any]] = None
+    
+    # HTML parser backend from augips.utils.htmlparse.PARSERS, or None for
+    # the default (lxml when installed, otherwise html.parser)
+    html_parser: Optional[str] = None
+    
+    def __init__(self, company_name: str, http_client=None):
         self.company_name = company_name
         self.output_file = f"data/{company_name.lower().replace(' ', '_')}_locations.csv"
+        self._http_client = http_client
+        self._geocode_jobs = {}
+        # Per-scraper logger named after the registry key, e.g.
+        # augips.scrapers.oreilly
+        self.logger = get_logger(f"scrapers.{self._logger_name()}")
+        # Stage times and counters of the current or last run
+        self.metrics: Optional[RunMetrics] = None
+        # Set when the current or last run missed stores, or returned sample
+        # data instead of scraped locations; see mark_incomplete()
+        self.incomplete = False
+        self.used_fallback = False
+    
+    def _logger_name(self) -> str:
+        """Registry key of this scraper, or a name made from the company for unregistered scrapers"""
+        from . import SCRAPERS
+        return SCRAPERS.name_of(type(self)) or re.sub(r"\W+", "_", self.company_name.lower()).strip("_")
+    
+    @property
+    def http(self):
+        """HTTP client used for all requests; defaults to the shared pooled client"""
+        if self._http_client is None:
+            from ..utils.http import get_http_client
+            self._http_client = get_http_client()
+        return self._http_client
+    
+    def parse_html(self, markup: str, only: Optional[List[str]] = None):
+        """
+        Parse an HTML page with this scraper's parser backend
+        
+        Args:
+            markup: HTML text
+            only: Tag names (["table"]) or class selectors ([".store-list"])
+                of the only elements the scraper needs; the rest of the page
+                is skipped while parsing
+            
+        Returns:
+            HtmlDocument with select(), select_one() and title
+        """
+        from ..utils.htmlparse import parse_html
+        with timer("parse"):
+            return parse_html(markup, parser=self.html_parser, only=only)
     
     @abstractmethod
-    def scrape(self) -> List[Dict[str, Any]]:
+    def scrape(self) -> Iterable[Dict[str, Any]]:
         """
         Main scraping method to be implemented by subclasses
         
+        Scrapers may return a list, or be generators that yield locations as
+        they are found. Generators are written to the output in batches, so
+        memory stays bounded for very large crawls.
+        
+        Locations should be Location records; plain dictionaries are still
+        accepted and converted.
+        
         Returns:
-            List of dictionaries containing store location data
+            List or iterator of Location records or dictionaries
         """
         pass
     
+    def iter_batches(self, batch_size: Optional[int] = None) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Run the scraper and yield its locations in batches
+        
+        Args:
+            batch_size: Locations per batch, defaults to self.batch_size
+            
+        Yields:
+            Lists of at most batch_size Location records or dictionaries
+        """
+        records = iter(self.scrape())
+        while True:
+            batch = list(islice(records, batch_size or self.batch_size))
+            if not batch:
+                return
+            yield batch
+    
+    async def ascrape(self) -> List[Dict[str, Any]]:
+        """
+        Asynchronous scraping method
+        
+        Scrapers that can keep many requests in flight should override this,
+        either with a coroutine that returns a list or with an async
+        generator that yields locations as they are found; arun() writes
+        yielded locations in batches. The default runs the blocking scrape()
+        in a worker thread and returns all of its locations, while arun()
+        streams scrape() directly instead of calling this.
+        
+        Returns:
+            List of dictionaries containing store location data
+        """
+        return await asyncio.to_thread(self._scrape_in_thread)
+    
+    def _scrape_in_thread(self) -> List[Dict[str, Any]]:
+        """Run scrape() in a worker thread and release that thread's browser afterwards"""
+        from ..utils.browser import release_browser_pool
+        try:
+            return list(self.scrape())
+        finally:
+            release_browser_pool()
+    
+    def mark_incomplete(self, reason: str, exc_info: Optional[BaseException] = None) -> None:
+        """
+        Report that this run did not see every store
+        
+        Outputs that compare runs, such as the change journal, don't treat
+        stores missing from an incomplete run as removed.
+        
+        Args:
+            reason: What went wrong, for the log
+            exc_info: Exception that caused it, logged with its traceback
+        """
+        self.incomplete = True
+        self.logger.warning("Incomplete run: %s", reason, exc_info=exc_info)
+    
+    def use_fallback(self, locations: List[Dict[str, Any]], reason: str) -> List[Dict[str, Any]]:
+        """
+        Report that this run returns hardcoded sample data, and return it
+        
+        Scrapers return this instead of their sample locations, so a blocked
+        or failed fetch isn't mistaken for a real result; the change journal
+        skips fallback runs entirely.
+        
+        Args:
+            locations: Sample locations
+            reason: Why scraped data isn't available, for the log
+            
+        Returns:
+            The sample locations
+        """
+        self.incomplete = True
+        self.used_fallback = True
+        self.logger.warning("Using %s fallback locations: %s", len(locations), reason)
+        return locations
+    
     def geocode_address(self, address: str) -> tuple:
         """
         Geocode an address to get latitude and longitude
         
+        Tries the offline postal code table first and falls back to the
+        rate-limited network geocoder.
+        
         Args:
             address: Full address string
             
         Returns:
-            Tuple of (latitude, longitude)
+            Tuple of (latitude, longitude), or (None, None) if it can't be found
+        """
+        from ..utils.postal import extract_us_zip
+        zip_code = extract_us_zip(address) if self.country == "US" else None
+        return self._start_geocode(address, zip_code, self.country).result()
+    
+    def format_address(self, location: Dict[str, Any]) -> str:
+        """
+        Build a geocodable address string from a location
+        
+        Args:
+            location: Dictionary containing store location data
+            
+        Returns:
+            Full address string
+        """
+        return f"{location.get('address') or ''}, {location.get('city') or ''}, {location.get('state') or ''} {location.get('zip_code') or ''}"
+    
+    def _start_geocode(self, query: str, zip_code: Any, country: Optional[str]) -> Future:
+        """
+        Start looking up the coordinates of one location
+        
+        Postal codes in the offline centroid table resolve immediately; other
+        lookups go to the shared rate-limited geocoding queue. Every
+        geocoding path of the scraper goes through here.
+        
+        Args:
+            query: Address string for the network geocoder
+            zip_code: Postal code, or None
+            country: ISO country code of the postal code, or None if unknown
+            
+        Returns:
+            Future of (latitude, longitude), (None, None) if not found
         """
-        # Placeholder for geocoding implementation
-        # In a real implementation, this would use a geocoding service
-        return (0.0, 0.0)
+        if country and zip_code:
+            from ..utils.postal import lookup_postal_code
+            lat, lng = lookup_postal_code(str(zip_code), country)
+            if lat is not None:
+                increment("geocode_postal_hits")
+                future = Future()
+                future.set_result((lat, lng))
+                return future
+        
+        from ..utils.geoqueue import get_geocoding_queue
+        return get_geocoding_queue().submit(query)
+    
+    def enqueue_geocode(self, location: Dict[str, Any]) -> None:
+        """
+        Start geocoding a location while the scraper keeps extracting
+        
+        Locations count as missing coordinates by the same rule write_batch()
+        applies: empty, unparseable, out of range or (0, 0). The lookup runs
+        on the shared geocoding queue, and write_batch() uses its result
+        when the location's batch is written instead of starting another.
+        
+        Args:
+            location: Dictionary containing store location data
+        """
+        if id(location) in self._geocode_jobs:
+            return
+        from ..utils.postprocess import invalid_coordinates, parse_coordinates
+        lat, lng = parse_coordinates([location.get("latitude"), location.get("longitude")])
+        if not invalid_coordinates(lat, lng):
+            return
+        
+        country = location.get("country") or self.country
+        future = self._start_geocode(self.format_address(location), location.get("zip_code"), country)
+        # The location is kept so its id isn't reused before the batch is written
+        self._geocode_jobs[id(location)] = (location, future)
     
     def save_to_csv(self, data: List[Dict[str, Any]]) -> None:
         """
@@ -62,31 +264,241 @@ class Scraper(ABC):
         Args:
             data: List of dictionaries containing store location data
         """
-        if not data:
-            print(f"No data to save for {self.company_name}")
-            return
-            
-        df = pd.DataFrame(data)
-        df.to_csv(self.output_file, index=False)
-        print(f"Saved {len(data)} locations to {self.output_file}")
+        from ..output import CSVSink
+        sink = CSVSink(self)
+        sink.write_batch(data)
+        sink.close()
     
-    def run(self) -> None:
-        """Run the scraper and save results"""
-        print(f"Scraping {self.company_name} store locations...")
+    def create_sinks(self) -> List[Any]:
+        """
+        Create the output sinks for a run
+        
+        Returns:
+            List of OutputSink instances
+        """
+        from ..output import DEFAULT_FORMATS, create_sinks
+        return create_sinks(self, self.output_formats or DEFAULT_FORMATS)
+    
+    def geocode_batch(self, batch: LocationBatch, rows: List[int],
+                      queued: Optional[Dict[int, Future]] = None) -> None:
+        """
+        Fill in coordinates for rows of a batch
+        
+        Rows the scraper already queued with enqueue_geocode() use that
+        lookup; the rest are started now, all before waiting on any of them.
+        
+        Args:
+            batch: Location batch, modified in place
+            rows: Indexes of rows without coordinates
+            queued: Lookups started by enqueue_geocode(), by row index
+        """
+        from ..utils.postprocess import coordinate_views, geocode_queries
+        
+        queued = queued or {}
+        queries = geocode_queries(batch, rows)
+        countries = batch.column("country")
+        zip_codes = batch.columns["zip_code"]
+        futures = {}
+        for row, query in zip(rows, queries):
+            future = queued.get(row)
+            if future is None:
+                future = self._start_geocode(query, zip_codes[row], countries[row] or self.country)
+            futures[row] = future
+        
+        pending = sum(1 for future in futures.values() if not future.done())
+        if pending:
+            self.logger.debug("Waiting for %s geocoding lookups", pending)
+        
+        # Write through NumPy views once every lookup has finished
+        found = {row: future.result() for row, future in futures.items()}
+        lat_view, lng_view = coordinate_views(batch)
+        for row, (lat, lng) in found.items():
+            if lat is not None:
+                lat_view[row] = lat
+                lng_view[row] = lng
+    
+    def write_batch(self, sinks: List[Any], batch: List[Dict[str, Any]]) -> None:
+        """
+        Normalize and geocode a batch, then hand it to every sink
+        
+        The batch is converted to columns once and normalized with
+        vectorized operations: coordinate parsing and range checks, company
+        name and constant_columns, and address strings for geocoding.
+        
+        Args:
+            sinks: Output sinks for this run
+            batch: Location records or dictionaries
+        """
+        from ..utils.postprocess import build_batch, normalize_batch
+        
+        # Lookups the scraper started while extracting these locations
+        queued = {}
+        if self._geocode_jobs:
+            for row, record in enumerate(batch):
+                job = self._geocode_jobs.pop(id(record), None)
+                if job is not None:
+                    queued[row] = job[1]
+        
+        columns = build_batch(batch)
+        missing = normalize_batch(columns, company_name=self.company_name, constants=self.constant_columns)
+        if missing.any():
+            with timer("geocode"):
+                self.geocode_batch(columns, missing.nonzero()[0].tolist(), queued)
+        
+        with timer("write"):
+            for sink in sinks:
+                sink.write_batch(columns)
+        increment("records", len(columns))
+    
+    def _save_batches(self, batches: Iterable[List[Dict[str, Any]]]) -> int:
+        """
+        Write batches to the run's output sinks as they arrive
+        
+        This is the output pipeline shared by run() and arun(). Errors from
+        the scraper or a sink are reported and abort the sinks, keeping
+        whatever was already written.
+        
+        Args:
+            batches: Batches of Location records or dictionaries
+            
+        Returns:
+            Number of locations saved
+        """
+        sinks = []
+        count = 0
         try:
             # Ensure data directory exists
             os.makedirs("data", exist_ok=True)
             
-            # Run the scraper
-            debug_print(f"Starting scraper for {self.company_name}")
-            data = self.scrape()
-            debug_print(f"Scraper returned {len(data)} locations")
+            # Write each batch as soon as it is complete
+            sinks = self.create_sinks()
+            for batch in batches:
+                self.write_batch(sinks, batch)
+                count += len(batch)
+                self.logger.debug("Wrote %s locations so far", count)
             
-            # Save the results
-            self.save_to_csv(data)
+            with timer("write"):
+                for sink in sinks:
+                    sink.close()
             print(f"Finished scraping {self.company_name}")
-            return data
+            return count
         except Exception as e:
-            debug_print(f"Error running scraper for {self.company_name}", error=e)
+            self.logger.debug("Error running scraper for %s", self.company_name, exc_info=e)
             print(f"Error: {str(e)}")
-            return []
\ No newline at end of file
+            for sink in sinks:
+                sink.abort()
+            return count
+    
+    def _start_run(self) -> RunMetrics:
+        """Reset the per-run state and return the run's metrics"""
+        print(f"Scraping {self.company_name} store locations...")
+        self.metrics = RunMetrics(self.company_name)
+        self.incomplete = self.used_fallback = False
+        self._geocode_jobs = {}
+        return self.metrics
+    
+    def run(self) -> int:
+        """
+        Run the scraper and save results as they arrive
+        
+        Returns:
+            Number of locations saved
+        """
+        with collect_metrics(self._start_run()):
+            try:
+                self.logger.debug("Starting scraper for %s", self.company_name)
+                return self._save_batches(self.iter_batches())
+            finally:
+                self.finish_metrics()
+    
+    def _save_in_thread(self, batches: Iterable[List[Dict[str, Any]]]) -> int:
+        """Run _save_batches() in a worker thread and release that thread's browser afterwards"""
+        from ..utils.browser import release_browser_pool
+        try:
+            return self._save_batches(batches)
+        finally:
+            release_browser_pool()
+    
+    async def _aiter_batches(self) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Batches of the locations from an overridden ascrape()"""
+        result = self.ascrape()
+        if not hasattr(result, "__aiter__"):
+            # A coroutine returning a list
+            records = iter(await result)
+            while True:
+                batch = list(islice(records, self.batch_size))
+                if not batch:
+                    return
+                yield batch
+        
+        batch = []
+        async for location in result:
+            batch.append(location)
+            if len(batch) >= self.batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+    
+    async def arun(self) -> int:
+        """
+        Run the scraper on the current event loop and save results as they arrive
+        
+        Blocking scrapers run through the same pipeline as run() in a worker
+        thread. Scrapers that override ascrape() run on the event loop and
+        hand their batches to the writer thread through a bounded queue, so
+        memory stays bounded either way.
+        
+        Returns:
+            Number of locations saved
+        """
+        with collect_metrics(self._start_run()):
+            try:
+                self.logger.debug("Starting async scraper for %s", self.company_name)
+                if type(self).ascrape is Scraper.ascrape:
+                    return await asyncio.to_thread(self._save_in_thread, self.iter_batches())
+                
+                loop = asyncio.get_running_loop()
+                batches: asyncio.Queue = asyncio.Queue(maxsize=ASYNC_QUEUE_BATCHES)
+                
+                async def produce() -> None:
+                    try:
+                        async for batch in self._aiter_batches():
+                            await batches.put(batch)
+                    except Exception as e:
+                        await batches.put(e)
+                    else:
+                        await batches.put(None)
+                
+                def consume() -> Iterator[List[Dict[str, Any]]]:
+                    while True:
+                        item = asyncio.run_coroutine_threadsafe(batches.get(), loop).result()
+                        if item is None:
+                            return
+                        if isinstance(item, Exception):
+                            raise item
+                        yield item
+                
+                producer = asyncio.create_task(produce())
+                try:
+                    return await asyncio.to_thread(self._save_in_thread, consume())
+                finally:
+                    # The writer stops early on errors; stop scraping as well.
+                    # If this run was cancelled instead, the writer thread is
+                    # still waiting for batches and is told to abort.
+                    producer.cancel()
+                    while not batches.empty():
+                        batches.get_nowait()
+                    batches.put_nowait(RuntimeError("Run was cancelled"))
+            finally:
+                self.finish_metrics()
+    
+    def finish_metrics(self) -> None:
+        """Write the metrics of the run that just ended and print a summary"""
+        self.metrics.finish()
+        try:
+            path = self.metrics.export()
+        except OSError as e:
+            self.logger.warning("Error writing metrics", exc_info=e)
+            return
+        print(f"Metrics for {self.company_name}: {self.metrics.summary()} -> {path}.json")
\ No newline at end of file
@@ -0,0 +1,113 @@
+"""
+Store directory crawler for Augips framework
+"""
+
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional
+from urllib.parse import urljoin
+
+from .base import Scraper
+from ..utils.concurrency import gather_limited
+from ..utils.records import Location
+
+# Links from a directory page to its state or city pages
+DIRECTORY_LINK_SELECTOR = ".c-directory-list-content-item-link"
+
+# Store entries on a city page
+STORE_SELECTOR = ".c-location-grid-item"
+
+
+def _text(element: Any, selector: str) -> str:
+    """Stripped text of a child element, or "" if it is missing"""
+    child = element.select_one(selector)
+    return child.text.strip() if child is not None else ""
+
+
+class DirectoryScraper(Scraper):
+    """
+    Crawls a Yext-style store directory: index, state pages, city pages
+    
+    Many chains, Pep Boys among them, publish their stores as a directory
+    whose index links to state pages, which link to city pages listing the
+    stores. Subclasses set index_url. scrape() fetches one page at a time;
+    ascrape() keeps up to concurrency pages in flight on the event loop.
+    Pages that can't be fetched mark the run incomplete.
+    """
+    
+    # Directory index page; set by subclasses
+    index_url: str = ""
+    
+    # Pages fetched at once by ascrape()
+    concurrency: int = 8
+    
+    # Headers sent with every directory request, or None for the client's own
+    request_headers: Optional[Dict[str, str]] = None
+    
+    def scrape(self) -> Iterator[Location]:
+        """
+        Crawl every city page of the directory
+        
+        Yields:
+            Location records as each city page is parsed
+        """
+        for state_url in self._links(self.index_url):
+            for city_url in self._links(state_url):
+                response = self.http.get(city_url, headers=self.request_headers)
+                if response.status_code != 200:
+                    self.mark_incomplete(f"failed to fetch {city_url}: {response.status_code}")
+                    continue
+                yield from self._stores(response.text)
+    
+    async def ascrape(self) -> AsyncIterator[Location]:
+        """
+        Crawl the directory with many pages in flight
+        
+        State pages are fetched together, then each state's city pages.
+        
+        Yields:
+            Location records as each state's city pages are parsed
+        """
+        state_lists = await gather_limited(
+            (self._alinks(url) for url in await self._alinks(self.index_url)), limit=self.concurrency
+        )
+        for city_urls in state_lists:
+            responses = await gather_limited(
+                (self.http.aget(url, headers=self.request_headers) for url in city_urls), limit=self.concurrency
+            )
+            for url, response in zip(city_urls, responses):
+                if response.status_code != 200:
+                    self.mark_incomplete(f"failed to fetch {url}: {response.status_code}")
+                    continue
+                for location in self._stores(response.text):
+                    yield location
+    
+    def _stores(self, markup: str) -> Iterator[Location]:
+        """Locations on a city page"""
+        page = self.parse_html(markup, only=[STORE_SELECTOR])
+        for store in page.select(STORE_SELECTOR):
+            yield Location(
+                store_name=_text(store, ".c-location-name"),
+                address=_text(store, ".c-address-street-1"),
+                city=_text(store, ".c-address-city"),
+                state=_text(store, ".c-address-state"),
+                zip_code=_text(store, ".c-address-postal-code"),
+                latitude=store.get("data-lat"),
+                longitude=store.get("data-lng"),
+            )
+    
+    def _links(self, url: str) -> List[str]:
+        """Absolute URLs of the directory links on a page"""
+        response = self.http.get(url, headers=self.request_headers)
+        return self._parse_links(url, response)
+    
+    async def _alinks(self, url: str) -> List[str]:
+        """Absolute URLs of the directory links on a page, fetched without blocking the event loop"""
+        response = await self.http.aget(url, headers=self.request_headers)
+        return self._parse_links(url, response)
+    
+    def _parse_links(self, url: str, response) -> List[str]:
+        """Absolute URLs of the directory links in a fetched page"""
+        if response.status_code != 200:
+            self.mark_incomplete(f"failed to fetch {url}: {response.status_code}")
+            return []
+        page = self.parse_html(response.text, only=[DIRECTORY_LINK_SELECTOR])
+        return [urljoin(url, link.get("href")) for link in page.select(DIRECTORY_LINK_SELECTOR)]
\ No newline at end of file
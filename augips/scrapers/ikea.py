@@ -3,19 +3,20 @@ IKEA store location scraper (international furniture retailer)
 """
 
 from typing import List, Dict, Any
-import requests
-from bs4 import BeautifulSoup
 
 from .base import Scraper
-from ..utils import debug_print, get_request_headers
+from ..utils import get_request_headers
+from ..utils.records import Location
 
 
 class IKEAScraper(Scraper):
     """Scraper for IKEA store locations (international furniture retailer)"""
     
-    def __init__(self):
-        super().__init__("IKEA")
+    def __init__(self, http_client=None):
+        super().__init__("IKEA", http_client=http_client)
         self.base_url = "https://www.ikea.com/us/en/stores/"
+        # Locations span several countries, so postal codes alone are ambiguous
+        self.country = None
         
     def scrape(self) -> List[Dict[str, Any]]:
         """
@@ -24,55 +25,53 @@ class IKEAScraper(Scraper):
         Returns:
             List of dictionaries containing store location data
         """
-        debug_print("Starting IKEA scraper")
+        self.logger.debug("Starting IKEA scraper")
         locations = []
         
         try:
             # Use requests and BeautifulSoup for a simpler approach
             headers = get_request_headers()
-            debug_print(f"Fetching {self.base_url} with anti-blocking headers")
-            response = requests.get(self.base_url, headers=headers, timeout=30)
+            self.logger.debug("Fetching %s with anti-blocking headers", self.base_url)
+            response = self.http.get(self.base_url, headers=headers, timeout=30)
             
             if response.status_code == 200:
-                debug_print("Successfully fetched page")
-                soup = BeautifulSoup(response.text, "html.parser")
+                self.logger.debug("Successfully fetched page")
+                soup = self.parse_html(response.text, only=[".country-list", ".store-list"])
                 
                 # Log the page title for debugging
-                title = soup.title.text if soup.title else "No title"
-                debug_print(f"Page title: {title}")
+                title = soup.title or "No title"
+                self.logger.debug("Page title: %s", title)
                 
                 # Try to find country links or store information
                 # This is a placeholder - in a real implementation you would
                 # inspect the page structure and extract the relevant data
                 country_elements = soup.select(".country-list a, .store-list a")
-                debug_print(f"Found {len(country_elements)} country/store elements")
+                self.logger.debug("Found %s country/store elements", len(country_elements))
                 
                 # Extract some sample data from the page if possible
                 extracted_locations = []
                 for i, element in enumerate(country_elements[:5]):  # Limit to 5 for demonstration
                     name = element.text.strip()
                     if name:
-                        extracted_locations.append({
-                            "store_name": f"IKEA {name}",
-                            "address": "Sample Address",  # Would extract from page
-                            "city": name,
-                            "state": "",
-                            "zip_code": "",
-                            "latitude": "",
-                            "longitude": "",
-                            "company_name": self.company_name
-                        })
+                        extracted_locations.append(Location(
+                            store_name=f"IKEA {name}",
+                            address="Sample Address",  # Would extract from page
+                            city=name,
+                            state="",
+                            zip_code="",
+                            latitude="",
+                            longitude="",
+                            company_name=self.company_name
+                        ))
                 
                 if extracted_locations:
-                    debug_print(f"Extracted {len(extracted_locations)} locations from page")
+                    self.logger.debug("Extracted %s locations from page", len(extracted_locations))
                     return extracted_locations
-                else:
-                    debug_print("No locations extracted from page, using fallback data")
+                reason = "no locations found on the page"
             else:
-                debug_print(f"Failed to fetch page: {response.status_code}")
+                reason = f"page returned {response.status_code}"
                 
             # Fallback data
-            debug_print("Using fallback sample data")
             sample_locations = [
                 {
                     "store_name": "IKEA Stockholm",
@@ -106,11 +105,10 @@ class IKEAScraper(Scraper):
                 }
             ]
             
-            debug_print(f"Returning {len(sample_locations)} fallback locations")
-            return sample_locations
+            return self.use_fallback(sample_locations, reason)
                 
         except Exception as e:
-            debug_print("Error scraping IKEA", error=e)
+            self.logger.warning("Error scraping IKEA", exc_info=e)
             
             # Return fallback data on error
             fallback_locations = [
@@ -125,5 +123,4 @@ class IKEAScraper(Scraper):
                     "company_name": self.company_name
                 }
             ]
-            debug_print(f"Returning {len(fallback_locations)} emergency fallback locations")
-            return fallback_locations
\ No newline at end of file
+            return self.use_fallback(fallback_locations, "error scraping IKEA")
\ No newline at end of file
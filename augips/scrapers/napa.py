@@ -3,18 +3,16 @@ NAPA Auto Parts store location scraper
 """
 
 from typing import List, Dict, Any
-import requests
-from bs4 import BeautifulSoup
 
 from .base import Scraper
-from ..utils import debug_print, get_request_headers
+from ..utils import get_request_headers
 
 
 class NAPAScraper(Scraper):
     """Scraper for NAPA Auto Parts store locations using static HTML approach"""
     
-    def __init__(self):
-        super().__init__("NAPA Auto Parts")
+    def __init__(self, http_client=None):
+        super().__init__("NAPA Auto Parts", http_client=http_client)
         self.base_url = "https://www.napaonline.com/en/auto-parts-stores"
         
     def scrape(self) -> List[Dict[str, Any]]:
@@ -24,22 +22,22 @@ class NAPAScraper(Scraper):
         Returns:
             List of dictionaries containing store location data
         """
-        debug_print("Starting NAPA Auto Parts scraper")
+        self.logger.debug("Starting NAPA Auto Parts scraper")
         locations = []
         
         try:
             # Use requests and BeautifulSoup for a simpler approach
             headers = get_request_headers()
-            debug_print(f"Fetching {self.base_url} with anti-blocking headers")
-            response = requests.get(self.base_url, headers=headers, timeout=30)
+            self.logger.debug("Fetching %s with anti-blocking headers", self.base_url)
+            response = self.http.get(self.base_url, headers=headers, timeout=30)
             
             if response.status_code == 200:
-                debug_print("Successfully fetched page")
-                soup = BeautifulSoup(response.text, "html.parser")
+                self.logger.debug("Successfully fetched page")
+                soup = self.parse_html(response.text, only=["title"])
                 
                 # Log the page title for debugging
-                title = soup.title.text if soup.title else "No title"
-                debug_print(f"Page title: {title}")
+                title = soup.title or "No title"
+                self.logger.debug("Page title: %s", title)
                 
                 # For demonstration, return sample data
                 # In a real implementation, you would parse the HTML
@@ -66,13 +64,9 @@ class NAPAScraper(Scraper):
                     }
                 ]
                 
-                debug_print(f"Returning {len(sample_locations)} sample locations")
-                return sample_locations
+                return self.use_fallback(sample_locations, "store pages are not parsed yet")
             else:
-                debug_print(f"Failed to fetch page: {response.status_code}")
-                # Use fallback data since the site is blocking scraping
-                debug_print("Using fallback sample data")
-                
+                self.logger.warning("Failed to fetch page: %s", response.status_code)
                 # Sample data for demonstration
                 sample_locations = [
                     {
@@ -97,10 +91,10 @@ class NAPAScraper(Scraper):
                     }
                 ]
                 
-                debug_print(f"Returning {len(sample_locations)} fallback locations")
-                return sample_locations
+                # Use fallback data since the site is blocking scraping
+                return self.use_fallback(sample_locations, f"page returned {response.status_code}")
                 
         except Exception as e:
-            debug_print("Error scraping NAPA Auto Parts", error=e)
+            self.mark_incomplete("error scraping NAPA Auto Parts", exc_info=e)
         
         return locations
\ No newline at end of file
@@ -2,85 +2,71 @@
 OpenStreetMap POI scraper (open data, less likely to block)
 """
 
-from typing import List, Dict, Any
-import requests
-import json
+import os
+from typing import Any, Dict, Iterator, Optional
 
 from .base import Scraper
-from ..utils import debug_print, get_request_headers
+from ..utils import get_request_headers
+from ..utils.overpass import DEFAULT_ENDPOINT, DEFAULT_RATE_LIMIT, OverpassEngine, parse_region, parse_tags
+from ..utils.records import Location
 
 
 class OpenStreetMapScraper(Scraper):
-    """Scraper for OpenStreetMap Points of Interest (open data)"""
+    """
+    Scraper for OpenStreetMap Points of Interest (open data)
     
-    def __init__(self):
-        super().__init__("OpenStreetMap POI")
-        # Overpass API endpoint
-        self.api_url = "https://overpass-api.de/api/interpreter"
-        
-    def scrape(self) -> List[Dict[str, Any]]:
+    The region and tag filter default to fuel stations in Berlin and can be
+    set with AUGIPS_OSM_REGION (a name from augips.utils.overpass.REGIONS or
+    "south,west,north,east") and AUGIPS_OSM_TAGS (e.g. "shop=car_parts").
+    Large regions are queried as concurrent tiles, see OverpassEngine.
+    """
+    
+    def __init__(self, http_client=None, region: Optional[str] = None, tags: Optional[str] = None):
+        """
+        Args:
+            http_client: HTTP client, defaults to the shared one
+            region: Region name or bounding box, defaults to AUGIPS_OSM_REGION or Berlin
+            tags: Tag filter, defaults to AUGIPS_OSM_TAGS or amenity=fuel
+        """
+        super().__init__("OpenStreetMap POI", http_client=http_client)
+        # Overpass API endpoints, comma-separated in AUGIPS_OVERPASS_ENDPOINTS
+        self.endpoints = [
+            url.strip() for url in os.getenv("AUGIPS_OVERPASS_ENDPOINTS", DEFAULT_ENDPOINT).split(",") if url.strip()
+        ]
+        # Queries per second per endpoint, 0 for no limit; public instances ask
+        # for about one
+        self.rate_limit = float(os.getenv("AUGIPS_OVERPASS_RATE_LIMIT", DEFAULT_RATE_LIMIT))
+        self.region = region or os.getenv("AUGIPS_OSM_REGION", "berlin")
+        self.tags = parse_tags(tags or os.getenv("AUGIPS_OSM_TAGS", "amenity=fuel"))
+        # Postal codes belong to the region's country, if it has just one
+        self.bbox, self.country = parse_region(self.region)
+        self.default_city = "Berlin" if self.region.lower() == "berlin" else ""
+        self.default_name = "Gas Station" if self.tags.get("amenity") == "fuel" else "Place"
+    
+    def scrape(self) -> Iterator[Dict[str, Any]]:
         """
-        Scrape gas stations from OpenStreetMap using Overpass API
+        Scrape POIs from OpenStreetMap using the Overpass API
         
-        Returns:
-            List of dictionaries containing location data
+        Yields:
+            Location records as each tile of the region comes back
         """
-        debug_print("Starting OpenStreetMap POI scraper")
-        locations = []
+        self.logger.debug("Starting OpenStreetMap POI scraper for %s", self.region)
+        engine = OverpassEngine(self.http, endpoints=self.endpoints, rate_limit=self.rate_limit,
+                                headers=get_request_headers())
+        count = 0
         
-        try:
-            # Query for gas stations in a specific area (Berlin, Germany)
-            # This is a small query that should work reliably
-            query = """
-            [out:json];
-            area["name"="Berlin"]["admin_level"="4"];
-            node["amenity"="fuel"](area);
-            out body;
-            """
-            
-            debug_print("Sending query to Overpass API")
-            headers = get_request_headers()
-            response = requests.post(
-                self.api_url,
-                data={"data": query},
-                headers=headers,
-                timeout=60
-            )
-            
-            if response.status_code == 200:
-                debug_print("Successfully received response")
-                data = response.json()
-                
-                # Process the results
-                elements = data.get("elements", [])
-                debug_print(f"Found {len(elements)} POIs")
-                
-                for element in elements:
-                    tags = element.get("tags", {})
-                    name = tags.get("name", f"Gas Station {element.get('id')}")
-                    
-                    location = {
-                        "store_name": name,
-                        "address": tags.get("addr:street", "") + " " + tags.get("addr:housenumber", ""),
-                        "city": tags.get("addr:city", "Berlin"),
-                        "state": "",
-                        "zip_code": tags.get("addr:postcode", ""),
-                        "latitude": element.get("lat", ""),
-                        "longitude": element.get("lon", ""),
-                        "company_name": tags.get("brand", self.company_name)
-                    }
-                    locations.append(location)
-                
-                debug_print(f"Processed {len(locations)} locations")
-                return locations
-            else:
-                debug_print(f"Failed to fetch data: {response.status_code}")
-                
-        except Exception as e:
-            debug_print("Error scraping OpenStreetMap", error=e)
+        for element in engine.fetch(self.tags, self.bbox):
+            yield self._to_location(element)
+            count += 1
         
-        # Fallback data if the API request fails
-        debug_print("Using fallback sample data")
+        self.logger.debug("Processed %s locations", count)
+        if not engine.failed_tiles:
+            return
+        if count:
+            self.mark_incomplete(f"{len(engine.failed_tiles)} tiles of {self.region} could not be queried")
+            return
+        
+        # Fallback data if every query failed
         sample_locations = [
             {
                 "store_name": "Aral Gas Station",
@@ -114,5 +100,20 @@ class OpenStreetMapScraper(Scraper):
             }
         ]
         
-        debug_print(f"Returning {len(sample_locations)} fallback locations")
-        return sample_locations
\ No newline at end of file
+        yield from self.use_fallback(sample_locations, f"no tile of {self.region} could be queried")
+    
+    def _to_location(self, element: Dict[str, Any]) -> Location:
+        """Convert an Overpass element to a location"""
+        tags = element.get("tags", {})
+        # Ways and relations carry their center point instead of lat/lon
+        point = element.get("center") or element
+        return Location(
+            store_name=tags.get("name", f"{self.default_name} {element.get('id')}"),
+            address=tags.get("addr:street", "") + " " + tags.get("addr:housenumber", ""),
+            city=tags.get("addr:city", self.default_city),
+            state="",
+            zip_code=tags.get("addr:postcode", ""),
+            latitude=point.get("lat", ""),
+            longitude=point.get("lon", ""),
+            company_name=tags.get("brand", self.company_name)
+        )
\ No newline at end of file
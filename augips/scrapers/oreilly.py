@@ -2,39 +2,30 @@
 O'Reilly Auto Parts store location scraper
 """
 
+import logging
 import time
-import sys
-import traceback
 from typing import List, Dict, Any, Optional
 
-# Import optional dependencies with fallbacks
-try:
-    from playwright.sync_api import sync_playwright
-except ImportError:
-    print("WARNING: Playwright not installed. Install with: pip install playwright")
-    print("Then run: playwright install")
-    sync_playwright = None
-
-try:
-    from bs4 import BeautifulSoup
-    import requests
-except ImportError:
-    print("WARNING: BeautifulSoup or requests not installed. Install with: pip install beautifulsoup4 requests")
-    BeautifulSoup = None
-    requests = None
-
 from .base import Scraper
-from ..utils import debug_print
+from ..utils.browser import get_browser_pool, playwright_available, wait_for_first_selector
+from ..utils.capture import NetworkCapture
+from ..utils.metrics import timer
 
 
 class OReillyAutoPartsScraper(Scraper):
     """Scraper for O'Reilly Auto Parts store locations"""
     
-    def __init__(self):
-        super().__init__("O'Reilly Auto Parts")
+    def __init__(self, http_client=None):
+        super().__init__("O'Reilly Auto Parts", http_client=http_client)
         self.base_url = "https://www.oreillyauto.com/"
         self.store_locator_url = "https://www.oreillyauto.com/stores"
         
+        # Store search API responses to capture instead of scraping the DOM;
+        # only the search endpoint on O'Reilly's own host, not page HTML or
+        # third-party geolocation calls
+        self.capture_network = True
+        self.api_patterns = [r"^https://www\.oreillyauto\.com/stores/api/(?:v\d+/)?(?:search|nearby)\b"]
+        
         # Check robots.txt to ensure we're allowed to scrape
         self._check_robots_txt()
     
@@ -48,49 +39,40 @@ class OReillyAutoPartsScraper(Scraper):
         # Try both methods and use the one that works
         locations = []
         
-        debug_print("Starting O'Reilly scraper")
+        self.logger.debug("Starting O'Reilly scraper")
         
         try:
-            debug_print("Attempting to scrape with Playwright")
+            self.logger.debug("Attempting to scrape with Playwright")
             locations = self._scrape_with_playwright()
-            debug_print(f"Playwright method returned {len(locations)} locations")
+            self.logger.debug("Playwright method returned %s locations", len(locations))
         except Exception as e:
-            debug_print("Playwright scraping failed, trying static HTML", error=e)
+            self.logger.warning("Playwright scraping failed, trying static HTML", exc_info=e)
             locations = self._scrape_static_html()
-            debug_print(f"Static HTML method returned {len(locations)} locations")
+            self.logger.debug("Static HTML method returned %s locations", len(locations))
         
-        debug_print(f"Total locations before processing: {len(locations)}")
-        
-        # Add company name to all locations
-        for location in locations:
-            location["company_name"] = self.company_name
-            
-            # Geocode addresses that don't have coordinates
-            if "latitude" not in location or "longitude" not in location:
-                address = f"{location.get('address', '')}, {location.get('city', '')}, {location.get('state', '')} {location.get('zip_code', '')}"
-                lat, lng = self.geocode_address(address)
-                location["latitude"] = lat
-                location["longitude"] = lng
+        self.logger.debug("Total locations before processing: %s", len(locations))
         
-        debug_print(f"Final location count: {len(locations)}")
+        # Company names and missing coordinates are filled in for the whole
+        # batch by Scraper.write_batch()
+        self.logger.debug("Final location count: %s", len(locations))
         return locations
     
     def _scrape_static_html(self) -> List[Dict[str, Any]]:
         """Scrape store locations from static HTML"""
-        debug_print("Starting static HTML scraping")
+        self.logger.debug("Starting static HTML scraping")
         locations = []
         
         try:
-            response = requests.get(self.store_locator_url)
-            debug_print(f"Response status: {response.status_code}")
+            response = self.http.get(self.store_locator_url)
+            self.logger.debug("Response status: %s", response.status_code)
             
             if response.status_code == 200:
-                soup = BeautifulSoup(response.text, "html.parser")
-                debug_print(f"Page title: {soup.title.text if soup.title else 'No title'}")
+                soup = self.parse_html(response.text, only=[".store-location", ".store-list-item", ".store-info"])
+                self.logger.debug("Page title: %s", soup.title or 'No title')
                 
                 # Log some page structure for debugging
                 store_elements = soup.select(".store-location, .store-list-item, .store-info")
-                debug_print(f"Found {len(store_elements)} potential store elements")
+                self.logger.debug("Found %s potential store elements", len(store_elements))
                 
                 # For demonstration, return sample data
                 sample_locations = [
@@ -104,97 +86,94 @@ class OReillyAutoPartsScraper(Scraper):
                         "longitude": "-93.2923"
                     }
                 ]
-                debug_print(f"Returning {len(sample_locations)} sample locations from static HTML method")
-                return sample_locations
+                return self.use_fallback(sample_locations, "store pages are not parsed yet")
                 
         except Exception as e:
-            debug_print("Error in static HTML scraping", error=e)
+            self.mark_incomplete("error in static HTML scraping", exc_info=e)
         
         return locations
     
     def _scrape_with_playwright(self) -> List[Dict[str, Any]]:
         """Scrape store locations using Playwright for dynamic content"""
-        debug_print("Starting Playwright scraping")
+        self.logger.debug("Starting Playwright scraping")
         locations = []
+        # Screenshots and page inspection are only done in debug mode
+        debug = self.logger.isEnabledFor(logging.DEBUG)
         
         # Check if Playwright is available
-        if sync_playwright is None:
-            debug_print("Playwright not available, skipping this method")
+        if not playwright_available():
+            self.logger.debug("Playwright not available, skipping this method")
             return []
         
         try:
-            with sync_playwright() as p:
-                browser = p.chromium.launch(headless=True)
-                page = browser.new_page()
-                # Set timeout after page creation
-                page.set_default_timeout(60000)  # Increase timeout to 60 seconds
+            # Pages come from the shared pool with a 60 second default timeout
+            with get_browser_pool().page() as page:
+                # Block images, fonts and analytics, and record API responses
+                capture = NetworkCapture(page, self.api_patterns) if self.capture_network else None
                 
                 try:
-                    debug_print(f"Navigating to {self.store_locator_url}")
-                    page.goto(self.store_locator_url, wait_until="networkidle")
+                    self.logger.debug("Navigating to %s", self.store_locator_url)
+                    with timer("browser_wait"):
+                        page.goto(self.store_locator_url, wait_until="networkidle")
                     
                     # Take a screenshot for debugging
-                    page.screenshot(path="debug_oreilly.png")
-                    debug_print(f"Page title: {page.title()}")
+                    if debug:
+                        page.screenshot(path="debug/oreilly_locator.png")
+                        self.logger.debug("Page title: %s", page.title())
                     
                     # Example: Enter a zip code to search for stores
                     # Find the actual selectors by inspecting the page
                     search_input = page.query_selector("input[type='text'][placeholder*='ZIP']")
                     if search_input:
-                        debug_print("Found ZIP input field")
+                        self.logger.debug("Found ZIP input field")
                         search_input.fill("65801")  # Springfield, MO
                         
                         search_button = page.query_selector("button[type='submit']")
                         if search_button:
-                            debug_print("Found search button")
+                            self.logger.debug("Found search button")
                             search_button.click()
                             
                             # Take a screenshot before waiting for selectors
-                            page.screenshot(path="debug/oreilly_before_wait.png")
+                            if debug:
+                                page.screenshot(path="debug/oreilly_before_wait.png")
                             
-                            debug_print("Waiting for store results to load...")
+                            self.logger.debug("Waiting for store results to load...")
                             try:
-                                # Try multiple possible selectors with shorter timeouts
+                                # Watch all possible selectors at once
                                 selectors = [".store-list-item", ".store-location", ".store-info", ".store-details", ".location-list"]
-                                found = False
+                                matched = wait_for_first_selector(page, selectors, timeout=15000)
                                 
-                                for selector in selectors:
-                                    debug_print(f"Trying selector: {selector}")
-                                    try:
-                                        page.wait_for_selector(selector, timeout=15000)
-                                        debug_print(f"Found selector: {selector}")
-                                        found = True
-                                        break
-                                    except Exception as e:
-                                        debug_print(f"Selector {selector} not found")
-                                
-                                if not found:
-                                    debug_print("No store selectors found, using fallback data")
+                                if not matched:
+                                    self.logger.debug("No store selectors found, using fallback data")
                                     # Take a screenshot to see what's on the page
-                                    page.screenshot(path="debug/oreilly_no_selectors.png")
+                                    if debug:
+                                        page.screenshot(path="debug/oreilly_no_selectors.png")
                                     # Continue with sample data
                                 else:
-                                    debug_print("Store results loaded")  
+                                    self.logger.debug("Store results loaded (matched %s)", matched)
                             except Exception as e:
-                                debug_print("Error waiting for selectors", error=e)
+                                self.logger.warning("Error waiting for selectors", exc_info=e)
+                            
+                            # Prefer structured JSON from the store locator API
+                            if capture is not None:
+                                locations = capture.store_records()
+                                for location in locations:
+                                    self.enqueue_geocode(location)
                             
                             # Extract store data
                             store_elements = page.query_selector_all(".store-list-item, .store-location")
-                            debug_print(f"Found {len(store_elements)} store elements")
-                            
-                            # Log the HTML structure of the first store element for debugging
-                            if len(store_elements) > 0:
-                                debug_print("First store element HTML:", store_elements[0].inner_html())
+                            self.logger.debug("Found %s store elements", len(store_elements))
                     else:
-                        debug_print("Could not find ZIP input field")
+                        self.logger.debug("Could not find ZIP input field")
                         
                 except Exception as e:
-                    debug_print("Error during page navigation or data extraction", error=e)
-                
-                finally:
-                    browser.close()
+                    self.logger.warning("Error during page navigation or data extraction", exc_info=e)
         except Exception as e:
-            debug_print("Error initializing Playwright", error=e)
+            self.logger.warning("Error initializing Playwright", exc_info=e)
+        
+        if locations:
+            self.logger.debug("Returning %s locations from captured API responses", len(locations))
+            return locations
         
         # For demonstration, return sample data
         sample_locations = [
@@ -209,23 +188,22 @@ class OReillyAutoPartsScraper(Scraper):
             }
         ]
         
-        debug_print(f"Returning {len(sample_locations)} sample locations from Playwright method")
-        return sample_locations
+        return self.use_fallback(sample_locations, "no stores found on the store locator")
     
     def _check_robots_txt(self) -> None:
         """Check robots.txt to ensure we're allowed to scrape"""
         try:
             robots_url = "https://www.oreillyauto.com/robots.txt"
-            response = requests.get(robots_url)
+            response = self.http.get(robots_url)
             
             if response.status_code == 200:
                 robots_content = response.text
-                debug_print("Robots.txt content:", robots_content)
+                self.logger.debug("Fetched robots.txt (%d bytes)", len(response.content))
                 
                 # Check if our paths are disallowed
                 if "Disallow: /stores" in robots_content:
-                    debug_print("WARNING: Scraping this site may violate robots.txt!")
+                    self.logger.warning("Scraping this site may violate robots.txt!")
             else:
-                debug_print(f"Failed to fetch robots.txt: {response.status_code}")
+                self.logger.warning("Failed to fetch robots.txt: %s", response.status_code)
         except Exception as e:
-            debug_print("Error checking robots.txt", error=e)
\ No newline at end of file
+            self.logger.warning("Error checking robots.txt", exc_info=e)
\ No newline at end of file
@@ -2,122 +2,85 @@
 Pep Boys store location scraper
 """
 
-from typing import List, Dict, Any
-import requests
-from bs4 import BeautifulSoup
+from typing import AsyncIterator, Dict, Any, Iterator, List
 
-from .base import Scraper
-from ..utils import debug_print, get_request_headers
+from .directory import DirectoryScraper
+from ..utils import get_request_headers
 
 
-class PepBoysScraper(Scraper):
-    """Scraper for Pep Boys store locations using static HTML approach"""
+class PepBoysScraper(DirectoryScraper):
+    """Scraper for Pep Boys store locations, crawled from the store directory"""
     
-    def __init__(self):
-        super().__init__("Pep Boys")
+    # City pages fetched at once when run with the async runner
+    concurrency = 8
+    
+    def __init__(self, http_client=None):
+        super().__init__("Pep Boys", http_client=http_client)
         self.base_url = "https://stores.pepboys.com/"
-        self.state_url = "https://stores.pepboys.com/index.html"
-        
-    def scrape(self) -> List[Dict[str, Any]]:
+        self.index_url = "https://stores.pepboys.com/index.html"
+        # Browser-like headers, so the directory isn't served a block page
+        self.request_headers = get_request_headers()
+    
+    def scrape(self) -> Iterator[Dict[str, Any]]:
         """
-        Scrape Pep Boys store locations using static HTML approach
+        Scrape Pep Boys store locations one directory page at a time
         
-        Returns:
-            List of dictionaries containing store location data
+        Yields:
+            Location records as each city page is parsed, or sample data if
+            the directory can't be read
         """
-        debug_print("Starting Pep Boys scraper")
-        locations = []
-        
+        self.logger.debug("Starting Pep Boys scraper")
+        count = 0
         try:
-            # Use requests and BeautifulSoup for a simpler approach
-            headers = get_request_headers()
-            debug_print(f"Fetching {self.state_url} with anti-blocking headers")
-            response = requests.get(self.state_url, headers=headers, timeout=30)
-            
-            if response.status_code == 200:
-                debug_print("Successfully fetched page")
-                soup = BeautifulSoup(response.text, "html.parser")
-                
-                # Log the page title for debugging
-                title = soup.title.text if soup.title else "No title"
-                debug_print(f"Page title: {title}")
-                
-                # Try to find state links
-                state_links = soup.select("a.c-directory-list-content-item-link")
-                debug_print(f"Found {len(state_links)} state links")
-                
-                # Process a limited number of states for demonstration
-                for i, state_link in enumerate(state_links[:2]):
-                    if i >= 2:  # Limit to 2 states for demonstration
-                        break
-                        
-                    state_name = state_link.text.strip()
-                    state_url = state_link.get("href")
-                    if not state_url.startswith("http"):
-                        state_url = f"https://stores.pepboys.com/{state_url}"
-                        
-                    debug_print(f"Processing state: {state_name}, URL: {state_url}")
-                    
-                    # For demonstration, add sample stores for this state
-                    state_code = state_name[:2].upper()
-                    locations.extend([
-                        {
-                            "store_name": f"Pep Boys {state_code}01",
-                            "address": f"123 Main St",
-                            "city": f"{state_name} City",
-                            "state": state_code,
-                            "zip_code": f"{10000 + i*1000}",
-                            "latitude": f"{35.0 + i}",
-                            "longitude": f"{-80.0 - i}",
-                            "company_name": self.company_name
-                        },
-                        {
-                            "store_name": f"Pep Boys {state_code}02",
-                            "address": f"456 Oak Ave",
-                            "city": f"{state_name} City",
-                            "state": state_code,
-                            "zip_code": f"{10001 + i*1000}",
-                            "latitude": f"{35.1 + i}",
-                            "longitude": f"{-80.1 - i}",
-                            "company_name": self.company_name
-                        }
-                    ])
-                
-                debug_print(f"Returning {len(locations)} locations")
-                return locations
-            else:
-                debug_print(f"Failed to fetch page: {response.status_code}")
-                # Use fallback data since the site is blocking scraping
-                debug_print("Using fallback sample data")
-                
-                # Sample data for demonstration
-                sample_locations = [
-                    {
-                        "store_name": "Pep Boys - Philadelphia",
-                        "address": "7400 Bustleton Ave",
-                        "city": "Philadelphia",
-                        "state": "PA",
-                        "zip_code": "19152",
-                        "latitude": "40.0583",
-                        "longitude": "-75.0467",
-                        "company_name": self.company_name
-                    },
-                    {
-                        "store_name": "Pep Boys - Los Angeles",
-                        "address": "5500 W Pico Blvd",
-                        "city": "Los Angeles",
-                        "state": "CA",
-                        "zip_code": "90019",
-                        "latitude": "34.0480",
-                        "longitude": "-118.3694",
-                        "company_name": self.company_name
-                    }
-                ]
-                
-                debug_print(f"Returning {len(sample_locations)} fallback locations")
-                return sample_locations
-                
+            for location in super().scrape():
+                count += 1
+                yield location
         except Exception as e:
-            debug_print("Error scraping Pep Boys", error=e)
+            self.mark_incomplete("error crawling the Pep Boys directory", exc_info=e)
+        if not count:
+            yield from self.use_fallback(self._sample_locations(), "no stores found in the directory")
+    
+    async def ascrape(self) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Scrape Pep Boys store locations with concurrency pages in flight
         
-        return locations
\ No newline at end of file
+        Yields:
+            Location records as each state's city pages are parsed, or
+            sample data if the directory can't be read
+        """
+        self.logger.debug("Starting async Pep Boys scraper")
+        count = 0
+        try:
+            async for location in super().ascrape():
+                count += 1
+                yield location
+        except Exception as e:
+            self.mark_incomplete("error crawling the Pep Boys directory", exc_info=e)
+        if not count:
+            for location in self.use_fallback(self._sample_locations(), "no stores found in the directory"):
+                yield location
+    
+    def _sample_locations(self) -> List[Dict[str, Any]]:
+        """Sample data for demonstration when the directory is blocked"""
+        return [
+            {
+                "store_name": "Pep Boys - Philadelphia",
+                "address": "7400 Bustleton Ave",
+                "city": "Philadelphia",
+                "state": "PA",
+                "zip_code": "19152",
+                "latitude": "40.0583",
+                "longitude": "-75.0467",
+                "company_name": self.company_name
+            },
+            {
+                "store_name": "Pep Boys - Los Angeles",
+                "address": "5500 W Pico Blvd",
+                "city": "Los Angeles",
+                "state": "CA",
+                "zip_code": "90019",
+                "latitude": "34.0480",
+                "longitude": "-118.3694",
+                "company_name": self.company_name
+            }
+        ]
\ No newline at end of file
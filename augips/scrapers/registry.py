@@ -0,0 +1,141 @@
+"""
+Lazy scraper registry for Augips framework
+"""
+
+import importlib
+from typing import Dict, Iterator, Optional, Union
+
+# Entry point group third-party packages use to register scrapers
+ENTRY_POINT_GROUP = "augips.scrapers"
+
+
+class ScraperRegistry:
+    """
+    Mapping of scraper names to scraper classes, imported on first use
+    
+    Scrapers are registered by import path ("package.module:ClassName"), so
+    listing names or running a single scraper only imports the modules it
+    needs. Packages can add scrapers through the "augips.scrapers" entry
+    point group, for example in pyproject.toml:
+        
+        [project.entry-points."augips.scrapers"]
+        mystore = "mypackage.scrapers:MyStoreScraper"
+    """
+    
+    def __init__(self, targets: Dict[str, str]):
+        """
+        Args:
+            targets: Mapping of scraper name to "module:ClassName" import path
+        """
+        self._targets = dict(targets)
+        self._classes = {}
+        self._entry_points_loaded = False
+    
+    def _load_entry_points(self) -> None:
+        """Add scrapers registered by installed packages, without importing them"""
+        if self._entry_points_loaded:
+            return
+        self._entry_points_loaded = True
+        try:
+            # Imported here because importlib.metadata is slow to load
+            from importlib.metadata import entry_points
+        except ImportError:
+            return
+        try:
+            try:
+                group = entry_points(group=ENTRY_POINT_GROUP)
+            except TypeError:
+                # Python 3.9 returns a dict of groups
+                group = entry_points().get(ENTRY_POINT_GROUP, [])
+            for entry_point in group:
+                # Built-in scrapers take precedence over plugins
+                self._targets.setdefault(entry_point.name.lower(), entry_point.value)
+        except Exception as e:
+            print(f"WARNING: Could not load scraper entry points: {str(e)}")
+    
+    def register(self, name: str, target: Union[str, type]) -> None:
+        """
+        Register a scraper
+        
+        Args:
+            name: Scraper name used on the command line
+            target: Scraper class, or "module:ClassName" import path
+        """
+        name = name.lower()
+        if isinstance(target, str):
+            self._targets[name] = target
+            self._classes.pop(name, None)
+        else:
+            self._targets[name] = f"{target.__module__}:{target.__qualname__}"
+            self._classes[name] = target
+    
+    def __getitem__(self, name: str) -> type:
+        """Import and return the scraper class registered under name"""
+        scraper_class = self._classes.get(name)
+        if scraper_class is not None:
+            return scraper_class
+        
+        self._load_entry_points()
+        target = self._targets[name]
+        module_name, _, attr = target.partition(":")
+        scraper_class = importlib.import_module(module_name)
+        for part in attr.split("."):
+            scraper_class = getattr(scraper_class, part)
+        self._classes[name] = scraper_class
+        return scraper_class
+    
+    def name_of(self, scraper_class: type) -> Optional[str]:
+        """
+        Find the name a scraper class is registered under, without importing anything
+        
+        Args:
+            scraper_class: Scraper class
+            
+        Returns:
+            Registered name, or None if the class isn't registered
+        """
+        target = f"{scraper_class.__module__}:{scraper_class.__qualname__}"
+        for load_plugins in (False, True):
+            if load_plugins:
+                self._load_entry_points()
+            for name, registered in self._targets.items():
+                if registered == target or self._classes.get(name) is scraper_class:
+                    return name
+        return None
+    
+    def __contains__(self, name: object) -> bool:
+        self._load_entry_points()
+        return name in self._targets
+    
+    def __iter__(self) -> Iterator[str]:
+        self._load_entry_points()
+        return iter(list(self._targets))
+    
+    def __len__(self) -> int:
+        self._load_entry_points()
+        return len(self._targets)
+    
+    def keys(self):
+        """Registered scraper names"""
+        self._load_entry_points()
+        return self._targets.keys()
+    
+    def items(self) -> Iterator:
+        """Yield (name, scraper class) pairs, importing each scraper as it is reached"""
+        for name in self:
+            yield name, self[name]
+    
+    def get(self, name: str, default=None):
+        """Return the scraper class for name, or default if it isn't registered"""
+        return self[name] if name in self else default
+    
+    def clear(self) -> None:
+        """Remove all registered scrapers"""
+        self._targets.clear()
+        self._classes.clear()
+        self._entry_points_loaded = True
+    
+    def update(self, scrapers: Dict[str, Union[str, type]]) -> None:
+        """Register several scrapers at once"""
+        for name, target in scrapers.items():
+            self.register(name, target)
\ No newline at end of file
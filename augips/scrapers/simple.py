@@ -5,15 +5,14 @@ Simple test scraper that always works
 from typing import List, Dict, Any
 
 from .base import Scraper
-from ..utils import debug_print
 
 
 class SimpleScraper(Scraper):
     """A simple test scraper that always works"""
     
-    def __init__(self):
-        super().__init__("Simple Test")
-        debug_print("Simple scraper initialized")
+    def __init__(self, http_client=None):
+        super().__init__("Simple Test", http_client=http_client)
+        self.logger.debug("Simple scraper initialized")
     
     def scrape(self) -> List[Dict[str, Any]]:
         """
@@ -22,7 +21,7 @@ class SimpleScraper(Scraper):
         Returns:
             List of dictionaries containing sample store location data
         """
-        debug_print("Simple scraper running")
+        self.logger.debug("Simple scraper running")
         
         # Create sample data
         locations = [
@@ -48,5 +47,5 @@ class SimpleScraper(Scraper):
             }
         ]
         
-        debug_print(f"Simple scraper returning {len(locations)} locations")
+        self.logger.debug("Simple scraper returning %s locations", len(locations))
         return locations
\ No newline at end of file
@@ -3,18 +3,17 @@ Wikipedia scraper for extracting location data from lists of places
 """
 
 from typing import List, Dict, Any
-import requests
-from bs4 import BeautifulSoup
 
 from .base import Scraper
-from ..utils import debug_print, get_request_headers
+from ..utils import get_request_headers
+from ..utils.records import Location
 
 
 class WikipediaScraper(Scraper):
     """Scraper for Wikipedia lists of places (very unlikely to be blocked)"""
     
-    def __init__(self):
-        super().__init__("Wikipedia Places")
+    def __init__(self, http_client=None):
+        super().__init__("Wikipedia Places", http_client=http_client)
         self.base_url = "https://en.wikipedia.org/wiki/List_of_national_parks_of_the_United_States"
         
     def scrape(self) -> List[Dict[str, Any]]:
@@ -24,32 +23,32 @@ class WikipediaScraper(Scraper):
         Returns:
             List of dictionaries containing location data
         """
-        debug_print("Starting Wikipedia scraper")
+        self.logger.debug("Starting Wikipedia scraper")
         locations = []
         
         try:
             # Use requests and BeautifulSoup for a simpler approach
             headers = get_request_headers()
-            debug_print(f"Fetching {self.base_url} with anti-blocking headers")
-            response = requests.get(self.base_url, headers=headers, timeout=30)
+            self.logger.debug("Fetching %s with anti-blocking headers", self.base_url)
+            response = self.http.get(self.base_url, headers=headers, timeout=30)
             
             if response.status_code == 200:
-                debug_print("Successfully fetched page")
-                soup = BeautifulSoup(response.text, "html.parser")
+                self.logger.debug("Successfully fetched page")
+                soup = self.parse_html(response.text, only=["table"])
                 
                 # Log the page title for debugging
-                title = soup.title.text if soup.title else "No title"
-                debug_print(f"Page title: {title}")
+                title = soup.title or "No title"
+                self.logger.debug("Page title: %s", title)
                 
                 # Find the main table with national parks
                 tables = soup.select(".wikitable")
                 if tables:
-                    debug_print(f"Found {len(tables)} tables")
+                    self.logger.debug("Found %s tables", len(tables))
                     main_table = tables[0]  # First table is usually the main one
                     
                     # Extract rows from the table
                     rows = main_table.select("tr")
-                    debug_print(f"Found {len(rows)} rows in the table")
+                    self.logger.debug("Found %s rows in the table", len(rows))
                     
                     # Skip header row
                     for row in rows[1:]:
@@ -78,33 +77,34 @@ class WikipediaScraper(Scraper):
                                     except:
                                         pass
                                 
-                                location = {
-                                    "store_name": park_name,
-                                    "address": "",  # National parks don't have street addresses
-                                    "city": city,
-                                    "state": state,
-                                    "zip_code": "",
-                                    "latitude": lat,
-                                    "longitude": lng,
-                                    "company_name": "National Park Service"
-                                }
+                                location = Location(
+                                    store_name=park_name,
+                                    address="",  # National parks don't have street addresses
+                                    city=city,
+                                    state=state,
+                                    zip_code="",
+                                    latitude=lat,
+                                    longitude=lng,
+                                    company_name="National Park Service"
+                                )
                                 locations.append(location)
                             except Exception as e:
-                                debug_print(f"Error parsing row: {str(e)}")
+                                self.logger.debug("Error parsing row: %s", e)
                                 continue
                 
-                debug_print(f"Extracted {len(locations)} locations from Wikipedia")
+                self.logger.debug("Extracted %s locations from Wikipedia", len(locations))
                 
                 if locations:
                     return locations
+                reason = "no parks found on the page"
             else:
-                debug_print(f"Failed to fetch page: {response.status_code}")
+                reason = f"page returned {response.status_code}"
                 
         except Exception as e:
-            debug_print("Error scraping Wikipedia", error=e)
+            self.logger.warning("Error scraping Wikipedia", exc_info=e)
+            reason = "error scraping Wikipedia"
         
         # Fallback data if the scraping fails
-        debug_print("Using fallback sample data")
         sample_locations = [
             {
                 "store_name": "Yellowstone National Park",
@@ -138,5 +138,4 @@ class WikipediaScraper(Scraper):
             }
         ]
         
-        debug_print(f"Returning {len(sample_locations)} fallback locations")
-        return sample_locations
\ No newline at end of file
+        return self.use_fallback(sample_locations, reason)
\ No newline at end of file
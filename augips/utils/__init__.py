@@ -2,6 +2,30 @@
 Utility functions for Augips framework
 """
 
-from .geocoding import geocode_address
+import importlib
+
 from .debug import debug_print
-from .proxy import get_random_user_agent, get_request_headers
\ No newline at end of file
+from .log import configure_logging, get_logger
+from .proxy import get_random_user_agent, get_request_headers
+
+# Utilities with heavy dependencies, loaded on first access
+_LAZY_EXPORTS = {
+    "geocode_address": ".geocoding",
+    "HttpClient": ".http",
+    "get_http_client": ".http",
+    "set_http_client": ".http",
+    "stream_json": ".http",
+    "HttpCache": ".httpcache",
+    "CacheMissError": ".httpcache",
+    "gather_limited": ".concurrency",
+    "deduplicate_locations": ".dedupe",
+    "RunMetrics": ".metrics",
+    "profile_run": ".profiling",
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_EXPORTS:
+        module = importlib.import_module(_LAZY_EXPORTS[name], __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
\ No newline at end of file
@@ -0,0 +1,305 @@
+"""
+Playwright browser pool for Augips framework
+"""
+
+import atexit
+import os
+import queue
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Iterator, List, Optional
+
+from .log import get_logger
+from .metrics import timer
+
+logger = get_logger(__name__)
+
+# Default number of pages a browser serves before it is relaunched
+DEFAULT_MAX_PAGES_PER_BROWSER = 50
+
+# Default Playwright timeout in milliseconds
+DEFAULT_TIMEOUT = 60000
+
+
+# Playwright's sync API module, imported on first use; False if not installed
+_sync_api = None
+
+
+def _load_playwright():
+    """
+    Import Playwright on first use so it isn't loaded just to import this module
+    
+    Returns:
+        The playwright.sync_api module, or None if Playwright isn't installed
+    """
+    global _sync_api
+    if _sync_api is None:
+        try:
+            from playwright import sync_api
+        except ImportError:
+            print("WARNING: Playwright not installed. Install with: pip install playwright")
+            print("Then run: playwright install")
+            sync_api = False
+        _sync_api = sync_api
+    return _sync_api or None
+
+
+def playwright_available() -> bool:
+    """Check whether Playwright is installed"""
+    return _load_playwright() is not None
+
+
+def wait_for_first_selector(page: Any, selectors: List[str], timeout: int = 15000) -> Optional[str]:
+    """
+    Wait until any of several CSS selectors matches, watching all at once
+    
+    The candidates are combined into one selector list, so a search waits at
+    most one timeout instead of one timeout per candidate.
+    
+    Args:
+        page: Playwright page
+        selectors: Candidate CSS selectors, in order of preference
+        timeout: Maximum time to wait in milliseconds
+    
+    Returns:
+        The first candidate selector that matches the found element, or None
+        if nothing matched before the timeout
+    """
+    sync_api = _load_playwright()
+    try:
+        with timer("browser_wait"):
+            element = page.wait_for_selector(", ".join(selectors), timeout=timeout)
+    except sync_api.TimeoutError:
+        logger.debug("None of %s selectors matched within %sms", len(selectors), timeout)
+        return None
+    
+    if element is None:
+        return None
+    
+    # Report which candidate the element satisfied
+    return element.evaluate(
+        "(el, selectors) => selectors.find(s => el.matches(s)) || null",
+        selectors,
+    )
+
+
+class BrowserPool:
+    """
+    Keeps one Chromium instance running and hands out isolated pages
+    
+    Chromium is launched on first use and shared by every scraper in the
+    run. Each page lives in its own browser context, so cookies and storage
+    don't leak between scrapers. The browser is relaunched after serving
+    max_pages_per_browser pages to keep memory flat.
+    
+    Playwright's sync API is bound to the thread that started it, so each
+    thread gets its own pool through get_browser_pool().
+    """
+    
+    def __init__(self, headless: bool = True,
+                 max_pages_per_browser: int = DEFAULT_MAX_PAGES_PER_BROWSER,
+                 default_timeout: int = DEFAULT_TIMEOUT):
+        """
+        Args:
+            headless: Run Chromium without a window
+            max_pages_per_browser: Pages to serve before recycling the browser
+            default_timeout: Default Playwright timeout for pages in milliseconds
+        """
+        self.headless = headless
+        self.max_pages_per_browser = max_pages_per_browser
+        self.default_timeout = default_timeout
+        self.launches = 0
+        self._playwright = None
+        self._browser = None
+        self._pages_served = 0
+        self._active_pages = 0
+    
+    def _get_browser(self):
+        """Return a running browser, launching or recycling it as needed"""
+        sync_api = _load_playwright()
+        if sync_api is None:
+            raise RuntimeError("Playwright not installed. Install with: pip install playwright")
+        
+        if self._playwright is None:
+            self._playwright = sync_api.sync_playwright().start()
+        
+        # Only recycle once no pages from the old browser are still in use
+        if (self._browser is not None and self._active_pages == 0
+                and self._pages_served >= self.max_pages_per_browser):
+            logger.debug("Recycling browser after %s pages", self._pages_served)
+            self._close_browser()
+        
+        if self._browser is None:
+            logger.debug("Launching Chromium")
+            self._browser = self._playwright.chromium.launch(headless=self.headless)
+            self._pages_served = 0
+            self.launches += 1
+        
+        return self._browser
+    
+    @contextmanager
+    def page(self, **context_options: Any) -> Iterator[Any]:
+        """
+        Open a page in a fresh browser context
+        
+        Args:
+            **context_options: Options passed to browser.new_context()
+        
+        Yields:
+            Playwright page, closed together with its context on exit
+        """
+        browser = self._get_browser()
+        context = browser.new_context(**context_options)
+        self._pages_served += 1
+        self._active_pages += 1
+        try:
+            page = context.new_page()
+            page.set_default_timeout(self.default_timeout)
+            yield page
+        finally:
+            self._active_pages -= 1
+            try:
+                context.close()
+            except Exception as e:
+                logger.warning("Error closing browser context", exc_info=e)
+    
+    def _close_browser(self) -> None:
+        """Close the current browser, if any"""
+        if self._browser is not None:
+            try:
+                self._browser.close()
+            except Exception as e:
+                logger.warning("Error closing browser", exc_info=e)
+            self._browser = None
+    
+    def close(self) -> None:
+        """Close the browser and stop Playwright"""
+        self._close_browser()
+        if self._playwright is not None:
+            try:
+                self._playwright.stop()
+            except Exception as e:
+                logger.warning("Error stopping Playwright", exc_info=e)
+            self._playwright = None
+
+
+_local = threading.local()
+
+
+def get_browser_pool() -> BrowserPool:
+    """
+    Get the browser pool for the calling thread, creating it on first use
+    
+    Returns:
+        BrowserPool owned by the current thread
+    """
+    pool = getattr(_local, "pool", None)
+    if pool is None:
+        pool = BrowserPool()
+        _local.pool = pool
+        if threading.current_thread() is threading.main_thread():
+            atexit.register(close_browser_pool)
+    return pool
+
+
+def close_browser_pool() -> None:
+    """Close the calling thread's browser pool, if it has one"""
+    pool = getattr(_local, "pool", None)
+    if pool is not None:
+        _local.pool = None
+        pool.close()
+
+
+def release_browser_pool() -> None:
+    """
+    Close the calling thread's browser pool once a scraper is done with it
+    
+    Threads of a BrowserThreadPool keep their browser for the next scraper
+    and close it when the pool shuts down, so this does nothing there.
+    """
+    if not getattr(_local, "keep_pool", False):
+        close_browser_pool()
+
+
+class BrowserThreadPool(ThreadPoolExecutor):
+    """
+    Thread pool whose threads keep their browser between tasks
+    
+    Playwright's sync API can't hand pages across threads, so each worker
+    thread has its own browser pool. A plain ThreadPoolExecutor gives no
+    way to close it when the thread exits, forcing every scraper to launch
+    and close its own Chromium. Here each thread launches Chromium at most
+    once, on the first scraper that needs it, and closes it when the
+    executor shuts down. It is a ThreadPoolExecutor so it can also serve as
+    an event loop's default executor, but runs tasks on its own threads.
+    """
+    
+    def __init__(self, max_workers: Optional[int] = None, thread_name_prefix: str = "augips-browser"):
+        """
+        Args:
+            max_workers: Maximum number of threads, defaults to
+                ThreadPoolExecutor's min(32, CPU count + 4)
+            thread_name_prefix: Prefix of the worker thread names
+        """
+        max_workers = max_workers or min(32, (os.cpu_count() or 1) + 4)
+        super().__init__(max_workers=max_workers, thread_name_prefix=thread_name_prefix)
+        self.max_workers = max_workers
+        self.prefix = thread_name_prefix
+        self._tasks: "queue.SimpleQueue" = queue.SimpleQueue()
+        self._workers: List[threading.Thread] = []
+        self._idle = threading.Semaphore(0)
+        self._lock = threading.Lock()
+        self._closed = False
+    
+    def submit(self, fn, /, *args: Any, **kwargs: Any) -> Future:
+        """Schedule fn(*args, **kwargs) on a worker thread"""
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("cannot schedule new futures after shutdown")
+            future: Future = Future()
+            self._tasks.put((future, fn, args, kwargs))
+            # Start a thread unless one is waiting for work
+            if not self._idle.acquire(blocking=False) and len(self._workers) < self.max_workers:
+                worker = threading.Thread(target=self._work, name=f"{self.prefix}_{len(self._workers)}", daemon=True)
+                worker.start()
+                self._workers.append(worker)
+            return future
+    
+    def _work(self) -> None:
+        """Run tasks until shutdown, then close this thread's browser"""
+        _local.keep_pool = True
+        try:
+            while True:
+                task = self._tasks.get()
+                if task is None:
+                    return
+                future, fn, args, kwargs = task
+                if future.set_running_or_notify_cancel():
+                    try:
+                        future.set_result(fn(*args, **kwargs))
+                    except BaseException as e:
+                        future.set_exception(e)
+                del task, future, fn, args, kwargs
+                self._idle.release()
+        finally:
+            close_browser_pool()
+    
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False) -> None:
+        """Stop the worker threads once queued tasks are done, closing their browsers"""
+        with self._lock:
+            if not self._closed:
+                self._closed = True
+                if cancel_futures:
+                    while True:
+                        try:
+                            task = self._tasks.get_nowait()
+                        except queue.Empty:
+                            break
+                        task[0].cancel()
+                for _ in self._workers:
+                    self._tasks.put(None)
+        if wait:
+            for worker in self._workers:
+                worker.join()
+        super().shutdown(wait=wait, cancel_futures=cancel_futures)
\ No newline at end of file
@@ -0,0 +1,239 @@
+"""
+Network capture utilities for Playwright scrapers
+"""
+
+import re
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from .log import get_logger
+from .records import Location
+
+logger = get_logger(__name__)
+
+# Resource types a store locator never needs to render its results
+BLOCKED_RESOURCE_TYPES = {"image", "font", "media"}
+
+# Analytics, ad and tag manager hosts blocked in capture mode
+BLOCKED_HOSTS = [
+    "google-analytics.com",
+    "googletagmanager.com",
+    "doubleclick.net",
+    "googlesyndication.com",
+    "facebook.net",
+    "hotjar.com",
+    "segment.io",
+    "newrelic.com",
+    "nr-data.net",
+    "optimizely.com",
+    "adobedtm.com",
+    "demdex.net",
+    "omtrdc.net",
+    "quantummetric.com",
+    "bing.com",
+]
+
+# Field names commonly used by store locator APIs, in order of preference
+STORE_FIELDS = {
+    "store_name": ["storeName", "store_name", "name", "displayName", "title"],
+    "address": ["address1", "addressLine1", "address_line_1", "street", "streetAddress", "address"],
+    "city": ["city", "cityName", "locality"],
+    "state": ["state", "stateCode", "region", "province"],
+    "zip_code": ["zip", "zipCode", "zip_code", "postalCode", "postal_code", "postcode"],
+    "latitude": ["latitude", "lat"],
+    "longitude": ["longitude", "lng", "lon", "long"],
+}
+
+# Field names of the store number or id every store record carries
+STORE_ID_FIELDS = ["storeId", "store_id", "storeNumber", "store_number", "storeNo", "locationId", "id"]
+
+# Nested objects merged into a store object before its fields are read
+NESTED_STORE_FIELDS = ("address", "location", "geo", "coordinates")
+
+
+class NetworkCapture:
+    """
+    Blocks heavy resources on a page and records matching API responses
+    
+    Most store locators fill their result list from an XHR/JSON endpoint.
+    Capturing those responses lets a scraper parse structured JSON instead
+    of waiting for the page to render and querying the DOM. Attach it to a
+    page before navigating.
+    """
+    
+    def __init__(self, page: Any, url_patterns: List[str],
+                 block_resource_types: Optional[set] = None,
+                 block_hosts: Optional[List[str]] = None):
+        """
+        Args:
+            page: Playwright page
+            url_patterns: Regular expressions; responses whose URL matches any
+                of them are recorded
+            block_resource_types: Resource types to abort, defaults to
+                BLOCKED_RESOURCE_TYPES
+            block_hosts: Host suffixes to abort, defaults to BLOCKED_HOSTS
+        """
+        self.patterns = [re.compile(pattern, re.IGNORECASE) for pattern in url_patterns]
+        self.block_resource_types = BLOCKED_RESOURCE_TYPES if block_resource_types is None else block_resource_types
+        self.block_hosts = BLOCKED_HOSTS if block_hosts is None else block_hosts
+        self.blocked_requests = 0
+        self._responses = []
+        
+        page.route("**/*", self._handle_route)
+        page.on("response", self._handle_response)
+    
+    def _is_blocked(self, url: str, resource_type: str) -> bool:
+        """Check whether a request should be aborted"""
+        if resource_type in self.block_resource_types:
+            return True
+        host = urlparse(url).hostname or ""
+        return any(host == blocked or host.endswith("." + blocked) for blocked in self.block_hosts)
+    
+    def _handle_route(self, route: Any) -> None:
+        """Abort blocked requests and let everything else through"""
+        request = route.request
+        if self._is_blocked(request.url, request.resource_type):
+            self.blocked_requests += 1
+            route.abort()
+        else:
+            route.continue_()
+    
+    def _handle_response(self, response: Any) -> None:
+        """Keep responses whose URL matches a capture pattern"""
+        if any(pattern.search(response.url) for pattern in self.patterns):
+            self._responses.append(response)
+    
+    def json_responses(self) -> List[Tuple[str, Any]]:
+        """
+        Decode captured responses that contain JSON
+        
+        Call this while the page is still open; bodies are read lazily.
+        
+        Returns:
+            List of (url, decoded JSON) tuples
+        """
+        payloads = []
+        for response in self._responses:
+            try:
+                payloads.append((response.url, response.json()))
+            except Exception as e:
+                logger.debug("Skipping non-JSON response from %s: %s", response.url, e)
+        logger.debug("Captured %s JSON responses, blocked %s requests", len(payloads), self.blocked_requests)
+        return payloads
+    
+    def store_records(self) -> List[Dict[str, Any]]:
+        """
+        Extract store locations from every captured JSON response
+        
+        Returns:
+            List of location dictionaries, de-duplicated across responses
+        """
+        locations = []
+        seen = set()
+        for url, data in self.json_responses():
+            for obj in iter_store_objects(data):
+                location = store_from_json(obj)
+                key = tuple(location.values())
+                if key not in seen:
+                    seen.add(key)
+                    locations.append(location)
+        logger.debug("Extracted %s stores from captured responses", len(locations))
+        return locations
+
+
+def _first_field(obj: Dict[str, Any], names: List[str]) -> Any:
+    """Return the first non-empty field from a list of candidate names"""
+    for name in names:
+        value = obj.get(name)
+        if value not in (None, ""):
+            return value
+    return None
+
+
+def _flatten_store(obj: Dict[str, Any]) -> Dict[str, Any]:
+    """Merge nested address and coordinate objects into a store object's own fields"""
+    fields = dict(obj)
+    for nested in NESTED_STORE_FIELDS:
+        if isinstance(fields.get(nested), dict):
+            fields = {**fields.pop(nested), **fields}
+    return fields
+
+
+def _scalar_field(obj: Dict[str, Any], names: List[str]) -> Any:
+    """Return the first non-empty field that isn't an object or array"""
+    value = _first_field(obj, names)
+    return None if isinstance(value, (dict, list)) else value
+
+
+def is_store_object(obj: Dict[str, Any]) -> bool:
+    """
+    Check whether a JSON object is shaped like a store record
+    
+    A store has an id or store number and an address: a street, or both a
+    city and a postal code. Nested address objects count. Coordinates alone
+    are not enough, since map tiles, geolocation and analytics payloads
+    carry them too.
+    
+    Args:
+        obj: Decoded JSON object
+        
+    Returns:
+        True if the object looks like a store
+    """
+    fields = _flatten_store(obj)
+    if _scalar_field(fields, STORE_ID_FIELDS) is None:
+        return False
+    return (_scalar_field(fields, STORE_FIELDS["address"]) is not None
+            or (_scalar_field(fields, STORE_FIELDS["city"]) is not None
+                and _scalar_field(fields, STORE_FIELDS["zip_code"]) is not None))
+
+
+def iter_store_objects(data: Any) -> Iterator[Dict[str, Any]]:
+    """
+    Walk a decoded JSON payload and yield objects that look like stores
+    
+    Objects are tested with is_store_object(); the members of any other
+    object are searched in turn.
+    
+    Args:
+        data: Decoded JSON payload
+    
+    Yields:
+        Store-like dictionaries
+    """
+    stack = [data]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, dict):
+            if is_store_object(item):
+                yield item
+            else:
+                stack.extend(reversed(list(item.values())))
+        elif isinstance(item, list):
+            stack.extend(reversed(item))
+
+
+def store_from_json(obj: Dict[str, Any]) -> Location:
+    """
+    Map a store-like JSON object onto the standard location fields
+    
+    Nested "address" objects are flattened first. Coordinates are left
+    unset when the API doesn't provide them, so the geocoding fallback applies.
+    
+    Args:
+        obj: Store-like dictionary from iter_store_objects()
+    
+    Returns:
+        Location with store_name, address, city, state and zip_code, plus
+        latitude and longitude when available
+    """
+    fields = _flatten_store(obj)
+    location = Location()
+    for key, names in STORE_FIELDS.items():
+        value = _first_field(fields, names)
+        if value is None or isinstance(value, (dict, list)):
+            if key not in ("latitude", "longitude"):
+                location[key] = ""
+        else:
+            location[key] = str(value).strip()
+    return location
\ No newline at end of file
@@ -0,0 +1,34 @@
+"""
+Concurrency helpers for Augips framework
+"""
+
+import asyncio
+from typing import Any, Awaitable, Iterable, List, Optional
+
+
+async def gather_limited(awaitables: Iterable[Awaitable[Any]], limit: Optional[int] = None,
+                         return_exceptions: bool = False) -> List[Any]:
+    """
+    Await many coroutines on one event loop with an optional in-flight cap
+    
+    Async scrapers use this with HttpClient.aget() to keep many requests in
+    flight without overwhelming a single site.
+    
+    Args:
+        awaitables: Coroutines or futures to run
+        limit: Maximum number running at once, or None for no limit
+        return_exceptions: Return exceptions as results instead of raising
+    
+    Returns:
+        Results in the same order as the awaitables
+    """
+    if not limit:
+        return await asyncio.gather(*awaitables, return_exceptions=return_exceptions)
+    
+    semaphore = asyncio.Semaphore(limit)
+    
+    async def _limited(awaitable: Awaitable[Any]) -> Any:
+        async with semaphore:
+            return await awaitable
+    
+    return await asyncio.gather(*(_limited(a) for a in awaitables), return_exceptions=return_exceptions)
@@ -2,27 +2,29 @@
 Debug utilities for Augips framework
 """
 
-import sys
-import traceback
 from typing import Any, Optional
 
+from .log import get_logger
+
 
 def debug_print(message: str, obj: Optional[Any] = None, error: Optional[Exception] = None) -> None:
     """
-    Print debug information with consistent formatting
+    Log debug information through the augips logger
+    
+    Kept for scripts written against the old print-based helper. New code
+    should log through get_logger() with %-style arguments, which are only
+    formatted when the record is actually emitted.
     
     Args:
         message: Debug message
-        obj: Optional object to print
-        error: Optional exception to print
+        obj: Optional object to log
+        error: Optional exception; logged as a warning, with its traceback
+            in debug mode
     """
-    print(f"[DEBUG] {message}")
-    
-    if obj is not None:
-        print(f"[DEBUG] Object: {obj}")
-    
+    logger = get_logger()
     if error is not None:
-        print(f"[DEBUG] Error: {str(error)}")
-        print(f"[DEBUG] Error type: {type(error)}")
-        print("[DEBUG] Traceback:")
-        traceback.print_exc(file=sys.stdout)
\ No newline at end of file
+        logger.warning("%s", message, exc_info=error)
+    elif obj is not None:
+        logger.debug("%s %s", message, obj)
+    else:
+        logger.debug("%s", message)
\ No newline at end of file
@@ -0,0 +1,259 @@
+"""
+Cross-source spatial deduplication for Augips framework
+"""
+
+import math
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from .records import normalize_text, store_key
+
+# Default maximum distance in metres between duplicates
+DEFAULT_RADIUS_M = 150.0
+
+# Default minimum name similarity between duplicates
+DEFAULT_NAME_THRESHOLD = 0.5
+
+# Words that say what kind of place it is rather than which one
+GENERIC_WORDS = frozenset({
+    "the", "and", "of", "store", "shop", "station", "gas", "fuel", "tankstelle",
+    "auto", "parts", "center", "centre", "inc", "llc", "co", "company", "corp",
+})
+
+EARTH_RADIUS_M = 6371000.0
+METRES_PER_DEGREE = 111320.0
+
+
+def name_tokens(value: Any) -> FrozenSet[str]:
+    """
+    Distinctive words of a place name
+    
+    Generic words are dropped, so "AutoZone Auto Parts #1234" has the tokens
+    "autozone" and "1234". Store numbers are kept so that numbered branches
+    of one brand can be told apart, see store_numbers().
+    
+    Args:
+        value: Place or brand name
+        
+    Returns:
+        Set of normalized words
+    """
+    return frozenset(
+        word for word in normalize_text(value).split()
+        if word not in GENERIC_WORDS and (len(word) > 1 or word.isdigit())
+    )
+
+
+def store_numbers(tokens: FrozenSet[str]) -> FrozenSet[str]:
+    """Numeric tokens of a name, such as the store number in AutoZone #1234"""
+    return frozenset(token for token in tokens if token.isdigit())
+
+
+def name_similarity(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    """
+    Overlap of two token sets relative to the smaller one
+    
+    Sources differ mostly by adding words ("Aral" vs "Aral Kurfürstendamm"),
+    which plain Jaccard similarity would punish.
+    
+    Returns:
+        Similarity between 0 and 1, 0 if either name has no distinctive words
+    """
+    if not a or not b:
+        return 0.0
+    numbers_a, numbers_b = store_numbers(a), store_numbers(b)
+    if numbers_a and numbers_b and not numbers_a & numbers_b:
+        # "AutoZone #1234" and "AutoZone #5678" are different stores
+        return 0.0
+    return len(a & b) / min(len(a), len(b))
+
+
+def haversine_m(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """Great-circle distance in metres"""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlmb = math.radians(lng2 - lng1)
+    h = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlmb / 2) ** 2
+    return 2 * EARTH_RADIUS_M * math.asin(min(1.0, math.sqrt(h)))
+
+
+def _coordinates(record: Dict[str, Any]) -> Optional[Tuple[float, float]]:
+    """Parse a record's coordinates, or None if missing or out of range"""
+    try:
+        lat = float(record.get("latitude"))
+        lng = float(record.get("longitude"))
+    except (TypeError, ValueError):
+        return None
+    if not (-90 <= lat <= 90 and -180 <= lng <= 180) or math.isnan(lat) or math.isnan(lng):
+        return None
+    return lat, lng
+
+
+def _find(parent: List[int], i: int) -> int:
+    """Union-find root lookup with path halving"""
+    while parent[i] != i:
+        parent[i] = parent[parent[i]]
+        i = parent[i]
+    return i
+
+
+def cluster_locations(records: List[Dict[str, Any]], radius_m: float = DEFAULT_RADIUS_M,
+                      name_threshold: float = DEFAULT_NAME_THRESHOLD) -> List[List[int]]:
+    """
+    Group records that describe the same place
+    
+    Records are bucketed into grid cells about radius_m wide, and each record
+    is only compared with records in its own and neighbouring cells, so the
+    work grows with the number of records rather than the number of pairs.
+    Columns wrap around at the antimeridian. Two records match when they
+    are within radius_m of each other and their store or brand names are
+    similar; matches are merged transitively.
+    
+    Records of the same company from the same source are never matched
+    when their store keys differ: they are distinct branches, such as two
+    Shell stations on either side of a highway, not one place listed twice.
+    
+    Args:
+        records: Dictionaries containing store location data
+        radius_m: Maximum distance in metres between duplicates
+        name_threshold: Minimum name similarity between duplicates
+        
+    Returns:
+        Lists of record indexes, one per distinct place, in input order
+    """
+    cell_size = radius_m / METRES_PER_DEGREE
+    # Columns are widened slightly so a whole number of them spans the globe
+    columns = max(1, math.floor(360 / cell_size))
+    column_size = 360 / columns
+    parent = list(range(len(records)))
+    points = {}
+    grid: Dict[Tuple[int, int], List[int]] = {}
+    
+    for i, record in enumerate(records):
+        point = _coordinates(record)
+        if point is None:
+            continue
+        points[i] = point
+        cell = (math.floor(point[0] / cell_size), math.floor((point[1] + 180) / column_size) % columns)
+        grid.setdefault(cell, []).append(i)
+    
+    identity_cache: Dict[int, Tuple[str, str, str]] = {}
+    
+    def identity(i: int) -> Tuple[str, str, str]:
+        """Normalized company, source and store key of a record"""
+        if i not in identity_cache:
+            record = records[i]
+            identity_cache[i] = (
+                normalize_text(record.get("company_name")),
+                normalize_text(record.get("source")),
+                record.get("store_key") or store_key(record),
+            )
+        return identity_cache[i]
+    
+    # Names are only tokenized for records that have a neighbour in range,
+    # and brand names repeat, so tokens are cached by value
+    token_cache: Dict[Any, FrozenSet[str]] = {}
+    
+    def tokens(i: int, field: str) -> FrozenSet[str]:
+        value = records[i].get(field)
+        if value not in token_cache:
+            token_cache[value] = name_tokens(value)
+        return token_cache[value]
+    
+    def compare(i: int, j: int) -> None:
+        root_i, root_j = _find(parent, i), _find(parent, j)
+        if root_i == root_j or haversine_m(*points[i], *points[j]) > radius_m:
+            return
+        similarity = max(
+            name_similarity(tokens(i, "store_name"), tokens(j, "store_name")),
+            name_similarity(tokens(i, "store_name"), tokens(j, "company_name")),
+            name_similarity(tokens(i, "company_name"), tokens(j, "store_name")),
+        )
+        if similarity < name_threshold:
+            return
+        company_i, source_i, key_i = identity(i)
+        company_j, source_j, key_j = identity(j)
+        if company_i and company_i == company_j and source_i == source_j and key_i != key_j:
+            return
+        parent[max(root_i, root_j)] = min(root_i, root_j)
+    
+    for (row, col), members in grid.items():
+        # Degrees of longitude shrink towards the poles, so more columns may
+        # be within range; use the most poleward edge of this row and the next
+        cos_lat = max(math.cos(math.radians(min(90.0, max(abs(row), abs(row + 2)) * cell_size))), 0.01)
+        span = math.ceil(1 / cos_lat)
+        
+        for k, i in enumerate(members):
+            for j in members[k + 1:]:
+                compare(i, j)
+        # Only look forward (same row to the right, and the next row), so
+        # each pair of cells is visited once
+        neighbours = {(row, (col + dc) % columns) for dc in range(1, span + 1)}
+        neighbours |= {(row + 1, (col + dc) % columns) for dc in range(-span, span + 1)}
+        neighbours.discard((row, col))
+        for cell in neighbours:
+            others = grid.get(cell)
+            if others:
+                for i in members:
+                    for j in others:
+                        compare(i, j)
+    
+    clusters: Dict[int, List[int]] = {}
+    for i in range(len(records)):
+        clusters.setdefault(_find(parent, i), []).append(i)
+    return list(clusters.values())
+
+
+def merge_records(members: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Merge duplicate records into one canonical entity
+    
+    The most complete record is the base, with empty fields filled in from
+    the others. Coordinates are averaged, and the sources are listed.
+    
+    Args:
+        members: Records describing the same place
+        
+    Returns:
+        Canonical location dictionary
+    """
+    if len(members) == 1:
+        canonical = dict(members[0])
+        canonical["sources"] = str(canonical.get("company_name") or "")
+        canonical["duplicate_count"] = 1
+        return canonical
+    
+    ranked = sorted(members, key=lambda r: sum(1 for v in r.values() if v not in (None, "")), reverse=True)
+    canonical = dict(ranked[0])
+    for record in ranked[1:]:
+        for key, value in record.items():
+            if canonical.get(key) in (None, "") and value not in (None, ""):
+                canonical[key] = value
+    
+    points = [p for p in (_coordinates(r) for r in members) if p is not None]
+    if points:
+        canonical["latitude"] = round(sum(p[0] for p in points) / len(points), 6)
+        canonical["longitude"] = round(sum(p[1] for p in points) / len(points), 6)
+    sources = sorted({str(r.get("company_name")) for r in members if r.get("company_name")})
+    canonical["sources"] = ";".join(sources)
+    canonical["duplicate_count"] = len(members)
+    return canonical
+
+
+def deduplicate_locations(records: Iterable[Dict[str, Any]], radius_m: float = DEFAULT_RADIUS_M,
+                          name_threshold: float = DEFAULT_NAME_THRESHOLD) -> List[Dict[str, Any]]:
+    """
+    Merge duplicate places from overlapping sources
+    
+    Args:
+        records: Dictionaries containing store location data from any scrapers
+        radius_m: Maximum distance in metres between duplicates
+        name_threshold: Minimum name similarity between duplicates
+        
+    Returns:
+        Canonical location dictionaries, one per distinct place
+    """
+    records = list(records)
+    return [
+        merge_records([records[i] for i in cluster])
+        for cluster in cluster_locations(records, radius_m, name_threshold)
+    ]
\ No newline at end of file
@@ -0,0 +1,184 @@
+"""
+Persistent geocoding cache for Augips framework
+"""
+
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Optional, Tuple
+
+# Default cache location, shared by every run and process
+DEFAULT_CACHE_PATH = "data/geocode_cache.sqlite"
+
+# Successful lookups are kept for 90 days
+DEFAULT_TTL = 90 * 24 * 3600
+
+# Addresses that could not be geocoded are retried after 7 days
+DEFAULT_NEGATIVE_TTL = 7 * 24 * 3600
+
+# Least recently used entries are evicted beyond this many rows
+DEFAULT_MAX_ENTRIES = 500000
+
+# Writes between eviction passes
+EVICT_INTERVAL = 1000
+
+
+def normalize_address(address: str) -> str:
+    """
+    Normalize an address into a cache key
+    
+    Lowercases, drops punctuation and collapses whitespace, so formatting
+    differences between scrapers map to the same entry.
+    
+    Args:
+        address: Full address string
+        
+    Returns:
+        Normalized address
+    """
+    address = re.sub(r"[^\w\s-]", " ", address.lower())
+    return " ".join(address.split())
+
+
+class GeocodeCache:
+    """
+    SQLite-backed cache of geocoding results
+    
+    Entries are keyed by normalized address and expire after a TTL. Failed
+    lookups are cached too, with a shorter TTL. The database uses WAL mode
+    so several processes can share it.
+    """
+    
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, ttl: float = DEFAULT_TTL,
+                 negative_ttl: float = DEFAULT_NEGATIVE_TTL,
+                 max_entries: int = DEFAULT_MAX_ENTRIES):
+        """
+        Args:
+            path: SQLite database file
+            ttl: Seconds to keep successful lookups
+            negative_ttl: Seconds to keep failed lookups
+            max_entries: Maximum number of cached addresses
+        """
+        self.path = path
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+        self._local = threading.local()
+        self._writes = 0
+        self._lock = threading.Lock()
+        
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        conn = self._connection()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS geocodes ("
+            "address TEXT PRIMARY KEY, latitude REAL, longitude REAL, "
+            "created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS geocodes_accessed_at ON geocodes (accessed_at)")
+        conn.commit()
+        self.evict()
+    
+    def _connection(self) -> sqlite3.Connection:
+        """Return this thread's connection, opening it on first use"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+    
+    def get(self, address: str) -> Optional[Tuple[Optional[float], Optional[float]]]:
+        """
+        Look up a cached result
+        
+        Args:
+            address: Full address string
+            
+        Returns:
+            Cached (latitude, longitude), (None, None) for a cached failure,
+            or None if the address isn't cached or has expired
+        """
+        key = normalize_address(address)
+        conn = self._connection()
+        row = conn.execute(
+            "SELECT latitude, longitude, created_at FROM geocodes WHERE address = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        
+        lat, lng, created_at = row
+        ttl = self.ttl if lat is not None else self.negative_ttl
+        now = time.time()
+        if now - created_at > ttl:
+            return None
+        
+        conn.execute("UPDATE geocodes SET accessed_at = ? WHERE address = ?", (now, key))
+        conn.commit()
+        return (lat, lng)
+    
+    def set(self, address: str, lat: Optional[float], lng: Optional[float]) -> None:
+        """
+        Store a result, including failures as (None, None)
+        
+        Args:
+            address: Full address string
+            lat: Latitude, or None if the address could not be geocoded
+            lng: Longitude, or None if the address could not be geocoded
+        """
+        now = time.time()
+        conn = self._connection()
+        conn.execute(
+            "INSERT OR REPLACE INTO geocodes (address, latitude, longitude, created_at, accessed_at) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (normalize_address(address), lat, lng, now, now),
+        )
+        conn.commit()
+        
+        with self._lock:
+            self._writes += 1
+            evict = self._writes % EVICT_INTERVAL == 0
+        if evict:
+            self.evict()
+    
+    def evict(self) -> None:
+        """Remove expired entries and trim the cache to max_entries"""
+        now = time.time()
+        conn = self._connection()
+        conn.execute(
+            "DELETE FROM geocodes WHERE (latitude IS NOT NULL AND created_at < ?) "
+            "OR (latitude IS NULL AND created_at < ?)",
+            (now - self.ttl, now - self.negative_ttl),
+        )
+        conn.execute(
+            "DELETE FROM geocodes WHERE address IN ("
+            "SELECT address FROM geocodes ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,),
+        )
+        conn.commit()
+
+
+_cache: Optional[GeocodeCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_geocode_cache() -> GeocodeCache:
+    """
+    Get the shared geocoding cache, opening it on first use
+    
+    The location can be set with the AUGIPS_GEOCODE_CACHE environment variable.
+    
+    Returns:
+        Process-wide GeocodeCache instance
+    """
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = GeocodeCache(os.getenv("AUGIPS_GEOCODE_CACHE", DEFAULT_CACHE_PATH))
+    return _cache
\ No newline at end of file
@@ -3,36 +3,71 @@ Geocoding utilities for Augips framework
 """
 
 import os
+import threading
 from typing import Tuple, Optional
 from geopy.geocoders import Nominatim
 from dotenv import load_dotenv
 
+from .geocache import get_geocode_cache
+from .log import get_logger
+
+logger = get_logger(__name__)
+
 # Load environment variables
 load_dotenv()
 
+_geolocator = None
+_geolocator_lock = threading.Lock()
 
-def geocode_address(address: str) -> Tuple[Optional[float], Optional[float]]:
+
+def get_geolocator() -> Nominatim:
+    """
+    Get the shared Nominatim client, creating it on first use
+    
+    Returns:
+        Nominatim geocoder
+    """
+    global _geolocator
+    if _geolocator is None:
+        with _geolocator_lock:
+            if _geolocator is None:
+                _geolocator = Nominatim(user_agent="augips")
+    return _geolocator
+
+
+def geocode_address(address: str, use_cache: bool = True) -> Tuple[Optional[float], Optional[float]]:
     """
     Geocode an address to get latitude and longitude
     
+    Results, including addresses that could not be found, are kept in the
+    persistent geocoding cache, so repeated runs skip the network.
+    
     Args:
         address: Full address string
+        use_cache: Read from and write to the geocoding cache
         
     Returns:
         Tuple of (latitude, longitude) or (None, None) if geocoding fails
     """
+    if use_cache:
+        cached = get_geocode_cache().get(address)
+        if cached is not None:
+            return cached
+    
     try:
-        # Initialize geocoder
-        geolocator = Nominatim(user_agent="augips")
-        
         # Geocode the address
-        location = geolocator.geocode(address)
+        location = get_geolocator().geocode(address)
         
         if location:
-            return (location.latitude, location.longitude)
+            result = (location.latitude, location.longitude)
         else:
-            print(f"Could not geocode address: {address}")
-            return (None, None)
+            logger.warning("Could not geocode address: %s", address)
+            result = (None, None)
+        
+        # Only definitive answers are cached; errors are retried next time
+        if use_cache:
+            get_geocode_cache().set(address, *result)
+        return result
     except Exception as e:
-        print(f"Error geocoding address: {address} - {str(e)}")
+        logger.warning("Error geocoding address: %s", address, exc_info=e)
         return (None, None)
\ No newline at end of file
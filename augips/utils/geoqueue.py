@@ -0,0 +1,168 @@
+"""
+Background geocoding queue for Augips framework
+"""
+
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, Dict, Optional, Tuple
+
+from .geocache import get_geocode_cache, normalize_address
+from .log import get_logger
+from .metrics import increment
+
+logger = get_logger(__name__)
+
+# Nominatim's usage policy allows at most one request per second
+DEFAULT_RATE_LIMIT = 1.0
+
+
+class RateLimiter:
+    """Thread-safe limiter that spaces calls at least 1/rate seconds apart"""
+    
+    def __init__(self, rate: float):
+        """
+        Args:
+            rate: Maximum calls per second
+        """
+        self.interval = 1.0 / rate
+        self._next_time = 0.0
+        self._lock = threading.Lock()
+    
+    def wait(self) -> None:
+        """Block until the next call is allowed"""
+        with self._lock:
+            now = time.monotonic()
+            delay = self._next_time - now
+            self._next_time = max(now, self._next_time) + self.interval
+        if delay > 0:
+            time.sleep(delay)
+
+
+class GeocodingQueue:
+    """
+    Geocodes addresses on a background thread while scraping continues
+    
+    Identical addresses are de-duplicated, cached results are answered
+    immediately, and network lookups are spaced to the provider's rate
+    limit. Each submission returns a Future for (latitude, longitude).
+    """
+    
+    def __init__(self, geocode: Optional[Callable[[str], Tuple[Optional[float], Optional[float]]]] = None,
+                 rate_limit: float = DEFAULT_RATE_LIMIT):
+        """
+        Args:
+            geocode: Function that geocodes one address over the network,
+                defaults to augips.utils.geocoding.geocode_address
+            rate_limit: Maximum network lookups per second
+        """
+        self._geocode = geocode
+        self._limiter = RateLimiter(rate_limit)
+        self._queue = queue.Queue()
+        self._pending: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._thread = None
+    
+    def submit(self, address: str) -> Future:
+        """
+        Queue an address for geocoding
+        
+        Args:
+            address: Full address string
+            
+        Returns:
+            Future resolving to (latitude, longitude), or (None, None) if the
+            address could not be geocoded
+        """
+        key = normalize_address(address)
+        with self._lock:
+            future = self._pending.get(key)
+        if future is not None:
+            return future
+        
+        # Cached answers don't count against the rate limit
+        cached = get_geocode_cache().get(address)
+        if cached is not None:
+            increment("geocode_cache_hits")
+            future = Future()
+            future.set_result(cached)
+            return future
+        
+        with self._lock:
+            future = self._pending.get(key)
+            if future is not None:
+                return future
+            future = Future()
+            self._pending[key] = future
+        
+        increment("geocode_requests")
+        self._queue.put((key, address, future))
+        self._ensure_worker()
+        return future
+    
+    def _ensure_worker(self) -> None:
+        """Start the background thread if it isn't running"""
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._work, name="augips-geocoder", daemon=True)
+                self._thread.start()
+    
+    def _work(self) -> None:
+        """Resolve queued addresses one at a time at the rate limit"""
+        if self._geocode is None:
+            from .geocoding import geocode_address
+            self._geocode = geocode_address
+        
+        while True:
+            key, address, future = self._queue.get()
+            try:
+                self._limiter.wait()
+                logger.debug("Geocoding %s", address)
+                future.set_result(self._geocode(address))
+            except Exception as e:
+                logger.warning("Error geocoding %s", address, exc_info=e)
+                future.set_result((None, None))
+            finally:
+                # Later submissions of this address are answered by the cache
+                with self._lock:
+                    self._pending.pop(key, None)
+                self._queue.task_done()
+    
+    def pending(self) -> int:
+        """Number of addresses waiting for a network lookup"""
+        return self._queue.qsize()
+
+
+_geocoding_queue: Optional[GeocodingQueue] = None
+_geocoding_queue_lock = threading.Lock()
+
+
+def get_geocoding_queue() -> GeocodingQueue:
+    """
+    Get the shared geocoding queue
+    
+    All scrapers in a process share one queue, so concurrent scrapers still
+    respect the provider's rate limit together.
+    
+    Returns:
+        Process-wide GeocodingQueue instance
+    """
+    global _geocoding_queue
+    if _geocoding_queue is None:
+        with _geocoding_queue_lock:
+            if _geocoding_queue is None:
+                _geocoding_queue = GeocodingQueue()
+    return _geocoding_queue
+
+
+def set_geocoding_queue(geocoding_queue: Optional[GeocodingQueue]) -> None:
+    """
+    Replace the shared geocoding queue
+    
+    Args:
+        geocoding_queue: New queue, or None to create a default one on next use
+    """
+    global _geocoding_queue
+    with _geocoding_queue_lock:
+        _geocoding_queue = geocoding_queue
\ No newline at end of file
@@ -0,0 +1,158 @@
+"""
+Pluggable HTML parsing for Augips framework
+"""
+
+import html
+import os
+import re
+from typing import Any, List, Optional, Sequence
+
+# Import optional dependencies with fallbacks
+try:
+    from bs4 import BeautifulSoup, SoupStrainer
+except ImportError:
+    BeautifulSoup = None
+    SoupStrainer = None
+
+try:
+    import lxml  # noqa: F401 - only checked for availability
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+try:
+    from selectolax.parser import HTMLParser as LexborParser
+except ImportError:
+    LexborParser = None
+
+# Parser backends accepted by parse_html() and Scraper.html_parser
+PARSERS = ["html.parser", "lxml", "selectolax"]
+
+# Used when a scraper doesn't choose a parser; "auto" picks lxml when installed
+DEFAULT_PARSER = os.getenv("AUGIPS_HTML_PARSER", "auto")
+
+TITLE_PATTERN = re.compile(r"<title[^>]*>(.*?)</title\s*>", re.IGNORECASE | re.DOTALL)
+
+
+def resolve_parser(parser: Optional[str] = None) -> str:
+    """
+    Pick the parser backend to use
+    
+    Args:
+        parser: Backend name, "auto" or None for the default
+        
+    Returns:
+        One of PARSERS
+    """
+    parser = parser or DEFAULT_PARSER
+    if parser == "auto":
+        return "lxml" if LXML_AVAILABLE and BeautifulSoup is not None else "html.parser"
+    if parser not in PARSERS:
+        raise ValueError(f"Unknown HTML parser '{parser}'. Available parsers: {', '.join(PARSERS)}")
+    return parser
+
+
+def _strainer(only: Sequence[str]):
+    """
+    Build a SoupStrainer from simple selectors
+    
+    Selectors are either all tag names ("table", "a") or all class names
+    (".store-list"); the strainer keeps matching elements with their
+    contents and skips building the rest of the tree.
+    """
+    classes = [selector[1:] for selector in only if selector.startswith(".")]
+    if classes and len(classes) != len(only):
+        raise ValueError("Targeted parsing takes either tag names or class selectors, not both")
+    if classes:
+        return SoupStrainer(class_=classes)
+    return SoupStrainer(list(only))
+
+
+class _LexborNode:
+    """Adapts a selectolax node to the subset of the BeautifulSoup Tag API scrapers use"""
+    
+    __slots__ = ("node",)
+    
+    def __init__(self, node):
+        self.node = node
+    
+    @property
+    def text(self) -> str:
+        return self.node.text(deep=True)
+    
+    def get(self, attribute: str, default: Any = None) -> Any:
+        value = self.node.attributes.get(attribute)
+        return default if value is None else value
+    
+    def select(self, selector: str) -> List["_LexborNode"]:
+        return [_LexborNode(node) for node in self.node.css(selector)]
+    
+    def select_one(self, selector: str) -> Optional["_LexborNode"]:
+        node = self.node.css_first(selector)
+        return None if node is None else _LexborNode(node)
+
+
+class HtmlDocument:
+    """
+    Parsed HTML page with a backend-independent interface
+    
+    select() and select_one() take CSS selectors and return elements with
+    .text, .get(attribute), .select() and .select_one(), whichever backend
+    parsed the page.
+    """
+    
+    def __init__(self, markup: str, parser: Optional[str] = None, only: Optional[Sequence[str]] = None):
+        """
+        Args:
+            markup: HTML text
+            parser: Backend name from PARSERS, "auto" or None for the default
+            only: Simple selectors of the elements to keep, either tag names
+                or class selectors, e.g. ["table"] or [".store-list"]. Other
+                elements are skipped while parsing. selectolax always builds
+                the full tree, since its C parser is fast enough not to need it.
+        """
+        self.markup = markup
+        self.parser = resolve_parser(parser)
+        self.only = list(only) if only else None
+        
+        if self.parser == "selectolax":
+            if LexborParser is None:
+                raise RuntimeError("selectolax not installed. Install with: pip install selectolax")
+            self._root = _LexborNode(LexborParser(markup))
+        else:
+            if BeautifulSoup is None:
+                raise RuntimeError("BeautifulSoup not installed. Install with: pip install beautifulsoup4")
+            parse_only = _strainer(self.only) if self.only else None
+            self._root = BeautifulSoup(markup, self.parser, parse_only=parse_only)
+    
+    @property
+    def title(self) -> Optional[str]:
+        """Page title, read from the markup if targeted parsing skipped it"""
+        element = self._root.select_one("title")
+        if element is not None:
+            return element.text
+        match = TITLE_PATTERN.search(self.markup)
+        return html.unescape(match.group(1)).strip() if match else None
+    
+    def select(self, selector: str) -> List[Any]:
+        """Find all elements matching a CSS selector"""
+        return self._root.select(selector)
+    
+    def select_one(self, selector: str) -> Optional[Any]:
+        """Find the first element matching a CSS selector"""
+        return self._root.select_one(selector)
+
+
+def parse_html(markup: str, parser: Optional[str] = None, only: Optional[Sequence[str]] = None) -> HtmlDocument:
+    """
+    Parse an HTML page
+    
+    Args:
+        markup: HTML text
+        parser: Backend name from PARSERS, "auto" or None for the default
+        only: Tag names or class selectors of the only elements to parse
+        
+    Returns:
+        Parsed document
+    """
+    return HtmlDocument(markup, parser=parser, only=only)
\ No newline at end of file
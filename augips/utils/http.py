@@ -0,0 +1,259 @@
+"""
+HTTP client utilities for Augips framework
+"""
+
+import asyncio
+import contextvars
+import functools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Iterator, Optional, TYPE_CHECKING
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .jsonstream import JsonArrayReader
+from .metrics import current_metrics, increment, timer
+
+if TYPE_CHECKING:
+    from .httpcache import HttpCache
+
+# Default request timeout in seconds
+DEFAULT_TIMEOUT = 30
+
+# Number of distinct hosts to keep connection pools for
+DEFAULT_POOL_CONNECTIONS = 32
+
+# Maximum number of open connections per host
+DEFAULT_MAX_PER_HOST = 8
+
+# Maximum requests in flight through arequest() across all hosts; each one
+# holds a thread of the client's async executor while it waits
+DEFAULT_ASYNC_LIMIT = 256
+
+# Bytes read from the network at a time when streaming a response body
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+class HttpClient:
+    """
+    Pooled HTTP client shared by scrapers
+    
+    Wraps a requests Session so connections are kept alive and reused across
+    requests to the same host, instead of opening a new TCP+TLS connection
+    for every call. With an HttpCache attached, responses are stored on disk
+    and revalidated instead of downloaded again.
+    """
+    
+    def __init__(self, timeout: float = DEFAULT_TIMEOUT,
+                 pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+                 max_per_host: int = DEFAULT_MAX_PER_HOST,
+                 retries: int = 0,
+                 cache: Optional["HttpCache"] = None,
+                 async_limit: Optional[int] = None):
+        """
+        Args:
+            timeout: Default timeout in seconds for requests that don't set one
+            pool_connections: Number of host pools to keep
+            max_per_host: Maximum concurrent connections per host; callers
+                block until a connection is free once the limit is reached
+            retries: Number of retries on connection errors
+            cache: On-disk response cache, or None to always fetch
+            async_limit: Maximum requests in flight through arequest()
+                across all hosts, defaults to DEFAULT_ASYNC_LIMIT; requests
+                to one host are still limited to max_per_host connections
+        """
+        self.timeout = timeout
+        self.cache = cache
+        self.async_limit = async_limit or DEFAULT_ASYNC_LIMIT
+        self._async_executor: Optional[ThreadPoolExecutor] = None
+        self._async_executor_lock = threading.Lock()
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=max_per_host,
+            pool_block=True,
+            max_retries=retries,
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+    
+    def request(self, method: str, url: str, **kwargs: Any) -> requests.Response:
+        """
+        Send an HTTP request over a pooled connection
+        
+        The request counts towards the current scraper run's fetch time,
+        request, byte, cache hit and error metrics.
+        
+        Args:
+            method: HTTP method
+            url: Request URL
+            **kwargs: Arguments passed through to requests
+        
+        Returns:
+            HTTP response
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        increment("http_requests")
+        try:
+            with timer("fetch"):
+                if self.cache is not None:
+                    response = self.cache.request(self.session.request, method, url, **kwargs)
+                else:
+                    response = self.session.request(method, url, **kwargs)
+        except requests.RequestException:
+            increment("http_errors")
+            raise
+        
+        from_cache = getattr(response, "from_cache", False)
+        if from_cache:
+            increment("http_cache_hits")
+        if response.status_code >= 400:
+            increment("http_errors")
+        # Streamed bodies haven't been read yet and are counted by their
+        # reader, see stream_json()
+        if not kwargs.get("stream"):
+            increment("http_cache_bytes" if from_cache else "http_bytes", len(response.content))
+        return response
+    
+    def get(self, url: str, **kwargs: Any) -> requests.Response:
+        """Send a GET request"""
+        return self.request("GET", url, **kwargs)
+    
+    def post(self, url: str, **kwargs: Any) -> requests.Response:
+        """Send a POST request"""
+        return self.request("POST", url, **kwargs)
+    
+    async def arequest(self, method: str, url: str, **kwargs: Any) -> requests.Response:
+        """
+        Send an HTTP request without blocking the event loop
+        
+        The request runs through request() on the client's own thread pool
+        of async_limit threads, with the same pooling, caching and metrics,
+        so hundreds of requests to different hosts can be in flight without
+        tying up the event loop's default executor. Requests to one host
+        wait for one of its max_per_host pooled connections; anything beyond
+        async_limit queues for a thread.
+        
+        Args:
+            method: HTTP method
+            url: Request URL
+            **kwargs: Arguments passed through to requests
+            
+        Returns:
+            HTTP response
+        """
+        loop = asyncio.get_running_loop()
+        # Like asyncio.to_thread(), run in a copy of the context so the
+        # request counts towards the calling run's metrics
+        context = contextvars.copy_context()
+        call = functools.partial(context.run, self.request, method, url, **kwargs)
+        return await loop.run_in_executor(self._executor(), call)
+    
+    def _executor(self) -> ThreadPoolExecutor:
+        """Thread pool that async requests run on, created on first use"""
+        if self._async_executor is None:
+            with self._async_executor_lock:
+                if self._async_executor is None:
+                    self._async_executor = ThreadPoolExecutor(max_workers=self.async_limit,
+                                                              thread_name_prefix="augips-http")
+        return self._async_executor
+    
+    async def aget(self, url: str, **kwargs: Any) -> requests.Response:
+        """Send a GET request without blocking the event loop"""
+        return await self.arequest("GET", url, **kwargs)
+    
+    async def apost(self, url: str, **kwargs: Any) -> requests.Response:
+        """Send a POST request without blocking the event loop"""
+        return await self.arequest("POST", url, **kwargs)
+    
+    def close(self) -> None:
+        """Close all pooled connections and stop the async request threads"""
+        if self._async_executor is not None:
+            self._async_executor.shutdown(wait=False, cancel_futures=True)
+            self._async_executor = None
+        self.session.close()
+
+
+def _read_chunks(response: requests.Response, chunk_size: int) -> Iterator[bytes]:
+    """Read a streamed body, counting its bytes and read time towards the run's fetch metrics"""
+    metrics = current_metrics()
+    counter = "http_cache_bytes" if getattr(response, "from_cache", False) else "http_bytes"
+    chunks = response.iter_content(chunk_size)
+    size, seconds = 0, 0.0
+    try:
+        while True:
+            start = time.perf_counter()
+            chunk = next(chunks, None)
+            seconds += time.perf_counter() - start
+            if chunk is None:
+                return
+            size += len(chunk)
+            yield chunk
+    finally:
+        response.close()
+        if metrics is not None:
+            metrics.increment(counter, size)
+            # Time spent downloading the body belongs to the request's fetch
+            metrics.add_time("fetch", seconds, calls=0)
+
+
+def stream_json(response: requests.Response, key: str = "elements",
+                chunk_size: int = STREAM_CHUNK_SIZE) -> JsonArrayReader:
+    """
+    Read the items of an array in a JSON response while it downloads
+    
+    The response must have been requested with stream=True, so its body has
+    not been read yet. Items are decoded one at a time as chunks arrive,
+    instead of holding the whole text and parsed document in memory, and
+    the response is closed when the reader finishes or is closed. Responses
+    served by the HTTP cache are streamed from disk.
+    
+    Args:
+        response: Streamed response whose body is a JSON object
+        key: Top-level member holding the array, e.g. "elements" for Overpass
+        chunk_size: Bytes to read at a time
+        
+    Returns:
+        Iterable of the array's items; the object's other members are in
+        its fields attribute once iteration has finished
+    """
+    return JsonArrayReader(_read_chunks(response, chunk_size), key)
+
+
+_client: Optional[HttpClient] = None
+_client_lock = threading.Lock()
+
+
+def get_http_client() -> HttpClient:
+    """
+    Get the shared HTTP client, creating it on first use
+    
+    The default client caches responses in normal mode, honoring the
+    origin's Cache-Control headers.
+    
+    Returns:
+        Process-wide HttpClient instance
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                from .httpcache import HttpCache
+                _client = HttpClient(cache=HttpCache())
+    return _client
+
+
+def set_http_client(client: Optional[HttpClient]) -> None:
+    """
+    Replace the shared HTTP client
+    
+    Args:
+        client: New client, or None to create a default one on next use
+    """
+    global _client
+    with _client_lock:
+        if _client is not None and _client is not client:
+            _client.close()
+        _client = client
\ No newline at end of file
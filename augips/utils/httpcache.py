@@ -0,0 +1,461 @@
+"""
+On-disk HTTP response cache for Augips framework
+"""
+
+import email.utils
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, Optional
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+# Default cache directory
+DEFAULT_CACHE_DIR = "data/http_cache"
+
+# Cache modes accepted by HttpCache and main.py --cache-mode
+CACHE_MODES = ["normal", "prefer-cache", "offline", "refresh"]
+
+# Size limit in megabytes and days an entry may go unused before it is
+# pruned; 0 disables the limit
+DEFAULT_MAX_SIZE_MB = 1024
+DEFAULT_MAX_AGE_DAYS = 30
+
+# Seconds between prunes while the cache stays under its size limit
+PRUNE_INTERVAL = 3600
+
+# Pruning for size stops once the cache is this fraction of the limit, so
+# the next few writes don't each start another prune
+PRUNE_TARGET = 0.9
+
+# Temporary files older than this many seconds were left by a writer that
+# crashed and are removed when pruning
+STALE_TMP_SECONDS = 3600
+
+# Request headers that select a representation and so are part of the key
+KEY_HEADERS = ("Accept", "Accept-Language")
+
+# Methods whose responses are cached; POST is included for APIs such as
+# Overpass that take the query in the request body
+CACHEABLE_METHODS = {"GET", "POST"}
+
+
+class CacheMissError(requests.ConnectionError):
+    """Raised in offline mode when a request has no cached response"""
+
+
+class _CachedBody:
+    """Cached body file that a streamed response reads from"""
+    
+    def __init__(self, file: Any):
+        self._file = file
+        self.closed = False
+    
+    def read(self, amt: Optional[int] = None) -> bytes:
+        return self._file.read(amt)
+    
+    def close(self) -> None:
+        self._file.close()
+        self.closed = True
+    
+    # Response.close() releases a fully read body like a pooled connection
+    release_conn = close
+
+
+class _CachingStream:
+    """
+    Wraps a streamed response body, copying it to a file as it is read
+    
+    The copy is committed to the cache only once the body has been read to
+    the end; a body closed early is discarded.
+    """
+    
+    def __init__(self, raw: Any, path: str, commit: Callable[[], None]):
+        """
+        Args:
+            raw: urllib3 response being streamed
+            path: Temporary file for the body
+            commit: Called after the whole body has been written to path
+        """
+        self._raw = raw
+        self._path = path
+        self._commit = commit
+        self._file = open(path, "wb")
+    
+    def stream(self, amt: int = 2 ** 16, decode_content: Optional[bool] = None) -> Iterator[bytes]:
+        # Bodies are cached decoded, like Response.content
+        for chunk in self._raw.stream(amt, decode_content=True):
+            if self._file is not None:
+                self._file.write(chunk)
+            yield chunk
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            self._commit()
+    
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            try:
+                os.remove(self._path)
+            except OSError:
+                pass
+        self._raw.close()
+    
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._raw, name)
+
+
+def _parse_cache_control(value: str) -> Dict[str, Optional[str]]:
+    """Parse a Cache-Control header into a dictionary of directives"""
+    directives = {}
+    for part in value.split(","):
+        name, _, arg = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = arg.strip('"') or None
+    return directives
+
+
+def _parse_date(value: Optional[str]) -> Optional[float]:
+    """Parse an HTTP date into a timestamp"""
+    if not value:
+        return None
+    try:
+        return email.utils.parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+
+def freshness_lifetime(headers: Dict[str, str]) -> float:
+    """
+    Seconds a response may be served without revalidation
+    
+    Uses max-age, then Expires, then the usual heuristic of 10% of the time
+    since Last-Modified.
+    
+    Args:
+        headers: Response headers
+        
+    Returns:
+        Freshness lifetime in seconds, 0 if the response must be revalidated
+    """
+    directives = _parse_cache_control(headers.get("Cache-Control", ""))
+    if "no-cache" in directives:
+        return 0
+    if directives.get("max-age"):
+        try:
+            return max(0, int(directives["max-age"]))
+        except ValueError:
+            return 0
+    
+    date = _parse_date(headers.get("Date"))
+    expires = _parse_date(headers.get("Expires"))
+    if expires is not None:
+        return max(0, expires - (date or time.time()))
+    
+    last_modified = _parse_date(headers.get("Last-Modified"))
+    if date is not None and last_modified is not None:
+        return max(0, (date - last_modified) / 10)
+    return 0
+
+
+def _remove(path: str) -> None:
+    """Delete a file if it still exists"""
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+class HttpCache:
+    """
+    Stores response bodies on disk and revalidates them with the origin
+    
+    Modes:
+        normal: Serve fresh entries per Cache-Control/Expires, revalidate
+            stale ones with If-None-Match/If-Modified-Since
+        prefer-cache: Serve any cached entry, fetching only on a miss
+        offline: Serve cached entries only; a miss raises CacheMissError
+        refresh: Always fetch, replacing cached entries
+    
+    Entries are keyed by method, URL (including query parameters), request
+    body and the Accept and Accept-Language headers. Each entry is a JSON
+    metadata file and a body file, written atomically so concurrent
+    scrapers can share the cache.
+    
+    The cache is pruned as it is written to: entries unused for max_age
+    seconds are deleted, then the least recently used ones until the cache
+    fits in max_size bytes.
+    """
+    
+    def __init__(self, directory: Optional[str] = None, mode: str = "normal",
+                 max_size: Optional[int] = None, max_age: Optional[float] = None):
+        """
+        Args:
+            directory: Cache directory, defaults to AUGIPS_HTTP_CACHE or data/http_cache
+            mode: One of CACHE_MODES
+            max_size: Size limit in bytes, defaults to AUGIPS_HTTP_CACHE_MAX_MB
+                or 1 GB; 0 for no limit
+            max_age: Seconds an entry may go unused before it is deleted,
+                defaults to AUGIPS_HTTP_CACHE_MAX_DAYS or 30 days; 0 for no limit
+        """
+        if mode not in CACHE_MODES:
+            raise ValueError(f"Unknown cache mode '{mode}'. Available modes: {', '.join(CACHE_MODES)}")
+        self.directory = directory or os.getenv("AUGIPS_HTTP_CACHE", DEFAULT_CACHE_DIR)
+        self.mode = mode
+        if max_size is None:
+            max_size = int(float(os.getenv("AUGIPS_HTTP_CACHE_MAX_MB", DEFAULT_MAX_SIZE_MB)) * 1024 * 1024)
+        if max_age is None:
+            max_age = float(os.getenv("AUGIPS_HTTP_CACHE_MAX_DAYS", DEFAULT_MAX_AGE_DAYS)) * 86400
+        self.max_size = max_size
+        self.max_age = max_age
+        # Estimated size of the cache, None until the first prune
+        self._size: Optional[int] = None
+        self._next_prune = 0.0
+        self._size_lock = threading.Lock()
+        self._prune_lock = threading.Lock()
+    
+    def _paths(self, key: str):
+        """Metadata and body paths for a cache key"""
+        base = os.path.join(self.directory, key[:2], key)
+        return f"{base}.json", f"{base}.body"
+    
+    def _load(self, key: str, stream: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        Read an entry, or None if it is missing or unreadable
+        
+        The body is read into memory, or for streamed requests opened as a
+        file to be read from.
+        """
+        meta_path, body_path = self._paths(key)
+        try:
+            with open(meta_path, encoding="utf-8") as f:
+                entry = json.load(f)
+            if stream:
+                entry["body_file"] = _CachedBody(open(body_path, "rb"))
+            else:
+                with open(body_path, "rb") as f:
+                    entry["body"] = f.read()
+        except (OSError, ValueError):
+            return None
+        try:
+            # Mark the entry used, so pruning deletes the least recently
+            # used entries first
+            os.utime(meta_path)
+        except OSError:
+            pass
+        return entry
+    
+    def _store(self, key: str, response: requests.Response) -> None:
+        """Write a response to the cache"""
+        _, body_path = self._paths(key)
+        os.makedirs(os.path.dirname(body_path), exist_ok=True)
+        suffix = f".{os.getpid()}.{id(response)}.tmp"
+        if response.raw is not None and not response._content_consumed:
+            # Streamed: cache the body as the caller reads it
+            response.raw = _CachingStream(response.raw, body_path + suffix,
+                                          lambda: self._commit(key, response, suffix))
+            return
+        with open(body_path + suffix, "wb") as f:
+            f.write(response.content)
+        self._commit(key, response, suffix)
+    
+    def _commit(self, key: str, response: requests.Response, suffix: str) -> None:
+        """Write an entry's metadata and move it and its temporary body into place"""
+        meta_path, body_path = self._paths(key)
+        entry = {
+            "url": response.url,
+            "status_code": response.status_code,
+            "reason": response.reason,
+            "encoding": response.encoding,
+            "headers": dict(response.headers),
+            "stored_at": time.time(),
+        }
+        with open(meta_path + suffix, "w", encoding="utf-8") as f:
+            json.dump(entry, f)
+        # Body first, so metadata never points at a missing or stale body
+        os.replace(body_path + suffix, body_path)
+        os.replace(meta_path + suffix, meta_path)
+        try:
+            size = os.path.getsize(body_path) + os.path.getsize(meta_path)
+        except OSError:
+            size = 0
+        self._note_stored(size)
+    
+    def _note_stored(self, size: int) -> None:
+        """Count a newly stored entry, pruning when the cache may be over its limits"""
+        if not self.max_size and not self.max_age:
+            return
+        with self._size_lock:
+            if self._size is not None and time.monotonic() < self._next_prune:
+                self._size += size
+                if not self.max_size or self._size <= self.max_size:
+                    return
+        # Another thread pruning already takes this entry into account
+        if self._prune_lock.acquire(blocking=False):
+            try:
+                self.prune()
+            finally:
+                self._prune_lock.release()
+    
+    def prune(self) -> int:
+        """
+        Delete expired entries, then least recently used ones over the size limit
+        
+        Entries are ordered by the modification time of their metadata,
+        which is updated whenever an entry is stored, revalidated or served.
+        
+        Returns:
+            Number of entries deleted
+        """
+        now = time.time()
+        entries = []
+        total = 0
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                if name.endswith(".tmp"):
+                    if now - stat.st_mtime > STALE_TMP_SECONDS:
+                        _remove(path)
+                    continue
+                total += stat.st_size
+                if name.endswith(".json"):
+                    entries.append((stat.st_mtime, path))
+        
+        entries.sort()
+        removed = 0
+        target = self.max_size * PRUNE_TARGET
+        for used_at, meta_path in entries:
+            expired = bool(self.max_age) and now - used_at > self.max_age
+            if not expired and (not self.max_size or total <= target):
+                break
+            body_path = meta_path[:-len(".json")] + ".body"
+            for path in (meta_path, body_path):
+                try:
+                    total -= os.path.getsize(path)
+                except OSError:
+                    pass
+            # Metadata first, so a reader never finds it without its body
+            _remove(meta_path)
+            _remove(body_path)
+            removed += 1
+        
+        with self._size_lock:
+            self._size = total
+            self._next_prune = time.monotonic() + PRUNE_INTERVAL
+        return removed
+    
+    def _touch(self, key: str, entry: Dict[str, Any], response: requests.Response) -> None:
+        """Refresh an entry's headers and timestamp after a 304"""
+        meta_path, _ = self._paths(key)
+        headers = CaseInsensitiveDict(entry["headers"])
+        headers.update(response.headers)
+        entry = {k: v for k, v in entry.items() if k not in ("body", "body_file")}
+        entry["headers"] = dict(headers)
+        entry["stored_at"] = time.time()
+        tmp_path = f"{meta_path}.{os.getpid()}.{id(response)}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(entry, f)
+        os.replace(tmp_path, meta_path)
+    
+    @staticmethod
+    def _to_response(entry: Dict[str, Any], request: requests.PreparedRequest) -> requests.Response:
+        """Rebuild a requests Response from a cache entry"""
+        response = requests.Response()
+        response.status_code = entry["status_code"]
+        response.reason = entry.get("reason")
+        response.encoding = entry.get("encoding")
+        response.headers = CaseInsensitiveDict(entry["headers"])
+        response.url = entry["url"]
+        response.request = request
+        if "body_file" in entry:
+            # Streamed requests read the body from disk as they go
+            response.raw = entry["body_file"]
+        else:
+            response._content = entry["body"]
+            response._content_consumed = True
+        response.from_cache = True
+        return response
+    
+    @staticmethod
+    def cache_key(request: requests.PreparedRequest) -> str:
+        """Cache key for a prepared request"""
+        body = request.body or b""
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        digest = hashlib.sha256(f"{request.method} {request.url}\n".encode("utf-8"))
+        for name in KEY_HEADERS:
+            digest.update(f"{name}: {request.headers.get(name, '')}\n".encode("utf-8"))
+        digest.update(body)
+        return digest.hexdigest()
+    
+    def request(self, send: Callable[..., requests.Response], method: str, url: str,
+                **kwargs: Any) -> requests.Response:
+        """
+        Send a request through the cache
+        
+        Args:
+            send: Function that performs the request over the network, with
+                the same signature as HttpClient.request
+            method: HTTP method
+            url: Request URL
+            **kwargs: Arguments passed through to requests
+            
+        Returns:
+            HTTP response; responses served from disk have from_cache set
+        """
+        method = method.upper()
+        if method not in CACHEABLE_METHODS:
+            return send(method, url, **kwargs)
+        
+        prepared = requests.Request(
+            method, url, params=kwargs.get("params"), data=kwargs.get("data"), json=kwargs.get("json"),
+            headers=kwargs.get("headers"),
+        ).prepare()
+        key = self.cache_key(prepared)
+        entry = None if self.mode == "refresh" else self._load(key, stream=bool(kwargs.get("stream")))
+        
+        if entry is not None:
+            if self.mode in ("offline", "prefer-cache"):
+                return self._to_response(entry, prepared)
+            age = time.time() - entry["stored_at"]
+            if age < freshness_lifetime(entry["headers"]):
+                return self._to_response(entry, prepared)
+        elif self.mode == "offline":
+            raise CacheMissError(f"No cached response for {method} {prepared.url}")
+        
+        # Revalidate a stale entry with its validators
+        headers = dict(kwargs.pop("headers", None) or {})
+        if entry is not None:
+            cached_headers = CaseInsensitiveDict(entry["headers"])
+            if cached_headers.get("ETag"):
+                headers["If-None-Match"] = cached_headers["ETag"]
+            if cached_headers.get("Last-Modified"):
+                headers["If-Modified-Since"] = cached_headers["Last-Modified"]
+        
+        try:
+            response = send(method, url, headers=headers, **kwargs)
+        except requests.RequestException:
+            if entry is not None and "body_file" in entry:
+                entry["body_file"].close()
+            raise
+        if response.status_code == 304 and entry is not None:
+            self._touch(key, entry, response)
+            response.close()
+            return self._to_response(entry, prepared)
+        if entry is not None and "body_file" in entry:
+            entry["body_file"].close()
+        
+        response.from_cache = False
+        directives = _parse_cache_control(response.headers.get("Cache-Control", ""))
+        if response.status_code == 200 and "no-store" not in directives:
+            self._store(key, response)
+        return response
\ No newline at end of file
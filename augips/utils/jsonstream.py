@@ -0,0 +1,123 @@
+"""
+Incremental JSON reading for Augips framework
+"""
+
+import codecs
+import json
+import re
+from typing import Any, Dict, Iterable, Iterator
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+# Characters that can continue a number cut off at the end of the buffer
+_NUMBER_CHARS = frozenset("0123456789.eE+-")
+
+
+class JsonArrayReader:
+    """
+    Yields the items of one array in a JSON object while the text arrives
+    
+    Only the item being decoded and the unread part of the current chunk are
+    held in memory, so a response with hundreds of thousands of items is
+    read in constant memory. Each item is decoded with the json module's C
+    scanner. The object's other members, before or after the array, are
+    decoded whole and available in fields once iteration has finished.
+    """
+    
+    def __init__(self, chunks: Iterable[bytes], key: str):
+        """
+        Args:
+            chunks: UTF-8 encoded JSON text in pieces, e.g. from iter_content()
+            key: Name of the top-level member holding the array
+        """
+        self.key = key
+        self.fields: Dict[str, Any] = {}
+        self._chunks = iter(chunks)
+        self._text = codecs.getincrementaldecoder("utf-8")()
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+    
+    def _fill(self) -> bool:
+        """Append the next chunk to the unread text; False at the end of the input"""
+        if self._eof:
+            return False
+        chunk = next(self._chunks, None)
+        if chunk is None:
+            self._eof = True
+            text = self._text.decode(b"", final=True)
+        else:
+            text = self._text.decode(chunk)
+        self._buffer = self._buffer[self._pos:] + text
+        self._pos = 0
+        return chunk is not None
+    
+    def _peek(self) -> str:
+        """Next non-whitespace character, or "" at the end of the input"""
+        while True:
+            self._pos = _WHITESPACE.match(self._buffer, self._pos).end()
+            if self._pos < len(self._buffer) or not self._fill():
+                return self._buffer[self._pos:self._pos + 1]
+    
+    def _expect(self, chars: str) -> str:
+        """Consume the next character, which must be one of chars"""
+        char = self._peek()
+        if not char or char not in chars:
+            expected = " or ".join(f"'{c}'" for c in chars)
+            raise json.JSONDecodeError(f"Expecting {expected}", self._buffer, self._pos)
+        self._pos += 1
+        return char
+    
+    def _value(self) -> Any:
+        """Decode the next complete value, reading more text until it is"""
+        self._peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue
+                raise
+            # A number at the end of the text read so far may not be complete
+            at_edge = end == len(self._buffer) or (
+                isinstance(value, (int, float)) and self._buffer[end] in _NUMBER_CHARS
+            )
+            if at_edge and self._fill():
+                continue
+            self._pos = end
+            return value
+    
+    def __iter__(self) -> Iterator[Any]:
+        self._expect("{")
+        if self._peek() == "}":
+            self._pos += 1
+        else:
+            while True:
+                name = self._value()
+                if not isinstance(name, str):
+                    raise json.JSONDecodeError("Expecting property name", self._buffer, self._pos)
+                self._expect(":")
+                if name == self.key and self._peek() == "[":
+                    self._pos += 1
+                    if self._peek() == "]":
+                        self._pos += 1
+                    else:
+                        while True:
+                            yield self._value()
+                            if self._expect(",]") == "]":
+                                break
+                else:
+                    self.fields[name] = self._value()
+                if self._expect(",}") == "}":
+                    break
+        # Read to the end, so sources that act on a complete read (such as
+        # the HTTP cache) see one
+        if self._peek():
+            raise json.JSONDecodeError("Extra data", self._buffer, self._pos)
+    
+    def close(self) -> None:
+        """Stop reading, closing the chunk source if it is a generator"""
+        close = getattr(self._chunks, "close", None)
+        if close is not None:
+            close()
\ No newline at end of file
@@ -0,0 +1,109 @@
+"""
+Logging setup for Augips framework
+"""
+
+import atexit
+import logging
+import logging.handlers
+import queue
+import sys
+from typing import Optional
+
+# Parent of every Augips logger; scrapers log to augips.scrapers.<name>
+ROOT_LOGGER = "augips"
+
+LOG_FORMAT = "%(asctime)s [%(levelname)s] %(name)s: %(message)s"
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_atexit_registered = False
+
+
+def get_logger(name: Optional[str] = None) -> logging.Logger:
+    """
+    Get a logger in the augips namespace
+    
+    Args:
+        name: Dotted name below "augips", e.g. "scrapers.autozone", or a
+            module __name__ already starting with "augips"
+            
+    Returns:
+        Logger whose records go through the handlers set up by configure_logging()
+    """
+    if not name or name == ROOT_LOGGER or name.startswith(f"{ROOT_LOGGER}."):
+        return logging.getLogger(name or ROOT_LOGGER)
+    return logging.getLogger(f"{ROOT_LOGGER}.{name}")
+
+
+class _MessageFormatter(logging.Formatter):
+    """
+    Formats the message on the logging thread before it is queued
+    
+    Unless tracebacks are enabled, exceptions are shortened to their type
+    and message on the same line.
+    """
+    
+    def __init__(self, tracebacks: bool = False):
+        super().__init__("%(message)s")
+        self.tracebacks = tracebacks
+    
+    def format(self, record: logging.LogRecord) -> str:
+        if self.tracebacks or not record.exc_info:
+            return super().format(record)
+        error = record.exc_info[1]
+        return f"{record.getMessage()}: {type(error).__name__}: {error}"
+
+
+def configure_logging(debug: bool = False, log_file: Optional[str] = None) -> logging.Logger:
+    """
+    Send augips log records through a queue to a background writer thread
+    
+    Logging calls only format the message and put it on a queue, so slow
+    terminals or disks never stall scraper threads or the event loop. Calling
+    this again replaces the previous configuration.
+    
+    Args:
+        debug: Log DEBUG records and full tracebacks; otherwise INFO and
+            above, with exceptions shortened to one line
+        log_file: Optional file that receives the same records as stderr
+        
+    Returns:
+        The root augips logger
+    """
+    global _listener, _atexit_registered
+    
+    shutdown_logging()
+    logger = logging.getLogger(ROOT_LOGGER)
+    for handler in list(logger.handlers):
+        if isinstance(handler, logging.handlers.QueueHandler):
+            logger.removeHandler(handler)
+    
+    log_queue = queue.SimpleQueue()
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.setFormatter(_MessageFormatter(tracebacks=debug))
+    logger.addHandler(queue_handler)
+    logger.setLevel(logging.DEBUG if debug else logging.INFO)
+    logger.propagate = False
+    
+    outputs = [logging.StreamHandler(sys.stderr)]
+    if log_file:
+        outputs.append(logging.FileHandler(log_file, encoding="utf-8"))
+    for output in outputs:
+        output.setFormatter(logging.Formatter(LOG_FORMAT, datefmt="%H:%M:%S"))
+    
+    _listener = logging.handlers.QueueListener(log_queue, *outputs)
+    _listener.start()
+    if not _atexit_registered:
+        atexit.register(shutdown_logging)
+        _atexit_registered = True
+    return logger
+
+
+def shutdown_logging() -> None:
+    """Write out queued records and stop the background writer thread"""
+    global _listener
+    
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
\ No newline at end of file
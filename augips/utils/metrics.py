@@ -0,0 +1,221 @@
+"""
+Per-run scraper metrics for Augips framework
+"""
+
+import contextvars
+import json
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, Iterator, Optional
+
+# Default directory for exported metrics
+DEFAULT_METRICS_DIR = "data/metrics"
+
+# Stages timed by the framework, in pipeline order
+STAGES = ["fetch", "browser_wait", "parse", "geocode", "write"]
+
+_current: contextvars.ContextVar[Optional["RunMetrics"]] = contextvars.ContextVar("augips_metrics", default=None)
+
+
+class RunMetrics:
+    """
+    Wall time, counts and sizes collected during one scraper run
+    
+    Stages accumulate total seconds and number of calls; counters hold
+    everything else (http_requests, http_bytes, http_cache_hits, records,
+    ...). Updates are thread-safe, so lookups running in worker threads can
+    report into the same run.
+    """
+    
+    def __init__(self, scraper: str):
+        """
+        Args:
+            scraper: Company name of the scraper being measured
+        """
+        self.scraper = scraper
+        self.started_at = time.time()
+        self.finished_at: Optional[float] = None
+        self.stages: Dict[str, Dict[str, float]] = {}
+        self.counters: Dict[str, float] = {}
+        self._lock = threading.Lock()
+    
+    def increment(self, name: str, value: float = 1) -> None:
+        """Add to a counter"""
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+    
+    def add_time(self, stage: str, seconds: float, calls: int = 1) -> None:
+        """Record calls of a stage that took the given wall time in total"""
+        with self._lock:
+            totals = self.stages.setdefault(stage, {"seconds": 0.0, "calls": 0})
+            totals["seconds"] += seconds
+            totals["calls"] += calls
+    
+    @contextmanager
+    def timer(self, stage: str) -> Iterator[None]:
+        """Time the enclosed block as one call of a stage"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(stage, time.perf_counter() - start)
+    
+    def finish(self) -> None:
+        """Mark the end of the run"""
+        self.finished_at = time.time()
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Snapshot of the metrics
+        
+        Returns:
+            JSON-serializable dictionary
+        """
+        finished_at = self.finished_at or time.time()
+        with self._lock:
+            return {
+                "scraper": self.scraper,
+                "started_at": datetime.fromtimestamp(self.started_at).isoformat(timespec="seconds"),
+                "duration_seconds": round(finished_at - self.started_at, 6),
+                "stages": {
+                    stage: {"seconds": round(totals["seconds"], 6), "calls": totals["calls"]}
+                    for stage, totals in self.stages.items()
+                },
+                "counters": dict(self.counters),
+            }
+    
+    def to_prometheus(self) -> str:
+        """
+        Render the metrics in the Prometheus text exposition format
+        
+        Returns:
+            Text suitable for the node_exporter textfile collector
+        """
+        snapshot = self.to_dict()
+        label = f'scraper="{_escape_label(self.scraper)}"'
+        lines = [
+            "# HELP augips_run_duration_seconds Wall time of the scraper run",
+            "# TYPE augips_run_duration_seconds gauge",
+            f"augips_run_duration_seconds{{{label}}} {snapshot['duration_seconds']}",
+            "# HELP augips_run_timestamp_seconds Start time of the scraper run",
+            "# TYPE augips_run_timestamp_seconds gauge",
+            f"augips_run_timestamp_seconds{{{label}}} {self.started_at:.3f}",
+        ]
+        if snapshot["stages"]:
+            lines += [
+                "# HELP augips_stage_seconds_total Wall time spent in each stage",
+                "# TYPE augips_stage_seconds_total counter",
+            ]
+            lines += [
+                f'augips_stage_seconds_total{{{label},stage="{stage}"}} {totals["seconds"]:.6f}'
+                for stage, totals in snapshot["stages"].items()
+            ]
+            lines += [
+                "# HELP augips_stage_calls_total Number of times each stage ran",
+                "# TYPE augips_stage_calls_total counter",
+            ]
+            lines += [
+                f'augips_stage_calls_total{{{label},stage="{stage}"}} {totals["calls"]}'
+                for stage, totals in snapshot["stages"].items()
+            ]
+        for name, value in sorted(snapshot["counters"].items()):
+            metric = f"augips_{_metric_name(name)}_total"
+            lines += [f"# TYPE {metric} counter", f"{metric}{{{label}}} {value:g}"]
+        return "\n".join(lines) + "\n"
+    
+    def export(self, directory: Optional[str] = None) -> str:
+        """
+        Write the metrics as JSON and Prometheus text files
+        
+        Each run's JSON goes to <directory>/<company>/<timestamp>.json. The
+        Prometheus file <directory>/<company>.prom holds the latest run only
+        and is replaced atomically, so the node_exporter textfile collector
+        never reads a partial file or a growing set of stale series.
+        
+        Args:
+            directory: Metrics directory, defaults to AUGIPS_METRICS_DIR or data/metrics
+            
+        Returns:
+            Path of the JSON file, without its extension
+        """
+        directory = directory or os.getenv("AUGIPS_METRICS_DIR", DEFAULT_METRICS_DIR)
+        slug = self.scraper.lower().replace(" ", "_")
+        stamp = datetime.fromtimestamp(self.started_at).strftime("%Y%m%dT%H%M%S")
+        base = os.path.join(directory, slug, stamp)
+        os.makedirs(os.path.dirname(base), exist_ok=True)
+        with open(f"{base}.json", "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=2)
+        prom_path = os.path.join(directory, f"{slug}.prom")
+        # The collector only reads *.prom files, so it skips the temporary one
+        tmp_path = f"{prom_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(self.to_prometheus())
+        os.replace(tmp_path, prom_path)
+        return base
+    
+    def summary(self) -> str:
+        """One-line summary of stage times and the main counters"""
+        with self._lock:
+            parts = [
+                f"{stage} {self.stages[stage]['seconds']:.2f}s"
+                for stage in STAGES + sorted(set(self.stages) - set(STAGES))
+                if stage in self.stages
+            ]
+            requests = int(self.counters.get("http_requests", 0))
+            if requests:
+                hits = int(self.counters.get("http_cache_hits", 0))
+                parts.append(f"{requests} requests ({hits} cached, {self.counters.get('http_bytes', 0) / 1e6:.1f} MB)")
+        return ", ".join(parts) or "no stages recorded"
+
+
+def _escape_label(value: str) -> str:
+    """Escape a Prometheus label value"""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _metric_name(name: str) -> str:
+    """Turn a counter name into a valid Prometheus metric name"""
+    return re.sub(r"[^a-zA-Z0-9_]", "_", name)
+
+
+def current_metrics() -> Optional[RunMetrics]:
+    """Metrics of the scraper run in the current thread or task, if any"""
+    return _current.get()
+
+
+@contextmanager
+def collect_metrics(metrics: RunMetrics) -> Iterator[RunMetrics]:
+    """
+    Attribute stages and counters recorded in the enclosed block to a run
+    
+    The run is tracked in a context variable, so it follows the code into
+    asyncio tasks and asyncio.to_thread() workers, and concurrent scrapers
+    on other threads or tasks keep their own metrics.
+    """
+    token = _current.set(metrics)
+    try:
+        yield metrics
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def timer(stage: str) -> Iterator[None]:
+    """Time the enclosed block as a stage of the current run, if there is one"""
+    metrics = _current.get()
+    if metrics is None:
+        yield
+        return
+    with metrics.timer(stage):
+        yield
+
+
+def increment(name: str, value: float = 1) -> None:
+    """Add to a counter of the current run, if there is one"""
+    metrics = _current.get()
+    if metrics is not None:
+        metrics.increment(name, value)
\ No newline at end of file
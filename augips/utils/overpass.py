@@ -0,0 +1,406 @@
+"""
+Tiled Overpass API queries for Augips framework
+"""
+
+import contextvars
+import queue
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+import requests
+
+from .geoqueue import RateLimiter
+from .http import HttpClient, get_http_client, stream_json
+from .log import get_logger
+from .metrics import increment
+
+logger = get_logger(__name__)
+
+DEFAULT_ENDPOINT = "https://overpass-api.de/api/interpreter"
+
+# Bounding boxes are (south, west, north, east), the order Overpass uses
+BBox = Tuple[float, float, float, float]
+
+# Named regions and the country their postal codes belong to
+REGIONS: Dict[str, Tuple[BBox, Optional[str]]] = {
+    "berlin": ((52.3383, 13.0884, 52.6755, 13.7611), "DE"),
+    "germany": ((47.27, 5.87, 55.06, 15.04), "DE"),
+    "france": ((41.33, -5.14, 51.09, 9.56), "FR"),
+    "uk": ((49.96, -8.65, 60.86, 1.77), "GB"),
+    "europe": ((34.5, -25.0, 71.2, 45.0), None),
+    "usa": ((24.4, -125.0, 49.4, -66.9), "US"),
+}
+
+# Edge length in degrees of the tiles a region is first split into
+DEFAULT_TILE_DEGREES = 1.0
+
+# Elements per tile; a tile with more is split instead of downloaded whole
+DEFAULT_MAX_ELEMENTS = 20000
+
+# Server-side query timeout in seconds
+DEFAULT_QUERY_TIMEOUT = 120
+
+# Concurrent queries per endpoint; public instances allow two per client
+DEFAULT_SLOTS = 2
+
+# Queries per second per endpoint
+DEFAULT_RATE_LIMIT = 1.0
+
+# Times a tile is halved in each direction before it is given up on
+DEFAULT_MAX_DEPTH = 6
+
+# Retries of a tile after the server says it is busy (429/503)
+DEFAULT_RETRIES = 3
+
+# Elements passed from a tile's thread to fetch() at a time, and chunks
+# that may wait to be read before tile threads pause
+RESULT_CHUNK_SIZE = 500
+RESULT_QUEUE_SIZE = 16
+
+
+class TileTooLarge(Exception):
+    """A tile timed out or has more elements than one response may carry"""
+
+
+def parse_region(region: str) -> Tuple[BBox, Optional[str]]:
+    """
+    Resolve a region name or "south,west,north,east" bounding box
+    
+    Args:
+        region: Key of REGIONS, or four comma-separated coordinates
+        
+    Returns:
+        Tuple of (bounding box, country code or None)
+    """
+    if region.lower() in REGIONS:
+        return REGIONS[region.lower()]
+    try:
+        south, west, north, east = (float(part) for part in region.split(","))
+    except ValueError:
+        raise ValueError(f"Unknown region '{region}'. Use one of {', '.join(REGIONS)} "
+                         f"or 'south,west,north,east'") from None
+    if south >= north or west >= east:
+        raise ValueError(f"Empty bounding box '{region}'")
+    return (south, west, north, east), None
+
+
+def parse_tags(spec: str) -> Dict[str, Optional[str]]:
+    """
+    Parse a tag filter like "amenity=fuel,brand"
+    
+    Args:
+        spec: Comma-separated key=value pairs; a bare key matches any value
+        
+    Returns:
+        Dictionary mapping tag keys to a value, or None for any value
+    """
+    tags: Dict[str, Optional[str]] = {}
+    for part in spec.split(","):
+        key, sep, value = part.strip().partition("=")
+        if key:
+            tags[key.strip()] = value.strip() if sep else None
+    return tags
+
+
+def _quote(value: str) -> str:
+    """Quote a string for Overpass QL"""
+    return '"' + value.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+def build_query(tags: Dict[str, Optional[str]], bbox: BBox, limit: int,
+                timeout: int = DEFAULT_QUERY_TIMEOUT) -> str:
+    """
+    Overpass QL for the nodes, ways and relations matching tags in a box
+    
+    Ways and relations are returned with their center point. At most limit
+    elements are returned, so a response can't grow beyond what the caller
+    asked for.
+    
+    Args:
+        tags: Tag filter from parse_tags()
+        bbox: Bounding box to search
+        limit: Maximum number of elements in the response
+        timeout: Server-side timeout in seconds
+        
+    Returns:
+        Query text
+    """
+    filters = "".join(
+        f"[{_quote(key)}]" if value is None else f"[{_quote(key)}={_quote(value)}]"
+        for key, value in tags.items()
+    )
+    south, west, north, east = bbox
+    return (f"[out:json][timeout:{timeout}];"
+            f"nwr{filters}({south:.6f},{west:.6f},{north:.6f},{east:.6f});"
+            f"out center {limit};")
+
+
+def plan_tiles(bbox: BBox, tile_degrees: float = DEFAULT_TILE_DEGREES) -> List[BBox]:
+    """
+    Split a bounding box into a grid of tiles
+    
+    Args:
+        bbox: Region to cover
+        tile_degrees: Maximum tile edge length in degrees
+        
+    Returns:
+        Tiles covering the region, row by row from the south-west
+    """
+    south, west, north, east = bbox
+    rows = max(1, int(-(-(north - south) // tile_degrees)))
+    columns = max(1, int(-(-(east - west) // tile_degrees)))
+    height, width = (north - south) / rows, (east - west) / columns
+    return [
+        (south + row * height, west + column * width,
+         north if row == rows - 1 else south + (row + 1) * height,
+         east if column == columns - 1 else west + (column + 1) * width)
+        for row in range(rows)
+        for column in range(columns)
+    ]
+
+
+def split_tile(bbox: BBox) -> List[BBox]:
+    """Split a tile into four quadrants"""
+    south, west, north, east = bbox
+    middle_lat, middle_lon = (south + north) / 2, (west + east) / 2
+    return [
+        (south, west, middle_lat, middle_lon),
+        (south, middle_lon, middle_lat, east),
+        (middle_lat, west, north, middle_lon),
+        (middle_lat, middle_lon, north, east),
+    ]
+
+
+_limiters: Dict[str, RateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def _endpoint_limiter(endpoint: str, rate: float) -> RateLimiter:
+    """
+    Rate limiter shared by every query to an endpoint in this process, at
+    the latest rate asked for; a rate of 0 or less means no limit
+    """
+    interval = 1.0 / rate if rate > 0 else 0.0
+    with _limiters_lock:
+        limiter = _limiters.get(endpoint)
+        if limiter is None:
+            limiter = _limiters[endpoint] = RateLimiter(1.0)
+        limiter.interval = interval
+        return limiter
+
+
+class OverpassEngine:
+    """
+    Runs a tag query over a large region as many small Overpass queries
+    
+    The region is split into tiles, which are queried concurrently across
+    the configured endpoints: each endpoint has a fixed number of query
+    slots and a rate limit shared by every engine in the process. A tile
+    that times out, runs the server out of memory or has more than
+    max_elements matches is split into quadrants, which are queued in its
+    place. Responses are decoded as they stream in. Elements on tile edges
+    come back from both neighbours and are yielded once.
+    """
+    
+    def __init__(self, http_client: Optional[HttpClient] = None, endpoints: Sequence[str] = (DEFAULT_ENDPOINT,),
+                 tile_degrees: float = DEFAULT_TILE_DEGREES, max_elements: int = DEFAULT_MAX_ELEMENTS,
+                 slots: int = DEFAULT_SLOTS, rate_limit: float = DEFAULT_RATE_LIMIT,
+                 query_timeout: int = DEFAULT_QUERY_TIMEOUT, max_depth: int = DEFAULT_MAX_DEPTH,
+                 retries: int = DEFAULT_RETRIES, headers: Optional[Dict[str, str]] = None):
+        """
+        Args:
+            http_client: Client to send queries with, defaults to the shared one
+            endpoints: Overpass interpreter URLs to spread tiles across
+            tile_degrees: Edge length in degrees of the initial tiles
+            max_elements: Largest number of elements one tile may return
+            slots: Concurrent queries per endpoint
+            rate_limit: Queries per second per endpoint, 0 for no limit
+            query_timeout: Server-side timeout of each query in seconds
+            max_depth: Times a tile may be split before it is given up on
+            retries: Retries of a tile when the endpoint is busy
+            headers: Extra request headers
+        """
+        self.http = http_client or get_http_client()
+        self.endpoints = list(endpoints)
+        self.tile_degrees = tile_degrees
+        self.max_elements = max_elements
+        self.slots = slots
+        self.rate_limit = rate_limit
+        self.query_timeout = query_timeout
+        self.max_depth = max_depth
+        self.retries = retries
+        self.headers = headers
+        self.failed_tiles: List[BBox] = []
+    
+    def query_tile(self, endpoint: str, tags: Dict[str, Optional[str]], bbox: BBox) -> Iterator[Dict[str, Any]]:
+        """
+        Query one tile, streaming its elements from the response
+        
+        Elements are yielded as they are decoded, so a tile that turns out
+        to be too large may already have yielded some of them.
+        
+        Args:
+            endpoint: Overpass interpreter URL
+            tags: Tag filter
+            bbox: Tile to query
+            
+        Yields:
+            Elements in the tile
+            
+        Raises:
+            TileTooLarge: The tile must be split, including when the
+                response times out or breaks off while streaming
+            requests.RequestException: The query failed for another reason
+        """
+        # One more than allowed, to tell a full tile from a truncated one
+        query = build_query(tags, bbox, self.max_elements + 1, self.query_timeout)
+        limiter = _endpoint_limiter(endpoint, self.rate_limit)
+        attempt = 0
+        while True:
+            limiter.wait()
+            try:
+                # Give the server its full timeout before giving up on it
+                response = self.http.post(endpoint, data={"data": query}, headers=self.headers,
+                                          timeout=self.query_timeout + 30, stream=True)
+            except requests.Timeout as e:
+                raise TileTooLarge("request timed out") from e
+            if response.status_code in (429, 503) and attempt < self.retries:
+                response.close()
+                increment("overpass_retries")
+                time.sleep(5 * 2 ** attempt)
+                attempt += 1
+                continue
+            break
+        
+        if response.status_code == 504:
+            response.close()
+            raise TileTooLarge("gateway timeout")
+        if response.status_code >= 400:
+            response.close()
+            response.raise_for_status()
+        
+        reader = stream_json(response, "elements")
+        try:
+            for count, element in enumerate(reader, 1):
+                if count > self.max_elements:
+                    raise TileTooLarge(f"more than {self.max_elements} elements")
+                yield element
+        except (requests.ConnectionError, requests.exceptions.ChunkedEncodingError) as e:
+            # A read timeout or dropped connection while the body streams in
+            # is the server giving up on a slow query, like a 504
+            raise TileTooLarge("response stopped mid-stream") from e
+        finally:
+            reader.close()
+        # Overpass reports errors in a remark after the elements
+        remark = reader.fields.get("remark") or ""
+        if "timed out" in remark or "out of memory" in remark:
+            raise TileTooLarge(remark)
+    
+    def _run_tile(self, slots: "queue.Queue[str]", tags: Dict[str, Optional[str]], tile: BBox, depth: int,
+                  results: "queue.Queue[tuple]", stop: threading.Event) -> None:
+        """Query a tile on a free endpoint slot, passing its elements to fetch() in chunks"""
+        
+        def put(message: tuple) -> bool:
+            # Wait for fetch() to catch up, unless it has stopped reading
+            while not stop.is_set():
+                try:
+                    results.put(message, timeout=0.1)
+                    return True
+                except queue.Full:
+                    pass
+            return False
+        
+        endpoint = slots.get()
+        elements = self.query_tile(endpoint, tags, tile)
+        chunk = []
+        error = None
+        try:
+            for element in elements:
+                chunk.append(element)
+                if len(chunk) == RESULT_CHUNK_SIZE:
+                    if not put(("elements", chunk)):
+                        return
+                    chunk = []
+        except Exception as e:
+            error = e
+        finally:
+            elements.close()
+            slots.put(endpoint)
+        if put(("elements", chunk)):
+            put(("done", tile, depth, error))
+    
+    def fetch(self, tags: Dict[str, Optional[str]], bbox: BBox) -> Iterator[Dict[str, Any]]:
+        """
+        Query every element matching tags in a region
+        
+        Tiles stream their elements here through a bounded queue, so memory
+        use doesn't grow with the size of the region beyond the set of ids
+        already seen. Each element is yielded at most once. Tiles that fail,
+        or are still too large at max_depth, are skipped and recorded in
+        failed_tiles; elements they returned before failing are kept.
+        
+        Args:
+            tags: Tag filter from parse_tags()
+            bbox: Region to cover
+            
+        Yields:
+            Overpass elements (nodes, and ways and relations with a center)
+        """
+        self.failed_tiles = []
+        slots: "queue.Queue[str]" = queue.Queue()
+        for _ in range(self.slots):
+            for endpoint in self.endpoints:
+                slots.put(endpoint)
+        results: "queue.Queue[tuple]" = queue.Queue(maxsize=RESULT_QUEUE_SIZE)
+        stop = threading.Event()
+        executor = ThreadPoolExecutor(max_workers=self.slots * len(self.endpoints),
+                                      thread_name_prefix="augips-overpass")
+        running = 0
+        
+        def submit(tile: BBox, depth: int) -> None:
+            nonlocal running
+            # Each task gets its own copy of the context, so the tiles report
+            # to the current run's metrics
+            executor.submit(contextvars.copy_context().run, self._run_tile, slots, tags, tile, depth, results, stop)
+            running += 1
+        
+        # Ids are only unique per element type; bare ints take half the
+        # memory of (type, id) keys
+        seen: Dict[Any, Set[int]] = defaultdict(set)
+        try:
+            tiles = plan_tiles(bbox, self.tile_degrees)
+            logger.debug("Querying %s tiles on %s endpoints", len(tiles), len(self.endpoints))
+            for tile in tiles:
+                submit(tile, 0)
+            
+            while running:
+                message = results.get()
+                if message[0] == "elements":
+                    for element in message[1]:
+                        ids = seen[element.get("type")]
+                        if element.get("id") not in ids:
+                            ids.add(element.get("id"))
+                            yield element
+                    continue
+                
+                _, tile, depth, error = message
+                running -= 1
+                if error is None:
+                    increment("overpass_tiles")
+                elif isinstance(error, TileTooLarge) and depth < self.max_depth:
+                    logger.debug("Splitting tile %s: %s", tile, error)
+                    increment("overpass_splits")
+                    for quadrant in split_tile(tile):
+                        submit(quadrant, depth + 1)
+                elif isinstance(error, (TileTooLarge, requests.RequestException, ValueError)):
+                    logger.warning("Failed to query tile %s", tile, exc_info=error)
+                    self.failed_tiles.append(tile)
+                else:
+                    raise error
+        finally:
+            # Let tiles still streaming give up if the caller stopped early
+            stop.set()
+            executor.shutdown(wait=True, cancel_futures=True)
\ No newline at end of file
@@ -0,0 +1,201 @@
+"""
+Offline postal code geocoding for Augips framework
+"""
+
+import gzip
+import os
+import re
+import threading
+from array import array
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Postal code centroid table bundled with the package, in GeoNames format:
+# every US ZIP code (from the MIT-licensed zipcodes 1.2.0 package) and a few
+# codes from other countries
+BUNDLED_TABLE = os.path.join(os.path.dirname(os.path.dirname(__file__)), "resources", "postal_centroids.txt.gz")
+
+# Column positions in the GeoNames postal code dump
+COUNTRY_COLUMN = 0
+POSTAL_CODE_COLUMN = 1
+LATITUDE_COLUMN = 9
+LONGITUDE_COLUMN = 10
+
+US_ZIP_PATTERN = re.compile(r"\b(\d{5})(?:-\d{4})?\s*$")
+
+
+def normalize_postal_code(postal_code: str, country: str = "US") -> str:
+    """
+    Normalize a postal code for lookup
+    
+    Args:
+        postal_code: Postal code as written on the record
+        country: ISO 3166 alpha-2 country code
+        
+    Returns:
+        Uppercase postal code without spaces or dashes; US ZIP+4 codes are
+        cut to the five digit ZIP
+    """
+    code = re.sub(r"[\s-]", "", str(postal_code).upper())
+    if country.upper() == "US":
+        code = code[:5]
+    return code
+
+
+class _CountryIndex:
+    """Sorted fixed-width postal codes for one country, with parallel coordinate arrays"""
+    
+    __slots__ = ("width", "count", "keys", "latitudes", "longitudes")
+    
+    def __init__(self, entries: Dict[str, Tuple[float, float]]):
+        encoded = sorted((code.encode("utf-8"), coords) for code, coords in entries.items())
+        self.width = max((len(code) for code, _ in encoded), default=1)
+        self.count = len(encoded)
+        # All keys in one bytes object, padded to a fixed width
+        self.keys = b"".join(code.ljust(self.width, b"\0") for code, _ in encoded)
+        self.latitudes = array("f", (coords[0] for _, coords in encoded))
+        self.longitudes = array("f", (coords[1] for _, coords in encoded))
+    
+    def find(self, code: str) -> int:
+        """Binary search for a normalized code, returning its position or -1"""
+        key = code.encode("utf-8")
+        if len(key) > self.width:
+            return -1
+        key = key.ljust(self.width, b"\0")
+        width = self.width
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.keys[mid * width:(mid + 1) * width] < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self.count and self.keys[lo * width:(lo + 1) * width] == key:
+            return lo
+        return -1
+
+
+class PostalIndex:
+    """
+    In-memory postal code centroid index
+    
+    Codes are stored per country as one packed bytes object plus float
+    arrays, so millions of entries stay compact and a lookup is a binary
+    search taking a few microseconds.
+    """
+    
+    def __init__(self, paths: Iterable[str]):
+        """
+        Args:
+            paths: GeoNames-format postal code files (tab-separated, country
+                code in column 1, postal code in column 2, latitude and
+                longitude in columns 10 and 11), optionally gzip-compressed
+                with a .gz extension
+        """
+        entries: Dict[str, Dict[str, Tuple[float, float]]] = {}
+        for path in paths:
+            opener = gzip.open if path.endswith(".gz") else open
+            with opener(path, "rt", encoding="utf-8") as f:
+                for line in f:
+                    fields = line.rstrip("\n").split("\t")
+                    if len(fields) <= LONGITUDE_COLUMN:
+                        continue
+                    try:
+                        coords = (float(fields[LATITUDE_COLUMN]), float(fields[LONGITUDE_COLUMN]))
+                    except ValueError:
+                        continue
+                    country = fields[COUNTRY_COLUMN].upper()
+                    code = normalize_postal_code(fields[POSTAL_CODE_COLUMN], country)
+                    # The first row for a code wins, so user tables override the bundled one
+                    entries.setdefault(country, {}).setdefault(code, coords)
+        
+        self._countries = {country: _CountryIndex(codes) for country, codes in entries.items()}
+    
+    def __len__(self) -> int:
+        return sum(index.count for index in self._countries.values())
+    
+    def lookup(self, postal_code: str, country: str = "US") -> Tuple[Optional[float], Optional[float]]:
+        """
+        Look up the centroid of a postal code
+        
+        Full codes are tried first, then the outward part before a space
+        (e.g. "NW10" for "NW10 0TH"), which is how some countries publish
+        their centroids.
+        
+        Args:
+            postal_code: Postal code
+            country: ISO 3166 alpha-2 country code
+            
+        Returns:
+            Tuple of (latitude, longitude) or (None, None) if unknown
+        """
+        if not postal_code:
+            return (None, None)
+        index = self._countries.get(country.upper())
+        if index is None:
+            return (None, None)
+        
+        candidates = [normalize_postal_code(postal_code, country)]
+        outward = str(postal_code).strip().split()
+        if len(outward) > 1:
+            candidates.append(normalize_postal_code(outward[0], country))
+        
+        for code in candidates:
+            position = index.find(code)
+            if position >= 0:
+                # Coordinates are stored as float32; four decimals is about 10m
+                return (round(index.latitudes[position], 4), round(index.longitudes[position], 4))
+        return (None, None)
+
+
+_index: Optional[PostalIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_postal_index() -> PostalIndex:
+    """
+    Get the shared postal index, loading it on first use
+    
+    The bundled table covers every US ZIP code. Set AUGIPS_POSTAL_TABLE to
+    one or more GeoNames postal code dumps (e.g. DE.txt or allCountries.txt
+    from download.geonames.org/export/zip/), separated by the OS path
+    separator, to cover other countries; their rows take precedence over
+    the bundled ones.
+    
+    Returns:
+        Process-wide PostalIndex instance
+    """
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                paths: List[str] = [p for p in os.getenv("AUGIPS_POSTAL_TABLE", "").split(os.pathsep) if p]
+                _index = PostalIndex(paths + [BUNDLED_TABLE])
+    return _index
+
+
+def lookup_postal_code(postal_code: str, country: str = "US") -> Tuple[Optional[float], Optional[float]]:
+    """
+    Geocode a postal code offline from the centroid table
+    
+    Args:
+        postal_code: Postal code
+        country: ISO 3166 alpha-2 country code
+        
+    Returns:
+        Tuple of (latitude, longitude) or (None, None) if unknown
+    """
+    return get_postal_index().lookup(postal_code, country)
+
+
+def extract_us_zip(address: str) -> Optional[str]:
+    """
+    Find a trailing US ZIP code in an address string
+    
+    Args:
+        address: Full address string
+        
+    Returns:
+        Five digit ZIP code, or None if the address doesn't end with one
+    """
+    match = US_ZIP_PATTERN.search(address)
+    return match.group(1) if match else None
\ No newline at end of file
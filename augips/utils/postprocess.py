@@ -0,0 +1,151 @@
+"""
+Columnar post-processing of scraped location batches for Augips framework
+"""
+
+from array import array
+from collections.abc import Mapping
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .records import LOCATION_FIELDS, TEXT_FIELDS, Location, LocationBatch
+
+
+def coordinate_views(batch: LocationBatch):
+    """
+    NumPy views of a batch's coordinate arrays
+    
+    The views share memory with the batch, so writing to them updates the
+    batch in place. Don't append to the batch while holding them.
+    
+    Args:
+        batch: Location batch
+        
+    Returns:
+        Tuple of (latitude, longitude) float64 arrays
+    """
+    if not len(batch):
+        return np.empty(0), np.empty(0)
+    return np.frombuffer(batch.latitude, dtype=np.float64), np.frombuffer(batch.longitude, dtype=np.float64)
+
+
+def parse_coordinates(values: Any) -> np.ndarray:
+    """
+    Parse a column of coordinates
+    
+    Args:
+        values: Numbers, numeric strings, empty strings or None
+        
+    Returns:
+        float64 array with NaN for missing or invalid values
+    """
+    try:
+        # Numbers, None and numeric strings convert directly
+        return np.asarray(values, dtype=np.float64)
+    except (TypeError, ValueError):
+        return pd.to_numeric(pd.Series(values, dtype=object), errors="coerce").to_numpy(dtype=np.float64)
+
+
+def build_batch(records: Sequence[Mapping]) -> LocationBatch:
+    """
+    Build a batch column by column from Location or dict records
+    
+    Coordinates are gathered raw and parsed for the whole column at once.
+    
+    Args:
+        records: Locations or dictionaries containing store location data
+        
+    Returns:
+        LocationBatch holding the records
+    """
+    batch = LocationBatch()
+    for field in TEXT_FIELDS:
+        batch.columns[field] = [record.get(field) for record in records]
+    for field in ("latitude", "longitude"):
+        values = array("d")
+        values.frombytes(parse_coordinates([record.get(field) for record in records]).tobytes())
+        setattr(batch, field, values)
+    batch.extra = [_extra_fields(record) for record in records]
+    return batch
+
+
+_STANDARD_KEYS = frozenset(LOCATION_FIELDS)
+
+
+def _extra_fields(record: Mapping) -> Optional[Dict[str, Any]]:
+    """Non-standard fields of a record, or None if it has none"""
+    if type(record) is not dict and isinstance(record, Location):
+        return dict(record.extra) if record.extra else None
+    extra_keys = record.keys() - _STANDARD_KEYS
+    return {key: record[key] for key in extra_keys} if extra_keys else None
+
+
+def invalid_coordinates(lat: np.ndarray, lng: np.ndarray) -> np.ndarray:
+    """
+    Find coordinates that are missing, out of range or at (0, 0)
+    
+    (0, 0) is what many store APIs return for an unknown location.
+    
+    Returns:
+        Boolean mask of rows without usable coordinates
+    """
+    with np.errstate(invalid="ignore"):
+        in_range = (np.abs(lat) <= 90) & (np.abs(lng) <= 180)
+    return ~in_range | ((lat == 0) & (lng == 0))
+
+
+def normalize_batch(batch: LocationBatch, company_name: Optional[str] = None,
+                    constants: Optional[Dict[str, Any]] = None) -> np.ndarray:
+    """
+    Validate coordinates and fill in constant columns for a whole batch
+    
+    Unusable coordinates are cleared to NaN in place. Empty company names
+    are set to company_name, and each field in constants is filled in
+    where empty.
+    
+    Args:
+        batch: Location batch, modified in place
+        company_name: Company name for rows without one
+        constants: Values for other standard text fields, e.g. {"state": ""}
+        
+    Returns:
+        Boolean mask of rows that still need coordinates
+    """
+    lat, lng = coordinate_views(batch)
+    missing = invalid_coordinates(lat, lng)
+    lat[missing] = np.nan
+    lng[missing] = np.nan
+    
+    fills = dict(constants or {})
+    if company_name is not None:
+        fills.setdefault("company_name", company_name)
+    for field, value in fills.items():
+        if field not in TEXT_FIELDS:
+            raise ValueError(f"Constant columns must be standard text fields, not '{field}'")
+        column = np.array(batch.columns[field], dtype=object)
+        empty = (column == None) | (column == "")  # noqa: E711 - elementwise comparison
+        if empty.any():
+            column[empty] = value
+            batch.columns[field] = column.tolist()
+    return missing
+
+
+def geocode_queries(batch: LocationBatch, rows: Sequence[int]) -> List[str]:
+    """
+    Build geocoder address strings for selected rows
+    
+    Matches Scraper.format_address: "address, city, state zip".
+    
+    Args:
+        batch: Location batch
+        rows: Row indexes
+        
+    Returns:
+        Address strings, one per row
+    """
+    frame = pd.DataFrame({
+        field: pd.Series(batch.columns[field], dtype=object).take(rows).fillna("").astype(str)
+        for field in ("address", "city", "state", "zip_code")
+    })
+    return (frame["address"] + ", " + frame["city"] + ", " + frame["state"] + " " + frame["zip_code"]).tolist()
\ No newline at end of file
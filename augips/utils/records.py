@@ -0,0 +1,296 @@
+"""
+Location record helpers for Augips framework
+"""
+
+import hashlib
+import math
+import re
+from array import array
+from collections.abc import Mapping, MutableMapping
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+# Fields that identify a store within a company
+IDENTITY_FIELDS = ["store_name", "address", "zip_code"]
+
+# Standard location fields, in output column order
+LOCATION_FIELDS = ("store_name", "address", "city", "state", "zip_code", "latitude", "longitude", "company_name")
+
+# Text fields stored as plain attributes on Location
+TEXT_FIELDS = ("store_name", "address", "city", "state", "zip_code", "company_name")
+
+COORDINATE_FIELDS = ("latitude", "longitude")
+
+
+def to_coordinate(value: Any) -> Optional[float]:
+    """
+    Parse a coordinate
+    
+    Args:
+        value: Number or numeric string
+        
+    Returns:
+        Coordinate as a float, or None if it is missing or invalid
+    """
+    if value is None or value == "":
+        return None
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    return None if math.isnan(number) else number
+
+
+class Location(MutableMapping):
+    """
+    Compact store location record
+    
+    Standard fields are slots rather than dictionary entries, and coordinates
+    are stored as floats (None when unknown), so a record takes a fraction of
+    the memory of the equivalent dict. Non-standard fields such as "phone" or
+    "country" go into a small extra dict that is only created when needed.
+    
+    Location behaves like a dict, so code written for dict records keeps
+    working: location["latitude"], location.get("city", ""), dict(location)
+    and csv.DictWriter all work. Every standard field is always present as a
+    key, with None for unknown values.
+    """
+    
+    __slots__ = LOCATION_FIELDS + ("extra",)
+    
+    def __init__(self, store_name: Optional[str] = None, address: Optional[str] = None,
+                 city: Optional[str] = None, state: Optional[str] = None, zip_code: Optional[str] = None,
+                 latitude: Any = None, longitude: Any = None, company_name: Optional[str] = None,
+                 **extra: Any):
+        self.store_name = store_name
+        self.address = address
+        self.city = city
+        self.state = state
+        self.zip_code = zip_code
+        self.latitude = to_coordinate(latitude)
+        self.longitude = to_coordinate(longitude)
+        self.company_name = company_name
+        self.extra = extra or None
+    
+    @classmethod
+    def from_record(cls, record: Mapping) -> "Location":
+        """
+        Convert a dict record, returning Location instances unchanged
+        
+        Args:
+            record: Location or dictionary containing store location data
+            
+        Returns:
+            Location instance
+        """
+        if isinstance(record, Location):
+            return record
+        return cls(**record)
+    
+    def __getitem__(self, key: str) -> Any:
+        if key in LOCATION_FIELDS:
+            return getattr(self, key)
+        if self.extra is not None and key in self.extra:
+            return self.extra[key]
+        raise KeyError(key)
+    
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key in COORDINATE_FIELDS:
+            setattr(self, key, to_coordinate(value))
+        elif key in LOCATION_FIELDS:
+            setattr(self, key, value)
+        else:
+            if self.extra is None:
+                self.extra = {}
+            self.extra[key] = value
+    
+    def __delitem__(self, key: str) -> None:
+        if key in LOCATION_FIELDS:
+            setattr(self, key, None)
+        elif self.extra is not None and key in self.extra:
+            del self.extra[key]
+        else:
+            raise KeyError(key)
+    
+    def __iter__(self) -> Iterator[str]:
+        yield from LOCATION_FIELDS
+        if self.extra:
+            yield from self.extra
+    
+    def __len__(self) -> int:
+        return len(LOCATION_FIELDS) + (len(self.extra) if self.extra else 0)
+    
+    def __contains__(self, key: object) -> bool:
+        return key in LOCATION_FIELDS or (self.extra is not None and key in self.extra)
+    
+    def __repr__(self) -> str:
+        return f"Location({dict(self)!r})"
+    
+    @property
+    def has_coordinates(self) -> bool:
+        """Whether both coordinates are known"""
+        return self.latitude is not None and self.longitude is not None
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain dictionary copy of the record"""
+        return dict(self)
+
+
+class LocationBatch:
+    """
+    Column-oriented batch of locations handed to output sinks
+    
+    Coordinates are kept in contiguous float arrays (NaN for unknown values)
+    and text fields in one list per column, instead of one object per
+    record. Iterating or indexing a batch yields Location records, so sinks
+    can treat it like a list of dicts, while columnar sinks such as Parquet
+    can use the columns directly.
+    """
+    
+    __slots__ = ("columns", "latitude", "longitude", "extra")
+    
+    def __init__(self):
+        self.columns: Dict[str, List[Optional[str]]] = {field: [] for field in TEXT_FIELDS}
+        self.latitude = array("d")
+        self.longitude = array("d")
+        self.extra: List[Optional[Dict[str, Any]]] = []
+    
+    @classmethod
+    def from_records(cls, records: Iterable[Mapping]) -> "LocationBatch":
+        """
+        Build a batch from Location or dict records
+        
+        Args:
+            records: Locations or dictionaries containing store location data
+            
+        Returns:
+            LocationBatch holding the records
+        """
+        batch = cls()
+        for record in records:
+            batch.append(record)
+        return batch
+    
+    def append(self, record: Mapping) -> None:
+        """Add a Location or dict record to the batch"""
+        location = Location.from_record(record)
+        for field, column in self.columns.items():
+            column.append(getattr(location, field))
+        self.latitude.append(math.nan if location.latitude is None else location.latitude)
+        self.longitude.append(math.nan if location.longitude is None else location.longitude)
+        self.extra.append(dict(location.extra) if location.extra else None)
+    
+    def __len__(self) -> int:
+        return len(self.latitude)
+    
+    def __bool__(self) -> bool:
+        return len(self.latitude) > 0
+    
+    def __getitem__(self, index: int) -> Location:
+        lat = self.latitude[index]
+        lng = self.longitude[index]
+        location = Location(**{field: column[index] for field, column in self.columns.items()})
+        location.latitude = None if math.isnan(lat) else lat
+        location.longitude = None if math.isnan(lng) else lng
+        extra = self.extra[index]
+        location.extra = dict(extra) if extra else None
+        return location
+    
+    def __iter__(self) -> Iterator[Location]:
+        for index in range(len(self)):
+            yield self[index]
+    
+    def column(self, field: str) -> List[Any]:
+        """
+        Values of one field across the batch
+        
+        Args:
+            field: Field name
+            
+        Returns:
+            List of values, with None for missing values
+        """
+        if field in self.columns:
+            return self.columns[field]
+        if field in COORDINATE_FIELDS:
+            values = self.latitude if field == "latitude" else self.longitude
+            return [None if math.isnan(value) else value for value in values]
+        return [extra.get(field) if extra else None for extra in self.extra]
+    
+    def fieldnames(self) -> List[str]:
+        """Standard fields followed by extra fields in order of first appearance"""
+        names = list(LOCATION_FIELDS)
+        seen = set(names)
+        for extra in self.extra:
+            if extra:
+                for key in extra:
+                    if key not in seen:
+                        seen.add(key)
+                        names.append(key)
+        return names
+
+
+def normalize_text(value: Any) -> str:
+    """
+    Normalize a field for comparisons
+    
+    Args:
+        value: Field value
+        
+    Returns:
+        Lowercase text without punctuation or repeated whitespace
+    """
+    if value is None:
+        return ""
+    text = re.sub(r"[^\w\s]", " ", str(value).lower())
+    return " ".join(text.split())
+
+
+def store_key(record: Dict[str, Any]) -> str:
+    """
+    Stable identity for a store within its company
+    
+    Uses the record's "store_id" when a scraper provides one, otherwise a
+    hash of the normalized name, street address and postal code.
+    
+    Args:
+        record: Dictionary containing store location data
+        
+    Returns:
+        Store identity string
+    """
+    store_id = record.get("store_id")
+    if store_id not in (None, ""):
+        return f"id:{store_id}"
+    identity = "|".join(normalize_text(record.get(field)) for field in IDENTITY_FIELDS)
+    return hashlib.sha1(identity.encode("utf-8")).hexdigest()[:20]
+
+
+def record_hash(record: Dict[str, Any]) -> str:
+    """
+    Content hash of a normalized location record
+    
+    Text fields are normalized and coordinates rounded to 5 decimal places
+    (about one metre), so reformatting does not register as a change while
+    a new address or a moved store does.
+    
+    Args:
+        record: Dictionary containing store location data
+        
+    Returns:
+        Hex digest of the record's content
+    """
+    parts = []
+    for field in sorted(record):
+        value = record[field]
+        # Unknown values hash like absent ones, for dict and Location records alike
+        if field == "company_name" or value is None or value == "":
+            continue
+        if field in ("latitude", "longitude"):
+            try:
+                value = f"{float(value):.5f}"
+            except (TypeError, ValueError):
+                value = ""
+        else:
+            value = normalize_text(value)
+        parts.append(f"{field}={value}")
+    return hashlib.sha1("\x1f".join(parts).encode("utf-8")).hexdigest()
\ No newline at end of file
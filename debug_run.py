@@ -5,6 +5,7 @@ Simplified debug runner that prints all output
 import sys
 import traceback
 from augips.scrapers import SCRAPERS
+from augips.utils import configure_logging
 
 
 def main():
@@ -22,6 +23,7 @@ def main():
         return
     
     print(f"Running {scraper_name} scraper...")
+    configure_logging(debug=True)
     
     try:
         # Initialize the scraper
@@ -30,7 +32,7 @@ def main():
         
         # Run the scraper
         print(f"Scraping {scraper.company_name} store locations...")
-        locations = scraper.scrape()
+        locations = list(scraper.scrape())
         
         # Print results
         print(f"Found {len(locations)} locations")
@@ -2,7 +2,9 @@
 Main entry point for Augips framework
 """
 
-from augips.runner import run_scraper
+import sys
+
+from augips.runner import run_benchmark, run_dedupe, run_scraper
 
 
 def main():
@@ -10,8 +12,28 @@ def main():
     import argparse
     
     parser = argparse.ArgumentParser(description="Augips - Automotive store location scraper")
-    parser.add_argument("scraper", help="Scraper name, 'all' to run all scrapers, or 'list' to show available scrapers")
+    parser.add_argument("scraper", help="Scraper name, 'all' to run all scrapers, 'list' to show available scrapers, "
+                                        "'dedupe' to merge duplicate places across scrapers, or 'benchmark' to "
+                                        "measure scrapers offline against local fixtures")
     parser.add_argument("--debug", action="store_true", help="Enable debug mode")
+    parser.add_argument("--workers", type=int, default=1, help="Number of scrapers to run concurrently with 'all'")
+    parser.add_argument("--async", dest="use_async", action="store_true",
+                        help="Run scrapers as coroutines on a single asyncio event loop")
+    parser.add_argument("--format", default="csv,sqlite,journal",
+                        help="Comma-separated output formats: csv, parquet, sqlite, journal "
+                             "(default: csv,sqlite,journal)")
+    parser.add_argument("--cache-mode", choices=["normal", "prefer-cache", "offline", "refresh"], default="normal",
+                        help="HTTP cache mode: revalidate stale pages (normal), reuse any cached page "
+                             "(prefer-cache), never touch the network (offline) or re-download everything (refresh)")
+    parser.add_argument("--profile", nargs="?", const="cprofile", choices=["cprofile", "sample"],
+                        help="Profile each scraper, writing pstats and collapsed stacks for flame graphs to "
+                             "data/profiles/<scraper>/; 'sample' uses a low-overhead stack sampler instead "
+                             "(default when given without a value: cprofile)")
+    parser.add_argument("--only", help="Comma-separated benchmarks to run with 'benchmark' (default: all)")
+    parser.add_argument("--scale", type=float, default=1.0,
+                        help="Size multiplier for the benchmark fixtures (default: 1.0, about 5,000 directory stores)")
+    parser.add_argument("--save", help="Save benchmark results as JSON, for use as a later --baseline")
+    parser.add_argument("--baseline", help="Benchmark results to compare against; exits with status 1 on regressions")
     args = parser.parse_args()
     
     if args.scraper.lower() == "list":
@@ -19,8 +41,16 @@ def main():
         from augips.scrapers import SCRAPERS
         for name in SCRAPERS.keys():
             print(f"- {name}")
+    elif args.scraper.lower() == "dedupe":
+        run_dedupe()
+    elif args.scraper.lower() == "benchmark":
+        names = [name.strip() for name in args.only.split(",") if name.strip()] if args.only else None
+        if run_benchmark(names, scale=args.scale, output_path=args.save, baseline_path=args.baseline):
+            sys.exit(1)
     else:
-        run_scraper(args.scraper, debug=args.debug)
+        output_formats = [name.strip() for name in args.format.split(",") if name.strip()]
+        run_scraper(args.scraper, debug=args.debug, workers=args.workers, use_async=args.use_async,
+                    output_formats=output_formats, cache_mode=args.cache_mode, profile=args.profile)
 
 
 if __name__ == "__main__":
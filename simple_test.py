@@ -8,7 +8,7 @@ print("Starting simple test...")
 
 # Create and run the simple scraper
 scraper = SimpleScraper()
-locations = scraper.scrape()
+locations = list(scraper.scrape())
 
 print(f"Found {len(locations)} locations")
 
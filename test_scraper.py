@@ -4,7 +4,9 @@ Simple test script for scrapers
 
 import sys
 from augips.scrapers import SCRAPERS
-from augips.utils import debug_print
+from augips.utils import configure_logging, get_logger
+
+logger = get_logger("test_scraper")
 
 
 def test_scraper(scraper_name):
@@ -26,7 +28,7 @@ def test_scraper(scraper_name):
         
         # Test the scrape method directly
         print("Testing scrape method...")
-        locations = scraper.scrape()
+        locations = list(scraper.scrape())
         print(f"Scrape method returned {len(locations)} locations")
         
         # Print the first location
@@ -38,11 +40,12 @@ def test_scraper(scraper_name):
             print("No locations returned")
             
     except Exception as e:
-        debug_print(f"Error testing {scraper_name} scraper", error=e)
+        logger.debug("Error testing %s scraper", scraper_name, exc_info=e)
         print(f"Error: {str(e)}")
 
 
 if __name__ == "__main__":
+    configure_logging(debug=True)
     if len(sys.argv) > 1:
         test_scraper(sys.argv[1])
     else: